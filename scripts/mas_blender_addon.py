@@ -112,6 +112,24 @@ class MASOperatorRenderBatchRender(bpy.types.Operator):
         return {'FINISHED'}
 
 
+class MASOperatorRenderProfileReport(bpy.types.Operator):
+    """
+    Operator for mas_ops.ops_rndr.rndr_profile_report().
+    """
+    bl_idname = 'mas.rndr_profile_report'
+    bl_label = 'Summarize Render Profile Log(s)'
+
+    def invoke(
+        self,
+        context: bpy.types.Context,
+        event: bpy.types.Event,
+    ):
+        """Invoke method override."""
+        ops_rndr.rndr_profile_report()
+
+        return {'FINISHED'}
+
+
 # MENUS
 
 class MAS_MT_SubmenuPRE(bpy.types.Menu):
@@ -156,6 +174,7 @@ class MAS_MT_SubmenuPOST(bpy.types.Menu):
         layout = self.layout
         layout.operator('mas.io_launch_export_dialog_ui')
         layout.operator('mas.rndr_batch_render')
+        layout.operator('mas.rndr_profile_report')
 
 
 class MAS_MT_Menu(bpy.types.Menu):
@@ -188,6 +207,7 @@ classes = (
     MASOperatorAssetSetMaterialData,
     MASOperatorIoLaunchExportDialogUi,
     MASOperatorRenderBatchRender,
+    MASOperatorRenderProfileReport,
     MAS_MT_SubmenuPRE,
     MAS_MT_SubmenuPROD,
     MAS_MT_SubmenuPOST,
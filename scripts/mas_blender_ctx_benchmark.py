@@ -0,0 +1,183 @@
+#!$BLENDER_PATH/python/bin python
+
+"""MAS Blender - Context Benchmark
+
+Times the per-call overhead of operator-based helpers on a synthetic scene of Mesh Objects
+(each with Material Slots), before and after the context-override execution layer (see bpy_ctx.ctx_override()):
+selecting with bpy.ops.object.select_all() then calling the operator (the previous implementation)
+against the same operator calls in a context override, or the data API.
+
+Usage:
+    blender -b --factory-startup --python mas_blender_ctx_benchmark.py -- [object_count]
+
+"""
+
+import logging
+import sys
+import time
+
+import bpy
+
+from mas_blender.mas_bpy import bpy_mtl
+from mas_blender.mas_bpy._bpy_core import bpy_scn
+
+
+__LOGGER__ = logging.getLogger(__name__)
+__LOGGER__.addHandler(logging.StreamHandler(sys.stdout))
+__LOGGER__.setLevel(logging.INFO)
+
+#: Number of Objects in the synthetic scene.
+OBJECT_COUNT = 1000
+
+#: Number of Material Slots on each Object.
+MATERIAL_SLOT_COUNT = 4
+
+
+def benchmark_make_scene(
+    object_count: int = OBJECT_COUNT,
+    mtl_slot_count: int = MATERIAL_SLOT_COUNT,
+) -> list:
+    """
+    Replaces the Objects of the scene with Mesh Objects that have Material Slots.
+
+    :param object_count: Number of Objects to create.
+    :param mtl_slot_count: Number of Material Slots on each Object.
+    :returns: The Objects.
+    """
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    for mesh in list(bpy.data.meshes):
+        bpy.data.meshes.remove(mesh)
+
+    mtls = [bpy.data.materials.get(f'mtl_{i}') or bpy.data.materials.new(f'mtl_{i}') for i in range(mtl_slot_count)]
+    objs = []
+    for i in range(object_count):
+        mesh = bpy.data.meshes.new(f'mesh_{i:04d}')
+        mesh.from_pydata([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [], [(0, 1, 2)])
+        for mtl in mtls:
+            mesh.materials.append(mtl)
+
+        obj = bpy.data.objects.new(f'obj_{i:04d}', mesh)
+        obj.location.x = i
+        bpy.context.scene.collection.objects.link(obj)
+        objs.append(obj)
+
+    return objs
+
+
+def benchmark_select(
+    obj: bpy.types.Object,
+) -> None:
+    """
+    Selects an Object as the previous implementation of bpy_scn.scn_select_items() did.
+
+    :param obj: The Object to select (and make active).
+    """
+    bpy.ops.object.select_all(action='DESELECT')
+    obj.select_set(True)
+    bpy.context.view_layer.objects.active = obj
+
+
+def benchmark_set_material_at_index_select(
+    obj: bpy.types.Object,
+    mtl_index: int,
+    mtl_name: str,
+) -> None:
+    """
+    The previous, selection-based implementation of bpy_mtl.mtl_set_material_at_index()
+    (adding a Material Slot), used as the reference.
+
+    :param obj: The affected Object.
+    :param mtl_index: The Material Slot index to add.
+    :param mtl_name: The name of the Material to set.
+    """
+    benchmark_select(obj)
+    bpy.ops.object.material_slot_add()
+    for _ in range(len(obj.material_slots) - mtl_index - 1):
+        bpy.ops.object.material_slot_move(direction='UP')
+    obj.material_slots[mtl_index].material = bpy.data.materials[mtl_name]
+    obj.active_material_index = mtl_index
+
+
+def benchmark_duplicate_object_select(
+    obj: bpy.types.Object,
+) -> bpy.types.Object:
+    """
+    The previous, operator-based implementation of bpy_scn.scn_duplicate_object(), used as the reference.
+
+    :param obj: The Object to duplicate.
+    :returns: The duplicated Object.
+    """
+    benchmark_select(obj)
+    bpy.ops.object.duplicate(linked=False)
+    dup_obj = bpy.context.object
+    benchmark_select(dup_obj)
+
+    return dup_obj
+
+
+def benchmark_time(
+    label: str,
+    objs: list,
+    func,
+    *args,
+) -> float:
+    """
+    Logs the average time of calling a function on each Object.
+
+    :param label: Name of the call to log.
+    :param objs: The Objects.
+    :param func: The function, called with each Object and the given arguments.
+    :returns: The average time per call, in seconds.
+    """
+    start_time = time.perf_counter()
+    for obj in objs:
+        func(obj, *args)
+    avg_time = (time.perf_counter() - start_time) / len(objs)
+
+    logger_msg = f'{label}: {avg_time * 1e6:.0f} us/call'
+    __LOGGER__.info(logger_msg)
+
+    return avg_time
+
+
+def benchmark_run(
+    object_count: int = OBJECT_COUNT,
+) -> None:
+    """
+    Runs the benchmark.
+
+    :param object_count: Number of Objects in the synthetic scene.
+    """
+    mtl_name = bpy.data.materials.new('mtl_inserted').name
+    benchmarks = (
+        (
+            'mtl_set_material_at_index',
+            lambda obj: benchmark_set_material_at_index_select(obj, 1, mtl_name),
+            lambda obj: bpy_mtl.mtl_set_material_at_index(obj, 1, mtl_name, replace_existing=False),
+        ),
+        (
+            'scn_duplicate_object',
+            benchmark_duplicate_object_select,
+            bpy_scn.scn_duplicate_object,
+        ),
+    )
+    for label, ref_func, func in benchmarks:
+        ref_time = benchmark_time(f'{label} (select + operators)', benchmark_make_scene(object_count), ref_func)
+        ref_mtl_names = [
+            [mtl_slot.material.name for mtl_slot in obj.material_slots] for obj in bpy.data.objects
+        ]
+
+        avg_time = benchmark_time(f'{label} (context override / data API)', benchmark_make_scene(object_count), func)
+        mtl_names = [
+            [mtl_slot.material.name for mtl_slot in obj.material_slots] for obj in bpy.data.objects
+        ]
+
+        assert sorted(mtl_names) == sorted(ref_mtl_names), f'{label}: Material Slot mismatch.'
+        logger_msg = f'{label}: {ref_time / avg_time:.1f}x faster on {object_count} Objects.'
+        __LOGGER__.info(logger_msg)
+
+
+if __name__ == '__main__':
+    script_args = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    benchmark_run(int(script_args[0]) if script_args else OBJECT_COUNT)
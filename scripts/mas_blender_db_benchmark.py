@@ -0,0 +1,197 @@
+#!$BLENDER_PATH/python/bin python
+
+"""MAS Blender - Database Benchmark
+
+Fills a temporary SQLite database with projects, users and user/project associations,
+then prints the query plan (EXPLAIN QUERY PLAN) and average timing of the lookups used by the UI.
+The user -> projects lookup is also timed without its Index for comparison,
+and db_upsert() is compared with db_upsert_batch() on synthetic projects and users.
+
+Usage (from Blender's Scripting tab or any Python with mas_blender installed):
+    python mas_blender_db_benchmark.py [row_count]
+
+"""
+
+import logging
+import random
+import sys
+import tempfile
+import time
+
+import sqlalchemy
+
+from mas_blender.mas_db import db_sql
+
+
+__LOGGER__ = logging.getLogger(__name__)
+__LOGGER__.addHandler(logging.StreamHandler(sys.stdout))
+__LOGGER__.setLevel(logging.INFO)
+
+#: Number of rows to create for each Table.
+ROW_COUNT = 100000
+
+#: Number of times each lookup is run for timing.
+LOOKUP_COUNT = 1000
+
+#: Number of entries upserted by db_upsert() and db_upsert_batch() for comparison.
+UPSERT_COUNT = 10000
+
+
+def benchmark_fill(
+    db_engine: sqlalchemy.engine.base.Engine,
+    row_count: int,
+) -> None:
+    """
+    Creates the given number of projects, users and user/project associations.
+
+    :param db_engine: The connected Engine.
+    :param row_count: Number of rows to create for each Table.
+    """
+    db_sql.db_upsert_batch(
+        db_engine,
+        (
+            db_sql.DBProject(code=f'{i:x}', name=f'project_{i}', path=f'/projects/{i}', pipeline={})
+            for i in range(row_count)
+        ),
+        column_name_filter='name',
+    )
+    db_sql.db_upsert_batch(
+        db_engine,
+        (db_sql.DBUser(name=f'user_{i}') for i in range(row_count)),
+        column_name_filter='name',
+    )
+
+    rand = random.Random(0)
+    db_assoc_rows = {
+        (rand.randint(1, row_count), rand.randint(1, row_count)) for _ in range(row_count)
+    }
+    with db_engine.begin() as db_conn:
+        db_conn.execute(
+            sqlalchemy.insert(db_sql.DBUserProjects),
+            [{'project_id': proj_id, 'user_id': user_id} for proj_id, user_id in db_assoc_rows],
+        )
+
+
+def benchmark_lookup(
+    db_engine: sqlalchemy.engine.base.Engine,
+    label: str,
+    db_stmt: sqlalchemy.Executable,
+    lookup_count: int = LOOKUP_COUNT,
+) -> None:
+    """
+    Logs the query plan and the average execution time of a statement.
+
+    :param db_engine: The connected Engine.
+    :param label: Name of the lookup to log.
+    :param db_stmt: The statement to run.
+    :param lookup_count: Number of times the statement is run for timing.
+    """
+    db_plan = db_sql.db_explain_query_plan(db_engine, db_stmt)
+
+    with db_engine.connect() as db_conn:
+        start_time = time.perf_counter()
+        for _ in range(lookup_count):
+            db_conn.execute(db_stmt).all()
+        avg_time = (time.perf_counter() - start_time) / lookup_count
+
+    logger_msg = f'{label}: {avg_time * 1e6:.1f} us/query | {"; ".join(db_plan)}'
+    __LOGGER__.info(logger_msg)
+
+
+def benchmark_upsert(
+    db_engine: sqlalchemy.engine.base.Engine,
+    upsert_count: int = UPSERT_COUNT,
+) -> None:
+    """
+    Logs the time taken by db_upsert() and db_upsert_batch() to write the same synthetic entries
+    (half updating existing projects/users, half new), and checks that their results match.
+
+    :param db_engine: The connected Engine (filled by benchmark_fill()).
+    :param upsert_count: Number of entries to upsert for each Table.
+    """
+    for label, db_upsert_func in (('db_upsert', db_sql.db_upsert), ('db_upsert_batch', db_sql.db_upsert_batch)):
+        # Each function writes its own new Rows, so both update and insert the same number of Rows.
+        db_entries = [
+            db_sql.DBProject(
+                code=f'{label}_{i:x}' if i % 2 else f'{i:x}',
+                name=f'{label}_project_{i}' if i % 2 else f'project_{i}',
+                path=f'/projects/{label}/{i}',
+                pipeline={'upsert': label},
+            )
+            for i in range(upsert_count)
+        ] + [
+            db_sql.DBUser(name=f'{label}_user_{i}' if i % 2 else f'user_{i}') for i in range(upsert_count)
+        ]
+
+        start_time = time.perf_counter()
+        db_results = db_upsert_func(db_engine, db_entries, column_name_filter='name')
+        upsert_time = time.perf_counter() - start_time
+
+        assert all(db_results), f'{label}: {db_results.count(False)} entries failed.'
+        logger_msg = f'{label}: {len(db_entries)} entries in {upsert_time:.2f}s ' \
+                     f'({upsert_time / len(db_entries) * 1e6:.1f} us/entry).'
+        __LOGGER__.info(logger_msg)
+
+
+def benchmark_run(
+    row_count: int = ROW_COUNT,
+) -> None:
+    """
+    Runs the benchmark in a temporary database.
+
+    :param row_count: Number of rows to create for each Table.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_url = db_sql.db_get_url('mas_blender_benchmark', temp_dir)
+        db_engine = db_sql.db_get_engine(db_url)
+        db_sql.db_create_table(db_engine)
+
+        start_time = time.perf_counter()
+        benchmark_fill(db_engine, row_count)
+        logger_msg = f'Filled {row_count} rows per Table in {time.perf_counter() - start_time:.2f}s.'
+        __LOGGER__.info(logger_msg)
+
+        with db_engine.begin() as db_conn:
+            db_conn.exec_driver_sql('ANALYZE')
+
+        lookup_id = row_count // 2
+        db_user_projects = db_sql.DBUserProjects.c
+        db_lookups = (
+            (
+                'Project by name',
+                db_sql.db_get_select(db_sql.DBProject, filters=(('name', f'project_{lookup_id}'),)),
+            ),
+            (
+                'Project by code',
+                db_sql.db_get_select(db_sql.DBProject, filters=(('code', f'{lookup_id:x}'),)),
+            ),
+            (
+                'User by name',
+                db_sql.db_get_select(db_sql.DBUser, filters=(('name', f'user_{lookup_id}'),)),
+            ),
+            (
+                'Users of project',
+                sqlalchemy.select(db_user_projects.user_id)
+                          .where(db_user_projects.project_id == lookup_id),
+            ),
+            (
+                'Projects of user',
+                sqlalchemy.select(db_user_projects.project_id)
+                          .where(db_user_projects.user_id == lookup_id),
+            ),
+        )
+        for label, db_stmt in db_lookups:
+            benchmark_lookup(db_engine, label, db_stmt)
+
+        # Compare the user -> projects lookup without its Index.
+        with db_engine.begin() as db_conn:
+            db_conn.exec_driver_sql('DROP INDEX ix_user_projects_user_id')
+        benchmark_lookup(db_engine, 'Projects of user (no Index)', db_lookups[-1][1])
+
+        benchmark_upsert(db_engine, min(row_count, UPSERT_COUNT))
+
+        db_sql.db_dispose_engines(db_url)
+
+
+if __name__ == '__main__':
+    benchmark_run(int(sys.argv[1]) if len(sys.argv) > 1 else ROW_COUNT)
@@ -0,0 +1,98 @@
+#!$BLENDER_PATH/python/bin python
+
+"""MAS Blender - Model Benchmark
+
+Times bpy_mdl.mdl_apply_modifiers_to_object() on a synthetic "face" Mesh
+(a subdivided sphere with 50 Shape Keys and Subdivision Surface + Smooth Modifiers),
+and checks that the Shape Keys survive with the expected vertex count.
+
+Usage:
+    blender -b --factory-startup --python mas_blender_mdl_benchmark.py
+
+"""
+
+import logging
+import random
+import sys
+import time
+
+import bmesh
+import bpy
+
+from mas_blender.mas_bpy import bpy_mdl
+
+
+__LOGGER__ = logging.getLogger(__name__)
+__LOGGER__.addHandler(logging.StreamHandler(sys.stdout))
+__LOGGER__.setLevel(logging.INFO)
+
+#: Number of Shape Keys on the synthetic Mesh.
+SHAPE_KEY_COUNT = 50
+
+#: Subdivisions of the synthetic sphere (5 subdivisions: ~10k vertices).
+SPHERE_SUBDIVISIONS = 5
+
+
+def benchmark_make_face_object(
+    shape_key_count: int = SHAPE_KEY_COUNT,
+    subdivisions: int = SPHERE_SUBDIVISIONS,
+) -> bpy.types.Object:
+    """
+    Creates a sphere Mesh Object with random local offsets as Shape Keys, and Modifiers to apply.
+
+    :param shape_key_count: Number of Shape Keys (besides the basis).
+    :param subdivisions: Subdivisions of the icosphere.
+    :returns: The Mesh Object (linked to the scene).
+    """
+    mesh = bpy.data.meshes.new('benchmark_face')
+    bm = bmesh.new()
+    bmesh.ops.create_icosphere(bm, subdivisions=subdivisions, radius=1.0)
+    bm.to_mesh(mesh)
+    bm.free()
+
+    obj = bpy.data.objects.new(mesh.name, mesh)
+    bpy.context.scene.collection.objects.link(obj)
+
+    rand = random.Random(0)
+    obj.shape_key_add(name='Basis', from_mix=False)
+    for i in range(shape_key_count):
+        key_block = obj.shape_key_add(name=f'shape_{i:02d}', from_mix=False)
+        center = key_block.data[rand.randrange(len(key_block.data))].co.copy()
+        for key_point in key_block.data:
+            if (key_point.co - center).length < 0.3:
+                key_point.co += key_point.co.normalized() * 0.05
+
+    obj.modifiers.new('Subdivision', 'SUBSURF').levels = 1
+    obj.modifiers.new('Smooth', 'SMOOTH')
+
+    return obj
+
+
+def benchmark_run(
+    shape_key_count: int = SHAPE_KEY_COUNT,
+) -> None:
+    """
+    Runs the benchmark.
+
+    :param shape_key_count: Number of Shape Keys (besides the basis).
+    """
+    obj = benchmark_make_face_object(shape_key_count)
+    vert_count = len(obj.data.vertices)
+
+    start_time = time.perf_counter()
+    obj = bpy_mdl.mdl_apply_modifiers_to_object(obj, list(obj.modifiers))
+    apply_time = time.perf_counter() - start_time
+
+    key_blocks = obj.data.shape_keys.key_blocks
+    assert len(key_blocks) == shape_key_count + 1, 'Shape Keys were not preserved.'
+    assert not obj.modifiers, 'Modifiers were not applied.'
+    assert len(key_blocks[-1].data) == len(obj.data.vertices), 'Shape Key vertex count mismatch.'
+
+    logger_msg = f'{shape_key_count} Shape Keys, {vert_count} -> {len(obj.data.vertices)} vertices: ' \
+                 f'{apply_time:.2f}s ({apply_time / (shape_key_count + 1) * 1e3:.1f} ms per Shape Key), ' \
+                 f'{len(bpy.data.objects)} Object(s) in file.'
+    __LOGGER__.info(logger_msg)
+
+
+if __name__ == '__main__':
+    benchmark_run()
@@ -0,0 +1,129 @@
+#!$BLENDER_PATH/python/bin python
+
+"""MAS Blender - Material Benchmark
+
+Times in-use Material detection (bpy_mtl.mtl_get_mtls_from_obj(in_use_mtls_only=True))
+against a per-polygon Python loop, on synthetic grid Meshes of increasing face count.
+
+Usage:
+    blender -b --factory-startup --python mas_blender_mtl_benchmark.py
+
+"""
+
+import logging
+import random
+import sys
+import time
+import typing
+
+import bpy
+
+from mas_blender.mas_bpy import bpy_mtl
+
+
+__LOGGER__ = logging.getLogger(__name__)
+__LOGGER__.addHandler(logging.StreamHandler(sys.stdout))
+__LOGGER__.setLevel(logging.INFO)
+
+#: Approximate face counts of the synthetic Meshes.
+FACE_COUNTS = (1000, 10000, 100000, 500000)
+
+#: Number of Material Slots on each synthetic Mesh.
+MTL_SLOT_COUNT = 8
+
+
+def benchmark_make_mesh_object(
+    face_count: int,
+    mtl_slot_count: int = MTL_SLOT_COUNT,
+) -> bpy.types.Object:
+    """
+    Creates a grid Mesh Object with random Material indices assigned to its polygons.
+
+    :param face_count: Approximate number of faces of the grid.
+    :param mtl_slot_count: Number of Material Slots (the last slot is left unused).
+    :returns: The Mesh Object.
+    """
+    grid_size = max(1, int(face_count ** 0.5))
+    verts = [(x, y, 0.0) for y in range(grid_size + 1) for x in range(grid_size + 1)]
+    faces = [
+        (
+            y * (grid_size + 1) + x,
+            y * (grid_size + 1) + x + 1,
+            (y + 1) * (grid_size + 1) + x + 1,
+            (y + 1) * (grid_size + 1) + x,
+        )
+        for y in range(grid_size) for x in range(grid_size)
+    ]
+
+    mesh = bpy.data.meshes.new(f'benchmark_{face_count}')
+    mesh.from_pydata(verts, [], faces)
+    obj = bpy.data.objects.new(mesh.name, mesh)
+
+    for i in range(mtl_slot_count):
+        mesh.materials.append(bpy.data.materials.new(f'{mesh.name}_{i}'))
+
+    rand = random.Random(face_count)
+    mesh.polygons.foreach_set(
+        'material_index',
+        [rand.randrange(mtl_slot_count - 1) for _ in range(len(mesh.polygons))],
+    )
+
+    return obj
+
+
+def benchmark_loop_mtls(obj: bpy.types.Object) -> list:
+    """
+    Reference implementation: checks the Material of every polygon in Python.
+
+    :param obj: The Mesh Object.
+    :returns: List of in-use Materials (ordered by first use).
+    """
+    mtls = []
+    for f in obj.data.polygons:
+        f_mtl = obj.material_slots[f.material_index].material
+        if f_mtl not in mtls:
+            mtls.append(f_mtl)
+    return mtls
+
+
+def benchmark_time(func: typing.Callable, *args) -> typing.Tuple[float, object]:
+    """
+    :returns: The execution time (seconds) and result of the function.
+    """
+    start_time = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start_time, result
+
+
+def benchmark_run(
+    face_counts: typing.Iterable[int] = FACE_COUNTS,
+) -> None:
+    """
+    Runs the benchmark for each face count.
+
+    :param face_counts: Approximate face counts of the synthetic Meshes.
+    """
+    for face_count in face_counts:
+        obj = benchmark_make_mesh_object(face_count)
+
+        loop_time, loop_mtls = benchmark_time(benchmark_loop_mtls, obj)
+        bulk_time, bulk_mtls = benchmark_time(
+            lambda: bpy_mtl.mtl_get_mtls_from_obj(obj, in_use_mtls_only=True)
+        )
+        assert loop_mtls == bulk_mtls, 'In-use Materials do not match.'
+
+        logger_msg = f'{len(obj.data.polygons):>8} faces: loop {loop_time * 1e3:9.2f} ms | ' \
+                     f'foreach_get {bulk_time * 1e3:9.2f} ms | ' \
+                     f'{loop_time / max(bulk_time, 1e-9):6.1f}x'
+        __LOGGER__.info(logger_msg)
+
+        mesh = obj.data
+        mtls = list(mesh.materials)
+        bpy.data.objects.remove(obj)
+        bpy.data.meshes.remove(mesh)
+        for mtl in mtls:
+            bpy.data.materials.remove(mtl)
+
+
+if __name__ == '__main__':
+    benchmark_run()
@@ -0,0 +1,124 @@
+#!$BLENDER_PATH/python/bin python
+
+"""MAS Blender - Scene Benchmark
+
+Times bpy_scn.scn_get_instance_objects() on synthetic set-dressing scenes
+(Objects sharing Meshes in groups of INSTANCE_COUNT, some parented in short hierarchies)
+of increasing size. On the smaller scenes, the previous operator-based implementation
+(bpy.ops.object.select_linked() for each Object) is timed too, and its results are compared.
+
+Usage:
+    blender -b --factory-startup --python mas_blender_scn_benchmark.py -- [object_count ...]
+
+"""
+
+import logging
+import random
+import sys
+import time
+
+import bpy
+
+from mas_blender.mas_bpy._bpy_core import bpy_scn
+
+
+__LOGGER__ = logging.getLogger(__name__)
+__LOGGER__.addHandler(logging.StreamHandler(sys.stdout))
+__LOGGER__.setLevel(logging.INFO)
+
+#: Numbers of Objects in the synthetic scenes.
+OBJECT_COUNTS = (1000, 10000, 50000)
+
+#: Number of Objects sharing each Mesh.
+INSTANCE_COUNT = 10
+
+#: Largest scene the operator-based implementation is timed on (it scales quadratically).
+REFERENCE_OBJECT_COUNT = 1000
+
+
+def benchmark_make_scene(
+    object_count: int,
+) -> None:
+    """
+    Replaces the Objects of the scene with Objects sharing Meshes (and some parented to others).
+
+    :param object_count: Number of Objects to create.
+    """
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    for mesh in list(bpy.data.meshes):
+        bpy.data.meshes.remove(mesh)
+
+    rand = random.Random(0)
+    col = bpy.context.scene.collection
+    meshes = []
+    objs = []
+    for i in range(object_count):
+        if i % INSTANCE_COUNT == 0:
+            mesh = bpy.data.meshes.new(f'prop_{i // INSTANCE_COUNT:05d}')
+            mesh.from_pydata([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [], [(0, 1, 2)])
+            meshes.append(mesh)
+
+        obj = bpy.data.objects.new(f'prop_{i:06d}', meshes[rand.randrange(len(meshes))])
+        if objs and rand.random() < 0.3:
+            obj.parent = objs[rand.randrange(len(objs))]
+        col.objects.link(obj)
+        objs.append(obj)
+
+
+def benchmark_select_linked_instance_objects() -> dict:
+    """
+    The previous, operator-based implementation of bpy_scn.scn_get_instance_objects()
+    (for all Objects in the view layer), used as the reference.
+
+    :returns: The instanced Objects, keyed by data name.
+    """
+    inst_objs = {}
+    for obj in bpy.context.view_layer.objects:
+        if isinstance(obj.data, bpy.types.Mesh) and obj.data.users > 1:
+            bpy_scn.scn_select_items(items=[obj])
+            bpy.ops.object.select_linked(type='OBDATA')
+            if len(bpy.context.selected_objects) > 1 and obj.data.name not in inst_objs:
+                inst_objs[obj.data.name] = sorted(
+                    bpy.context.selected_objects,
+                    key=lambda obj: (len(bpy_scn.scn_get_hierarchy(obj)), obj.name)
+                )
+            bpy_scn.scn_select_items(items=[])
+
+    return inst_objs
+
+
+def benchmark_run(
+    object_counts: tuple = OBJECT_COUNTS,
+) -> None:
+    """
+    Runs the benchmark.
+
+    :param object_counts: Numbers of Objects in the synthetic scenes.
+    """
+    for object_count in object_counts:
+        benchmark_make_scene(object_count)
+
+        start_time = time.perf_counter()
+        inst_objs = bpy_scn.scn_get_instance_objects()
+        index_time = time.perf_counter() - start_time
+
+        logger_msg = f'{object_count} Objects, {len(inst_objs)} instanced Meshes: {index_time:.3f}s'
+
+        if object_count <= REFERENCE_OBJECT_COUNT:
+            start_time = time.perf_counter()
+            ref_inst_objs = benchmark_select_linked_instance_objects()
+            ref_time = time.perf_counter() - start_time
+
+            assert list(inst_objs) == list(ref_inst_objs), 'Instanced Mesh order mismatch.'
+            assert all(
+                [obj.name for obj in inst_objs[k]] == [obj.name for obj in ref_inst_objs[k]] for k in inst_objs
+            ), 'Instanced Object mismatch.'
+            logger_msg += f' (select_linked: {ref_time:.3f}s, {ref_time / index_time:.0f}x)'
+
+        __LOGGER__.info(logger_msg)
+
+
+if __name__ == '__main__':
+    script_args = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    benchmark_run(tuple(int(arg) for arg in script_args) or OBJECT_COUNTS)
@@ -5,6 +5,9 @@ MAS Blender - BPY - CTX
 
 """
 
+import contextlib
+import typing
+
 import bpy
 
 
@@ -22,6 +25,44 @@ def ctx_get_addon(addon_name: str = '') -> bpy.types.Addon:
     return bpy.context.preferences.addons.get(addon_name)
 
 
+@contextlib.contextmanager
+def ctx_override(
+    objs: typing.Iterable[bpy.types.Object] = (),
+    active_obj: typing.Union[bpy.types.Object, None] = None,
+    **overrides,
+) -> typing.Iterator[None]:
+    """
+    Overrides the context for the operators called in it, so they affect the given Objects
+    without changing the selection or the active Object of the view layer
+    (and the depsgraph and UI updates that come with it). Switches to Object mode, if needed.
+    Several operator calls can be batched in the same override.
+
+    .. code-block:: python
+
+        with bpy_ctx.ctx_override(objs, active_obj=objs[0]):
+            bpy.ops.object.join()
+
+    :param objs: The Objects to treat as selected (and editable).
+    :param active_obj: The Object to treat as active (by default, the last of the given Objects).
+    :param overrides: Additional context members to override (see bpy.types.Context.temp_override()).
+    """
+    objs = list(objs)
+    if active_obj is None and objs:
+        active_obj = objs[-1]
+
+    if bpy.context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    with bpy.context.temp_override(
+        active_object=active_obj,
+        object=active_obj,
+        selected_editable_objects=objs,
+        selected_objects=objs,
+        **overrides,
+    ):
+        yield
+
+
 def ctx_set_workspace(
     workspace_name: str = '',
 ) -> None:
@@ -6,12 +6,239 @@ MAS Blender - BPY - IO
 """
 
 import getpass
+import os
 import pathlib
 import tempfile
 import typing
 
 import bpy
 
+from mas_blender.mas_bpy._bpy_core import bpy_scn
+
+
+#: Datablock types that are never included in an IOSnapshot.
+IO_SNAPSHOT_EXCLUDED_TYPES = ('Library', 'Scene', 'Screen', 'WindowManager', 'WorkSpace')
+
+#: Datablock types that are removed on restore if they were created after an IOSnapshot was taken,
+#: even if they are in use (other new datablocks are only removed if they are unused).
+IO_SNAPSHOT_REMOVED_TYPES = ('Collection', 'Object')
+
+#: Cache of the bpy.data collection names and their datablock types (see _io_get_data_attrs()).
+_IO_DATA_ATTRS = {}
+
+
+class IOSnapshot(object):
+    """
+    Snapshot of datablocks, written to a temporary library file (see bpy.data.libraries.write()),
+    to isolate destructive operations (i.e. exports that apply Modifiers or resize images)
+    without saving and reopening the whole file.
+    The snapshot includes the datablocks they use (i.e. an Object's Mesh, Materials and images)
+    and the Collections the Objects are in. restore() appends the snapshot datablocks,
+    swaps them in for the current ones, and removes the datablocks created in the meantime.
+    The frame, selection, and Layer Collection states of the Scenes are restored too.
+
+    .. code-block:: python
+
+        with bpy_io.IOSnapshot(export_objs):
+            bpy_mdl.mdl_apply_modifiers_to_object(...)
+            bpy.ops.export_scene.fbx(...)
+
+    """
+
+    def __init__(
+        self,
+        datablocks: typing.Iterable[bpy.types.ID],
+        file_path: typing.Union[pathlib.Path, str] = None,
+    ) -> None:
+        """
+        Constructor method (takes the snapshot).
+
+        :param datablocks: The datablocks to snapshot.
+        :param file_path: Path to the snapshot library file (default: in the session's temp directory).
+        """
+        self.file_path = pathlib.Path(file_path) if file_path \
+            else io_get_temp_dir('session').joinpath(f'mas_snapshot_{os.getpid()}_{id(self):x}.blend')
+
+        # Find the datablocks used by the given datablocks (and by their Collections), recursively.
+        datablocks = set(datablocks)
+        used_data = {}
+        seed_datablocks = list(datablocks)
+        for used_id, users in bpy.data.user_map().items():
+            for user in users:
+                used_data.setdefault(user, set()).add(used_id)
+                if isinstance(used_id, bpy.types.Object) and isinstance(user, bpy.types.Collection) \
+                    and used_id in datablocks:
+                    seed_datablocks.append(user)
+
+        snapshot_datablocks = set()
+        while seed_datablocks:
+            datablock = seed_datablocks.pop()
+            if datablock in snapshot_datablocks or datablock.library is not None:
+                continue
+            data_attr = _io_get_data_attr(datablock)
+            if data_attr is None or getattr(bpy.data, data_attr).get(datablock.name) != datablock:
+                continue
+            snapshot_datablocks.add(datablock)
+            seed_datablocks.extend(used_data.get(datablock, ()))
+
+        #: Names of the snapshot datablocks, keyed by pointer, for each bpy.data collection name.
+        self.datablocks = {}
+        for datablock in snapshot_datablocks:
+            self.datablocks.setdefault(_io_get_data_attr(datablock), {})[datablock.as_pointer()] = datablock.name
+
+        # Pointers of all datablocks, to find the datablocks created after the snapshot.
+        self._data_pointers = {
+            data_attr: {datablock.as_pointer() for datablock in getattr(bpy.data, data_attr)}
+            for data_attr in _io_get_data_attrs()
+        }
+
+        self._scn_states = {}
+        for scn in bpy.data.scenes:
+            lyr_col_states = {}
+            for view_lyr in scn.view_layers:
+                lyr_cols = [view_lyr.layer_collection]
+                while lyr_cols:
+                    lyr_col = lyr_cols.pop()
+                    lyr_col_states[(view_lyr.name, lyr_col.name)] = (
+                        lyr_col.exclude, lyr_col.hide_viewport, lyr_col.holdout, lyr_col.indirect_only
+                    )
+                    lyr_cols.extend(lyr_col.children)
+            self._scn_states[scn.name] = {
+                'frame': scn.frame_current,
+                'layer_collections': lyr_col_states,
+                'selected': {
+                    view_lyr.name: [obj.name for obj in view_lyr.objects if obj.select_get(view_layer=view_lyr)]
+                    for view_lyr in scn.view_layers
+                },
+                'active': {
+                    view_lyr.name: view_lyr.objects.active.name if view_lyr.objects.active else None
+                    for view_lyr in scn.view_layers
+                },
+            }
+
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        bpy.data.libraries.write(
+            self.file_path.as_posix(),
+            snapshot_datablocks,
+            path_remap='RELATIVE',
+        )
+
+    def __enter__(self) -> 'IOSnapshot':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.restore()
+
+    def restore(self) -> typing.List[bpy.types.ID]:
+        """
+        Restores the snapshot datablocks (and Scene states), then deletes the snapshot file.
+        References to the datablocks taken before the restore are no longer valid,
+        so the scene and Node tree indexes are invalidated (see bpy_scn.ScnSceneIndex and bpy_node.NodeTreeIndex).
+
+        :returns: The restored datablocks.
+        """
+        if not self.file_path.is_file():
+            return []
+
+        current_datablocks = {
+            data_attr: {datablock.as_pointer(): datablock for datablock in getattr(bpy.data, data_attr)}
+            for data_attr in self.datablocks
+        }
+        with bpy.data.libraries.load(self.file_path.as_posix(), link=False) as (_, data_to):
+            for data_attr, datablock_names in self.datablocks.items():
+                setattr(data_to, data_attr, list(datablock_names.values()))
+
+        # Swap the restored datablocks in for the current datablocks (in all of their users).
+        restored_datablocks = {}
+        replaced_datablocks = []
+        for data_attr, datablock_names in self.datablocks.items():
+            for (pointer, name), restored_datablock in zip(datablock_names.items(), getattr(data_to, data_attr)):
+                if restored_datablock is None:
+                    continue
+                current_datablock = current_datablocks[data_attr].get(pointer)
+                if current_datablock is not None:
+                    current_datablock.user_remap(restored_datablock)
+                    replaced_datablocks.append(current_datablock)
+                restored_datablocks[restored_datablock] = name
+        bpy.data.batch_remove(replaced_datablocks)
+
+        for restored_datablock, name in restored_datablocks.items():
+            restored_datablock.name = name
+
+        # Remove the datablocks created after the snapshot.
+        created_datablocks = []
+        for data_attr, data_pointers in self._data_pointers.items():
+            for datablock in getattr(bpy.data, data_attr):
+                if datablock.as_pointer() in data_pointers or datablock in restored_datablocks \
+                    or datablock.library is not None:
+                    continue
+                if datablock.users == 0 or datablock.bl_rna.identifier in IO_SNAPSHOT_REMOVED_TYPES:
+                    created_datablocks.append(datablock)
+        bpy.data.batch_remove(created_datablocks)
+
+        for scn_name, scn_state in self._scn_states.items():
+            scn = bpy.data.scenes.get(scn_name)
+            if scn is None:
+                continue
+
+            for view_lyr in scn.view_layers:
+                lyr_cols = [view_lyr.layer_collection]
+                while lyr_cols:
+                    lyr_col = lyr_cols.pop()
+                    lyr_col_state = scn_state['layer_collections'].get((view_lyr.name, lyr_col.name))
+                    if lyr_col_state is not None and lyr_col != view_lyr.layer_collection:
+                        lyr_col.exclude, lyr_col.hide_viewport, lyr_col.holdout, lyr_col.indirect_only = lyr_col_state
+                    lyr_cols.extend(lyr_col.children)
+
+                selected_obj_names = set(scn_state['selected'].get(view_lyr.name, ()))
+                for obj in view_lyr.objects:
+                    obj.select_set(obj.name in selected_obj_names, view_layer=view_lyr)
+                view_lyr.objects.active = view_lyr.objects.get(scn_state['active'].get(view_lyr.name) or '')
+
+            if scn.frame_current != scn_state['frame']:
+                scn.frame_set(scn_state['frame'])
+
+        self.file_path.unlink(missing_ok=True)
+
+        # bpy_node is imported here, as it depends on the core modules.
+        from mas_blender.mas_bpy import bpy_node
+        bpy_scn.scn_get_scene_index().invalidate()
+        bpy_node.node_get_node_tree_index().invalidate()
+
+        return list(restored_datablocks)
+
+
+def _io_get_data_attr(
+    datablock: bpy.types.ID,
+) -> typing.Union[str, None]:
+    """
+    Gets the name of the bpy.data collection of a datablock (e.g. "objects" for an Object).
+
+    :param datablock: The datablock.
+    :returns: The collection name, if the datablock type has one (and is not in IO_SNAPSHOT_EXCLUDED_TYPES).
+    """
+    for data_attr, data_type in _io_get_data_attrs().items():
+        if isinstance(datablock, data_type):
+            return data_attr
+
+    return None
+
+
+def _io_get_data_attrs() -> typing.Dict[str, type]:
+    """
+    Gets the names of the bpy.data collections and their datablock types
+    (except for IO_SNAPSHOT_EXCLUDED_TYPES).
+
+    :returns: The datablock types, keyed by collection name.
+    """
+    if not _IO_DATA_ATTRS:
+        for prop in bpy.data.bl_rna.properties:
+            if prop.type == 'COLLECTION' and prop.fixed_type.identifier not in IO_SNAPSHOT_EXCLUDED_TYPES \
+                and hasattr(bpy.types, prop.fixed_type.identifier):
+                _IO_DATA_ATTRS[prop.identifier] = getattr(bpy.types, prop.fixed_type.identifier)
+
+    return _IO_DATA_ATTRS
+
 
 def io_append_file(
     blend_file_path: typing.Union[pathlib.Path, str],
@@ -97,14 +324,17 @@ def io_make_dirs(*dir_paths: typing.Iterable[typing.Union[pathlib.Path, str]]) -
 def io_save_as(
     file_path: typing.Union[pathlib.Path, str],
     check_existing: bool = False,
+    copy: bool = False,
 ) -> None:
     """
     Saves the current Scene to disk at a given location.
 
     :param file_path: File path location to save to.
     :param check_existing: Prompt the user if the file already exists (default: False).
+    :param copy: Save a copy, keeping the current file path and unsaved state (default: False).
     """
     bpy.ops.wm.save_as_mainfile(
         filepath=pathlib.Path(file_path).as_posix(),
         check_existing=check_existing,
+        copy=copy,
     )
@@ -12,6 +12,279 @@ import bpy
 import idprop
 
 
+#: Session-wide scene index created by scn_get_scene_index().
+SCN_SCENE_INDEX = None
+
+
+class ScnSceneIndex(object):
+    """
+    Index of the Objects, Collections and Layer Collections of the Blender file,
+    answering the lookups of scn_get_objects_of_type(), scn_get_parent_collection(),
+    scn_get_child_layer_collections() and scn_get_view_layer_collections() from prebuilt maps
+    (built on first use) instead of rescanning bpy.data on every call.
+
+    Once registered, the index is kept up to date through bpy.app.handlers:
+    Object updates (new and removed Objects, parent and name changes) are applied incrementally,
+    Collection updates (linking, unlinking and removing) and Scene updates that change the Scene's
+    child Collections invalidate the Collection maps, and file loads and undo/redo invalidate all maps,
+    which are rebuilt on the next lookup. Other Scene updates (i.e. frame changes) and Object transform
+    or data updates leave the index unchanged.
+    Depsgraph updates are only sent once a script returns (or calls bpy.types.ViewLayer.update()),
+    so scripts should call invalidate() after editing the scene themselves.
+
+    .. code-block:: python
+
+        scn_index = bpy_scn.scn_get_scene_index()
+        for lyr_col in scn_index.get_view_layer_collections(bpy.context.view_layer):
+            mesh_objs = scn_index.get_objects_of_type('MESH', lyr_col.collection.name)
+
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor method.
+        """
+        self._depths = {}
+        self._lyr_col_ranges = {}
+        self._obj_keys = None
+        self._objs_of_type = {}
+        self._parent_cols = None
+        self._scn_cols = {}
+        self._type_objs = None
+
+        # bpy.app.handlers.persistent() only accepts functions,
+        # so the methods are wrapped for the handlers to be kept when another file is loaded.
+        self._handlers = {
+            handler_name: bpy.app.handlers.persistent(lambda *args, _handler=handler: _handler(*args))
+            for handler_name, handler in (
+                ('depsgraph_update_post', self._on_depsgraph_update_post),
+                ('load_post', self._on_invalidate),
+                ('redo_post', self._on_invalidate),
+                ('undo_post', self._on_invalidate),
+            )
+        }
+
+    def _index_layer_collections(self, root_lyr_col: bpy.types.LayerCollection) -> None:
+        """
+        Indexes the Layer Collections under the given one in a depth-first list,
+        with the range of the list holding the descendants of each Layer Collection.
+        """
+        lyr_cols = []
+
+        def _add_children(parent_lyr_col):
+            """"""
+            start = len(lyr_cols)
+            for lyr_col in parent_lyr_col.children:
+                lyr_cols.append(lyr_col)
+                _add_children(lyr_col)
+            self._lyr_col_ranges[parent_lyr_col] = (lyr_cols, start, len(lyr_cols))
+
+        _add_children(root_lyr_col)
+
+    def _index_objects(self) -> None:
+        """
+        Indexes the Objects of the file by type and records their names and parents (if not yet indexed).
+        """
+        if self._type_objs is not None:
+            return
+
+        self._type_objs = {}
+        self._obj_keys = {}
+        for obj in bpy.data.objects:
+            self._type_objs.setdefault(obj.type, []).append(obj)
+            self._obj_keys[obj] = (obj.name, obj.parent)
+
+    def _invalidate_collections(self) -> None:
+        """
+        Clears the Collection and Layer Collection maps, and the sorted lookups (they may be of a Collection).
+        """
+        self._lyr_col_ranges.clear()
+        self._objs_of_type.clear()
+        self._parent_cols = None
+
+    def _on_depsgraph_update_post(self, scn, depsgraph, *args):
+        """Applies the Object updates of the depsgraph, and invalidates the Collection maps on Collection updates."""
+        for update in depsgraph.updates:
+            data = update.id.original
+            if isinstance(data, bpy.types.Collection):
+                self._invalidate_collections()
+            elif isinstance(data, bpy.types.Scene):
+                # Scenes are updated on every frame change, so only changes of their child Collections count.
+                scn_cols = tuple(data.collection.children)
+                if self._scn_cols.get(data) != scn_cols:
+                    self._scn_cols[data] = scn_cols
+                    self._invalidate_collections()
+            elif isinstance(data, bpy.types.Object):
+                self._update_object(data)
+
+        # Removed Objects (and Objects not linked to a Scene) are not sent as updates,
+        # so the indexed Objects are compared with the file's (their count may be unchanged).
+        if self._obj_keys is not None:
+            objs = set(bpy.data.objects)
+            if self._obj_keys.keys() != objs:
+                self._update_objects(objs)
+
+    def _on_invalidate(self, *args):
+        """Invalidates the index (i.e. when a file is loaded, as its datablocks are new)."""
+        self.invalidate()
+
+    def _update_object(self, obj: bpy.types.Object) -> None:
+        """
+        Adds a new Object to the index, or forgets the cached hierarchy depths of an Object
+        (and its children) whose parent changed. Updates that change neither the Object's name
+        nor its parent (i.e. transform or data updates) are ignored.
+        """
+        # Without the Object index, name and parent changes cannot be told apart from other updates.
+        if self._obj_keys is None:
+            self._objs_of_type.clear()
+            return
+
+        obj_key = (obj.name, obj.parent)
+        if obj not in self._obj_keys:
+            self._type_objs.setdefault(obj.type, []).append(obj)
+        elif obj_key == self._obj_keys[obj]:
+            return
+        elif obj.parent != self._obj_keys[obj][1]:
+            for hierarchy_obj in (obj, *obj.children_recursive):
+                self._depths.pop(hierarchy_obj, None)
+        self._obj_keys[obj] = obj_key
+
+        # The sorted lookups are cheap to rebuild, and depend on the Object's name and hierarchy depth.
+        self._objs_of_type.clear()
+
+    def _update_objects(self, objs: typing.Set[bpy.types.Object]) -> None:
+        """
+        Removes deleted Objects from the index, and adds the Objects it is missing.
+
+        :param objs: The Objects of the file.
+        """
+        # Deleted Objects are filtered out rather than looked up, as their Python objects are invalid,
+        # and the type lists are rebuilt from the file's Objects, so none of them is kept.
+        self._obj_keys = {obj: obj_key for obj, obj_key in self._obj_keys.items() if obj in objs}
+        self._depths = {obj: depth for obj, depth in self._depths.items() if obj in objs}
+        self._type_objs = {}
+        for obj in bpy.data.objects:
+            if obj in self._obj_keys:
+                self._type_objs.setdefault(obj.type, []).append(obj)
+        self._objs_of_type.clear()
+
+        for obj in bpy.data.objects:
+            if obj not in self._obj_keys:
+                self._update_object(obj)
+
+    def get_child_layer_collections(
+        self,
+        root_layer_collection: bpy.types.LayerCollection,
+        recursive: bool = False,
+    ) -> list:
+        """
+        Gets a list of child Layer Collections in the given Collection (see scn_get_child_layer_collections()).
+
+        :param root_layer_collection: The top-level Layer Collection to get child Collection(s) from.
+        :param recursive: If True, recursively add child Layer Collections for all Layer Collections.
+        :returns: A list of Layer Collections, depth-first.
+        """
+        if not recursive:
+            return list(root_layer_collection.children)
+
+        if root_layer_collection not in self._lyr_col_ranges:
+            self._index_layer_collections(root_layer_collection)
+        lyr_cols, start, end = self._lyr_col_ranges[root_layer_collection]
+
+        return lyr_cols[start:end]
+
+    def get_objects_of_type(
+        self,
+        obj_type: str,
+        col_name: str = '',
+    ) -> list:
+        """
+        Gets a list of all objects of a specific data type (see scn_get_objects_of_type()).
+
+        :param obj_type: Name of the data type (i.e. "ARMATURE").
+        :param col_name: Name of a Collection to get the objects from (and its child Collections);
+            if not given, or there is no such Collection, all objects are searched.
+        :returns: A list of objects, sorted by hierarchy depth, then name.
+        """
+        lookup_key = (obj_type, col_name)
+        if lookup_key not in self._objs_of_type:
+            col = bpy.data.collections.get(col_name)
+            if col is not None:
+                objs_of_type = [obj for obj in col.all_objects if obj.type == obj_type]
+            else:
+                self._index_objects()
+                objs_of_type = self._type_objs.get(obj_type, [])
+            self._objs_of_type[lookup_key] = sorted(
+                objs_of_type,
+                key=lambda obj: (scn_get_hierarchy_depth(obj, self._depths), obj.name)
+            )
+
+        return list(self._objs_of_type[lookup_key])
+
+    def get_parent_collection(
+        self,
+        child_col: bpy.types.Collection,
+    ) -> typing.Union[bpy.types.Collection, None]:
+        """
+        Gets the parent of a Collection (see scn_get_parent_collection()).
+
+        :param child_col: The child Collection.
+        :returns: The first Collection with the given Collection as a child;
+            None if there is none (i.e. the Collection is a child of a scene collection).
+        """
+        if self._parent_cols is None:
+            self._parent_cols = {}
+            for col in bpy.data.collections:
+                for col_child in col.children:
+                    self._parent_cols.setdefault(col_child, col)
+
+        return self._parent_cols.get(child_col)
+
+    def get_view_layer_collections(
+        self,
+        view_lyr: bpy.types.ViewLayer,
+        recursive: bool = True,
+    ) -> list:
+        """
+        Gets a list of the Layer Collections in a view layer (see scn_get_view_layer_collections()).
+
+        :param view_lyr: The view layer.
+        :param recursive: If True, include the child Layer Collections of all Layer Collections.
+        :returns: A list of Layer Collections, depth-first.
+        """
+        return self.get_child_layer_collections(view_lyr.layer_collection, recursive=recursive)
+
+    def invalidate(self) -> None:
+        """
+        Clears the index, which is rebuilt on the next lookup.
+        """
+        self._depths.clear()
+        self._lyr_col_ranges.clear()
+        self._objs_of_type.clear()
+        self._obj_keys = None
+        self._parent_cols = None
+        self._scn_cols.clear()
+        self._type_objs = None
+
+    def register(self) -> None:
+        """
+        Adds the index's handlers to bpy.app.handlers.
+        """
+        for handler_name, handler in self._handlers.items():
+            handlers = getattr(bpy.app.handlers, handler_name)
+            if handler not in handlers:
+                handlers.append(handler)
+
+    def unregister(self) -> None:
+        """
+        Removes the index's handlers from bpy.app.handlers.
+        """
+        for handler_name, handler in self._handlers.items():
+            handlers = getattr(bpy.app.handlers, handler_name)
+            if handler in handlers:
+                handlers.remove(handler)
+
+
 def scn_clear_object_parent(
     obj: bpy.types.Object,
     keep_transforms: bool = True,
@@ -95,18 +368,24 @@ def scn_duplicate_object(
     name: str = '',
     instance: bool = False
 ) -> bpy.types.Object:
-    """TODO"""
-    scn_select_items(items=[obj])
-    bpy.ops.object.duplicate(linked=False)
-    dup_obj = bpy.context.object
+    """
+    Duplicates an Object (with its Modifiers, constraints, etc.) into the Collection(s) it is linked to,
+    through the data API, so the selection is not changed (unlike bpy.ops.object.duplicate()).
+
+    :param obj: The Object to duplicate.
+    :param name: Name of the duplicated Object (by default, the name of the Object, numbered).
+    :param instance: If True, the duplicated Object shares the Object's data; otherwise, the data is copied.
+    :returns: The duplicated Object.
+    """
+    dup_obj = obj.copy()
+    if obj.data is not None and not instance:
+        dup_obj.data = obj.data.copy()
 
     if name:
         dup_obj.name = name
 
-    if instance:
-        dup_obj.data = obj.data
-
-    scn_select_items(items=[dup_obj])
+    for usr_col in obj.users_collection:
+        usr_col.objects.link(dup_obj)
 
     return dup_obj
 
@@ -180,24 +459,68 @@ def scn_get_hierarchy(
         return parent_key + (obj,)
 
 
+def scn_get_hierarchy_depth(
+    obj: bpy.types.Object,
+    depths: typing.Union[dict, None] = None,
+) -> int:
+    """
+    Gets the number of Objects in the Object's hierarchy, from the root parent to the Object
+    (i.e. len(scn_get_hierarchy(obj)), without building the hierarchy).
+
+    :param obj: The Object.
+    :param depths: Cache of depths, keyed by Object, shared between calls
+        (the depths of the Object and its parents are added to it).
+    :returns: The hierarchy depth (1 for an Object without a parent).
+    """
+    depths = {} if depths is None else depths
+
+    # Walk up to the first parent with a known depth, then fill in the depths on the way back down.
+    hierarchy = []
+    while obj is not None and obj not in depths:
+        hierarchy.append(obj)
+        obj = obj.parent
+    depth = depths[obj] if obj is not None else 0
+    for hierarchy_obj in reversed(hierarchy):
+        depth += 1
+        depths[hierarchy_obj] = depth
+
+    return depth
+
+
 def scn_get_instance_objects(
     objs: typing.Iterable[bpy.types.Object] = ()
 ) -> dict:
     """
     Gets all instanced Curve and Mesh Objects in a given an array of Objects (defaults to all Objects in the active view layer).
+    Each instanced Object's data name is mapped to all Objects in the view layer that share the data
+    and are visible and selectable (as selected by bpy.ops.object.select_linked(type='OBDATA')),
+    sorted by hierarchy depth, then name. The data is indexed in one pass over the view layer's Objects,
+    without operators, so the selection is not changed.
     """
     obj_data_types = (bpy.types.Curve, bpy.types.Mesh)
-    objs = objs or bpy.context.view_layer.objects
+    view_lyr = bpy.context.view_layer
+    objs = objs or view_lyr.objects
     objs = (obj for obj in objs if isinstance(obj.data, obj_data_types))
     inst_objs = {}
 
+    # Index the Objects in the view layer by their (multi-user) data.
+    data_objs = {}
+    for obj in view_lyr.objects:
+        if isinstance(obj.data, obj_data_types) and obj.data.users > 1:
+            data_objs.setdefault(obj.data, []).append(obj)
+
+    depths = {}
     for obj in objs:
-        if obj.data.users > 1:
-            scn_select_items(items=[obj])
-            bpy.ops.object.select_linked(type='OBDATA')
-            if len(bpy.context.selected_objects) > 1 and obj.data.name not in inst_objs:
-                inst_objs[obj.data.name] = sorted(bpy.context.selected_objects, key=lambda obj: (len(scn_get_hierarchy(obj)), obj.name))
-            scn_select_items(items=[])
+        if obj.data.users > 1 and obj.data.name not in inst_objs:
+            linked_objs = [
+                linked_obj for linked_obj in data_objs.get(obj.data, ())
+                if linked_obj == obj or (linked_obj.visible_get(view_layer=view_lyr) and not linked_obj.hide_select)
+            ]
+            if len(linked_objs) > 1:
+                inst_objs[obj.data.name] = sorted(
+                    linked_objs,
+                    key=lambda linked_obj: (scn_get_hierarchy_depth(linked_obj, depths), linked_obj.name)
+                )
 
     return inst_objs
 
@@ -215,8 +538,9 @@ def scn_get_objects_of_type(
     col = bpy.data.collections.get(col_name)
     objs = col.all_objects if col is not None else bpy.data.objects
     objs_of_type = [obj for obj in objs if obj.type == obj_type]
+    depths = {}
 
-    return sorted(objs_of_type, key=lambda obj: (len(scn_get_hierarchy(obj)), obj.name))
+    return sorted(objs_of_type, key=lambda obj: (scn_get_hierarchy_depth(obj, depths), obj.name))
 
 
 def scn_get_parent_collection(
@@ -229,6 +553,20 @@ def scn_get_parent_collection(
     return None
 
 
+def scn_get_scene_index() -> ScnSceneIndex:
+    """
+    Gets the session-wide scene index (created and registered on first use).
+
+    :returns: The scene index.
+    """
+    global SCN_SCENE_INDEX
+    if SCN_SCENE_INDEX is None:
+        SCN_SCENE_INDEX = ScnSceneIndex()
+        SCN_SCENE_INDEX.register()
+
+    return SCN_SCENE_INDEX
+
+
 def scn_get_selected_objects(
     type_filter: typing.Sequence = (),
 ) -> list:
@@ -312,15 +650,20 @@ def scn_select_items(
 
     if bpy.context.mode != mode:
         bpy.ops.object.mode_set(mode=mode)
-    bpy.ops.object.select_all(action='DESELECT')
 
+    # Deselect through the data API (bpy.ops.object.select_all() updates every Object in the view layer).
+    for sl_obj in list(bpy.context.view_layer.objects.selected):
+        sl_obj.select_set(False)
+
+    # Set the active Object once (the last item, unless an active Object is given).
+    last_item = None
     for item in items:
         if isinstance(item, bpy.types.bpy_struct):
             scn_set_all_hidden(item, False)
             item.select_set(True)
-            if mode == 'OBJECT':
-                bpy.context.view_layer.objects.active = item
-    
+            last_item = item
+
+    active_obj = active_obj or last_item
     if active_obj and mode == 'OBJECT':
         bpy.context.view_layer.objects.active = active_obj
     
@@ -5,17 +5,215 @@ MAS Blender - BPY - MDL
 
 """
 
+import contextlib
+import logging
 import re
 import typing
 
 import bmesh
 import bpy
 import mathutils
+import numpy as np
 
 from mas_blender.mas_bpy._bpy_core import bpy_ctx, bpy_scn
 from mas_blender.mas_py import py_util
 
 
+#: Shape Key (Key Block) properties copied to recreated Shape Keys (in the order they are set).
+MDL_SHAPE_KEY_PROPS = (
+    'interpolation', 'mute', 'slider_max', 'slider_min', 'value', 'vertex_group'
+)
+
+
+class MdlShapeKeyBaker(object):
+    """
+    Batch Shape Key baking engine.
+    Each job evaluates an Object (at a frame, with a set of Modifiers and a pinned Shape Key)
+    through the Dependency Graph, and keeps the evaluated vertex positions as a bulk coordinate buffer
+    until they are written to the Object as a new Shape Key.
+    Jobs are grouped by frame, so each frame is set once for all Objects,
+    and jobs for different Objects on the same frame share a single Dependency Graph evaluation.
+    """
+    def __init__(self) -> None:
+        """
+        Constructor method.
+        """
+        #: Jobs to evaluate (see add_job()).
+        self.jobs = []
+        #: Evaluated vertex positions for each (Object, Shape Key name), in the order jobs were added.
+        self.coords = {}
+
+    @staticmethod
+    @contextlib.contextmanager
+    def job_state(
+        obj: bpy.types.Object,
+        mdfrs: typing.Iterable[bpy.types.Modifier] = None,
+        shape_key_index: int = 0,
+    ) -> typing.Iterator[bpy.types.Object]:
+        """
+        Context manager that sets up an Object for evaluation, and restores it afterwards.
+
+        :param obj: The Object to set up.
+        :param mdfrs: The only Modifiers shown while evaluating
+            (if None, the Modifiers are evaluated as they are).
+        :param shape_key_index: Index of the Shape Key pinned at full influence while evaluating
+            (default: 0, the basis).
+        """
+        mdfr_states = {mdfr.name: mdfr.show_viewport for mdfr in obj.modifiers}
+        shp_key_states = (obj.show_only_shape_key, obj.active_shape_key_index)
+
+        try:
+            if mdfrs is not None:
+                mdfrs = list(mdfrs)
+                for mdfr in obj.modifiers:
+                    mdfr.show_viewport = mdfr in mdfrs
+
+            if obj.data.shape_keys is not None:
+                obj.show_only_shape_key = True
+                obj.active_shape_key_index = shape_key_index
+
+            yield obj
+
+        finally:
+            obj.show_only_shape_key, obj.active_shape_key_index = shp_key_states
+            for mdfr in obj.modifiers:
+                if mdfr.name in mdfr_states:
+                    mdfr.show_viewport = mdfr_states[mdfr.name]
+
+    def add_job(
+        self,
+        obj: bpy.types.Object,
+        shape_key_name: str,
+        frame: int = None,
+        mdfrs: typing.Iterable[bpy.types.Modifier] = None,
+        shape_key_index: int = 0,
+    ) -> None:
+        """
+        Adds a job to evaluate.
+
+        :param obj: The (Mesh) Object to evaluate.
+        :param shape_key_name: Name of the Shape Key to create from the evaluated vertex positions.
+        :param frame: Frame to evaluate the Object at (default: the current frame).
+        :param mdfrs: The only Modifiers shown while evaluating
+            (if None, the Modifiers are evaluated as they are).
+        :param shape_key_index: Index of the Shape Key pinned at full influence while evaluating
+            (default: 0, the basis).
+        """
+        self.jobs.append({
+            'obj': obj,
+            'shape_key_name': shape_key_name,
+            'frame': frame,
+            'mdfrs': list(mdfrs) if mdfrs is not None else None,
+            'shape_key_index': shape_key_index,
+        })
+
+    def evaluate(self) -> dict:
+        """
+        Evaluates all jobs (one frame change per frame, one Dependency Graph evaluation per job pass).
+        The current frame is restored afterwards.
+
+        :returns: Evaluated vertex positions for each (Object, Shape Key name).
+        """
+        scene = bpy.context.scene
+        current_frame = scene.frame_current
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+
+        # Group the jobs by frame (jobs for the current frame first).
+        frame_jobs = {}
+        for job in self.jobs:
+            frame_jobs.setdefault(job['frame'], []).append(job)
+        frames = sorted(frame_jobs, key=lambda frame: (frame is not None, frame or 0))
+
+        try:
+            for frame in frames:
+                if frame is not None and frame != scene.frame_current:
+                    scene.frame_set(frame)
+
+                    # Force driver updates
+                    for obj in {job['obj'] for job in frame_jobs[frame]}:
+                        if obj.animation_data:
+                            for fcrv in obj.animation_data.drivers:
+                                fcrv.driver.expression = fcrv.driver.expression
+                                fcrv.update()
+
+                # Split the jobs into passes with at most one job per Object.
+                job_passes = []
+                for job in frame_jobs[frame]:
+                    for job_pass in job_passes:
+                        if job['obj'] not in (pass_job['obj'] for pass_job in job_pass):
+                            job_pass.append(job)
+                            break
+                    else:
+                        job_passes.append([job])
+
+                for job_pass in job_passes:
+                    with contextlib.ExitStack() as job_stack:
+                        for job in job_pass:
+                            job_stack.enter_context(
+                                self.job_state(job['obj'], job['mdfrs'], job['shape_key_index'])
+                            )
+                        depsgraph.update()
+
+                        for job in job_pass:
+                            self.coords[(job['obj'], job['shape_key_name'])] = \
+                                mdl_get_evaluated_coords(job['obj'], depsgraph)
+
+        finally:
+            if scene.frame_current != current_frame:
+                scene.frame_set(current_frame)
+            self.jobs.clear()
+
+        return self.coords
+
+    def write(
+        self,
+        objs: typing.Iterable[bpy.types.Object] = None,
+        move_to_top: bool = False,
+    ) -> typing.List[bpy.types.ShapeKey]:
+        """
+        Writes the evaluated vertex positions as new Shape Keys (a basis is added if necessary).
+        Written coordinate buffers are released.
+
+        :param objs: Only write Shape Keys for these Objects (default: all evaluated Objects).
+        :param move_to_top: If True, new Shape Keys are placed directly after the basis
+            (in the order the jobs were added); otherwise, they are added after existing Shape Keys.
+        :returns: The new Shape Keys.
+        """
+        objs = list(objs) if objs is not None else None
+        new_key_names = {}
+
+        for (obj, shape_key_name), coords in list(self.coords.items()):
+            if objs is not None and obj not in objs:
+                continue
+
+            del self.coords[(obj, shape_key_name)]
+
+            if coords.size != len(obj.data.vertices) * 3:
+                logging.warning(
+                    f'Shape Key "{shape_key_name}" skipped for "{obj.name}": '
+                    f'vertex count does not match ({coords.size // 3} != {len(obj.data.vertices)}).'
+                )
+                continue
+
+            if obj.data.shape_keys is None:
+                obj.shape_key_add(name='Basis', from_mix=False)
+
+            new_key_block = obj.shape_key_add(name=shape_key_name, from_mix=False)
+            new_key_block.data.foreach_set('co', coords)
+            new_key_names.setdefault(obj, []).append(new_key_block.name)
+
+        for obj, obj_key_names in new_key_names.items():
+            if move_to_top:
+                mdl_reorder_shape_keys(obj, obj_key_names)
+            obj.data.update()
+
+        # Shape Keys are looked up by name, as reordering recreates them.
+        return [
+            obj.data.shape_keys.key_blocks[key_name]
+            for obj, obj_key_names in new_key_names.items() for key_name in obj_key_names
+        ]
+
+
 def mdl_add_objects_as_shape_keys(
     trgt_obj: bpy.types.Object,
     src_objs: typing.Iterable[bpy.types.Object],
@@ -51,74 +249,104 @@ def mdl_apply_modifier(
 
 
 def mdl_apply_modifiers_to_object(
-    obj,
+    obj: bpy.types.Object,
     mdfr_list: typing.Iterable[bpy.types.Modifier],
     all_users: bool = False,
 ) -> bpy.types.Object:
-    """TODO"""
-
-    if not mdfr_list:
+    """
+    Applies the given Modifiers to the Object's Mesh, preserving its Shape Keys.
+    The Mesh is evaluated once for the basis and once per Shape Key (pinned at full influence),
+    and the evaluated vertex positions are written into new Shape Keys in bulk.
+    Modifiers that are not in the list are ignored during evaluation and kept on the Object.
+    No Objects are duplicated and no operators are used (selection is left unchanged).
+
+    :param obj: The Mesh Object to apply the Modifiers to.
+    :param mdfr_list: The Modifiers (of the Object) to apply.
+    :param all_users: If True, Objects sharing the Mesh use the new Mesh as well
+        (and their Modifiers matching the applied ones, by name and type, are removed);
+        otherwise, only the given Object gets the new Mesh.
+    :returns: The given Object (kept for compatibility with callers that reassign the result).
+    """
+    mdfr_list = list(mdfr_list)
+    if not mdfr_list or not isinstance(obj.data, bpy.types.Mesh):
         return obj
 
-    if not mdl_has_shape_keys(obj):
-        for mdfr in mdfr_list:
-            mdl_apply_modifier(obj, mdfr, all_users)
+    old_mesh = obj.data
+    old_key = old_mesh.shape_keys
+    key_blocks = list(old_key.key_blocks) if old_key is not None else []
+
+    # Evaluate the basis with only the listed Modifiers.
+    with MdlShapeKeyBaker.job_state(obj, mdfrs=mdfr_list, shape_key_index=0):
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        depsgraph.update()
+        new_mesh = bpy.data.meshes.new_from_object(
+            obj.evaluated_get(depsgraph),
+            preserve_all_data_layers=True,
+            depsgraph=depsgraph,
+        )
+
+    # Evaluate each Shape Key (besides the basis) at the current frame.
+    shp_key_baker = MdlShapeKeyBaker()
+    for shp_key_index, key_block in enumerate(key_blocks[1:], 1):
+        shp_key_baker.add_job(
+            obj, key_block.name, mdfrs=mdfr_list, shape_key_index=shp_key_index
+        )
+
+    try:
+        for (_, shp_key_name), coords in shp_key_baker.evaluate().items():
+            if coords.size != len(new_mesh.vertices) * 3:
+                raise ValueError(
+                    f'Modifiers change the vertex count of "{obj.name}" for Shape Key "{shp_key_name}".'
+                )
+
+    except Exception:
+        bpy.data.meshes.remove(new_mesh)
+        raise
+
+    # Swap the Mesh and remove the applied Modifiers
+    # (from the Objects sharing the Mesh too, as the new Mesh already has them applied).
+    mdfr_keys = {(mdfr.name, mdfr.type) for mdfr in mdfr_list}
+    for mdfr in mdfr_list:
+        obj.modifiers.remove(mdfr)
+
+    if all_users:
+        for user_obj in bpy.data.objects:
+            if user_obj.data == old_mesh and user_obj != obj:
+                for mdfr in [mdfr for mdfr in user_obj.modifiers if (mdfr.name, mdfr.type) in mdfr_keys]:
+                    user_obj.modifiers.remove(mdfr)
+        old_mesh.user_remap(new_mesh)
+    else:
+        obj.data = new_mesh
+
+    # Recreate the Shape Keys (with the properties of the original Shape Keys).
+    if key_blocks:
+        obj.shape_key_add(name=key_blocks[0].name, from_mix=False)
+        shp_key_baker.write(objs=[obj])
+
+        new_key = new_mesh.shape_keys
+        new_key.use_relative = old_key.use_relative
+        for key_block, new_key_block in zip(key_blocks, new_key.key_blocks):
+            for prop_name in MDL_SHAPE_KEY_PROPS:
+                setattr(new_key_block, prop_name, getattr(key_block, prop_name))
+            new_key_block.relative_key = new_key.key_blocks[key_block.relative_key.name]
+
+        if old_key.animation_data is not None:
+            new_anim_data = new_key.animation_data_create()
+            new_anim_data.action = old_key.animation_data.action
+            for drv_fcrv in old_key.animation_data.drivers:
+                new_anim_data.drivers.from_existing(src_driver=drv_fcrv)
+
+    obj.data.update()
+
+    # Remove the original Mesh if it is no longer used, and take its name.
+    mesh_name = old_mesh.name
+    if old_mesh.users == 0:
+        bpy.data.meshes.remove(old_mesh)
+        new_mesh.name = mesh_name
+
+    return obj
+
 
-        return obj
-    
-    # Get the Shape Key names.
-    shp_key_names = []
-    for block in obj.data.shape_keys.key_blocks:
-        shp_key_names.append(block.name)
-
-    # create receiving object that will contain all collapsed shapekeys
-    obj_copy = bpy_scn.scn_copy_object(obj=obj)
-    # bake in the shapekey
-    mdl_apply_shape_key(obj_copy, 0)
-    # apply the selected modifiers
-    for entry in mdfr_list:
-        mdl_apply_modifier(obj_copy, entry, all_users)
-    # get the number of shapekeys on the original mesh
-    num_shps = len(obj.data.shape_keys.key_blocks)
-
-    # create a copy for each blendshape and transfer it to the obj_copy one after the other
-    # start the loop at 1 so we skip the base shapekey
-    for i in range(1, num_shps):
-        # copy of baseobject / blendshape donor
-        bs = bpy_scn.scn_copy_object(obj=obj)
-        # bake shapekey
-        mdl_apply_shape_key(bs, i)
-        # # apply the selected modifiers
-        for entry in mdfr_list:
-            mdl_apply_modifier(bs, entry, all_users)
-
-        # remove all the other modifiers
-        # they are not needed the obj_copy object has them
-        mdl_remove_modifiers(bs)
-
-        # add the copy as a blendshape to the obj_copy
-        mdl_add_objects_as_shape_keys(obj_copy, [bs])
-
-        # restore the shapekey name
-        obj_copy.data.shape_keys.key_blocks[i].name = shp_key_names[i]
-
-        # delete the blendshape donor and its mesh datablock (save memory)
-        mesh_data = bs.data
-        bpy.data.objects.remove(bs)
-        bpy.data.meshes.remove(mesh_data)
-
-    # delete the original and its mesh data
-    orig_name = obj.name
-    orig_data = obj.data
-    bpy.data.objects.remove(obj)
-    bpy.data.meshes.remove(orig_data)
-
-    # rename the obj_copy
-    obj_copy.name = orig_name
-
-    return obj_copy
-    
-    
 def mdl_apply_shape_key(
     obj: bpy.types.Object,
     shp_key_index: int,
@@ -184,37 +412,108 @@ def mdl_delete_vertex_groups_by_name(obj, prefix='', suffix=''):
             obj.vertex_groups.remove(vtx_grp)
 
 
-def mdl_delete_vertex_groups_by_weight(obj, threshold=0.001):
+def mdl_delete_vertex_groups_by_weight(
+    obj: bpy.types.Object,
+    threshold: float = 0.001,
+    normalize: bool = False,
+) -> typing.List[str]:
     """
     Removes all empty vertex groups or vertex groups with vertices below the specified weight threshold
-    from the given object.
+    from the given object (in a single pass over the Mesh's vertex weights).
+    Vertex groups used by the object's modifiers (e.g. Mask, Displace) are never removed.
 
     Args:
         obj (bpy.types.Object): The object from which to remove low-weight vertex groups.
         threshold (float, optional): The weight threshold below which vertex groups will be removed.
             Default is 0.001.
-    TODO: normalize, buggy
+        normalize (bool, optional): If True, normalize the weights of the remaining vertex groups
+            for each vertex (so they add up to 1.0). Default is False.
+
+    Returns:
+        list: Names of the removed vertex groups.
     """
-    if obj.vertex_groups is not None:
+    if not isinstance(obj.data, bpy.types.Mesh) or not obj.vertex_groups:
+        return []
+
+    # Gather every (vertex, group, weight) element of the Mesh in a single traversal.
+    vtx_grp_elems = [
+        (vtx.index, vtx_grp_elem.group, vtx_grp_elem.weight)
+        for vtx in obj.data.vertices for vtx_grp_elem in vtx.groups
+    ]
+    vtx_grp_elems = np.array(vtx_grp_elems, dtype=np.float64).reshape(-1, 3)
+    vtx_indices = vtx_grp_elems[:, 0].astype(np.int64)
+    grp_indices = vtx_grp_elems[:, 1].astype(np.int64)
+    weights = vtx_grp_elems[:, 2]
+
+    # Per-group maximum weight (groups without any elements stay at -1.0).
+    grp_max_weights = np.full(len(obj.vertex_groups), -1.0)
+    np.maximum.at(grp_max_weights, grp_indices, weights)
+
+    mdfr_grp_names = {
+        getattr(mdfr, prop_key)
+        for mdfr in obj.modifiers
+        for prop_key in mdfr.bl_rna.properties.keys()
+        if prop_key.startswith('vertex_group') and isinstance(getattr(mdfr, prop_key), str)
+    }
+    grps_to_keep = grp_max_weights >= threshold
+    for vtx_grp in obj.vertex_groups:
+        if vtx_grp.name in mdfr_grp_names:
+            grps_to_keep[vtx_grp.index] = True
+
+    if normalize and weights.size:
+        elems_to_keep = grps_to_keep[grp_indices]
+        vtx_weight_sums = np.bincount(
+            vtx_indices[elems_to_keep],
+            weights=weights[elems_to_keep],
+            minlength=len(obj.data.vertices),
+        )
+        elem_sums = vtx_weight_sums[vtx_indices]
+        normalized_weights = np.where(
+            elems_to_keep & (elem_sums > 0.0),
+            weights / np.where(elem_sums > 0.0, elem_sums, 1.0),
+            weights,
+        )
 
-        # Create a list of vertex groups to remove
-        vtx_grps_to_remove = []
+        # Write the normalized weights back (in the same order the elements were gathered).
+        normalized_weights = iter(normalized_weights.tolist())
+        for vtx in obj.data.vertices:
+            for vtx_grp_elem in vtx.groups:
+                vtx_grp_elem.weight = next(normalized_weights)
 
-        # Iterate over all vertex groups
-        for vtx_grp in obj.vertex_groups:
+    vtx_grps_to_remove = [
+        vtx_grp for vtx_grp in obj.vertex_groups if not grps_to_keep[vtx_grp.index]
+    ]
+    vtx_grp_names = [vtx_grp.name for vtx_grp in vtx_grps_to_remove]
 
-            # Check if the group is empty or has low-weight vertices
-            if isinstance(obj.data, bpy.types.Mesh):
-                vtx_weights = [
-                    weight.weight for vtx in obj.data.vertices for weight in vtx.groups if weight.group == vtx_grp.index
-                ]
-                if vtx_weights:
-                    if max(vtx_weights) >= threshold:
-                        continue
-            vtx_grps_to_remove.append(vtx_grp)
-        
-        for vtx_grp in vtx_grps_to_remove:
-            obj.vertex_groups.remove(vtx_grp)
+    for vtx_grp in vtx_grps_to_remove:
+        obj.vertex_groups.remove(vtx_grp)
+
+    return vtx_grp_names
+
+
+def mdl_get_evaluated_coords(
+    obj: bpy.types.Object,
+    depsgraph: bpy.types.Depsgraph = None,
+) -> np.ndarray:
+    """
+    Reads the evaluated (deformed, with Modifiers and Shape Keys) vertex positions of an Object in bulk.
+
+    :param obj: The Object to evaluate.
+    :param depsgraph: The evaluated Dependency Graph (default: the Dependency Graph of the context).
+    :returns: Flat array of vertex positions in local space (x, y, z for each vertex).
+    """
+    depsgraph = depsgraph or bpy.context.evaluated_depsgraph_get()
+    obj_eval = obj.evaluated_get(depsgraph)
+    mesh_eval = obj_eval.to_mesh()
+
+    try:
+        coords = np.empty(len(mesh_eval.vertices) * 3, dtype=np.float32)
+        mesh_eval.vertices.foreach_get('co', coords)
+
+    finally:
+        obj_eval.to_mesh_clear()
+
+    return coords
 
 
 def mdl_get_inputs_from_modifiers(
@@ -251,12 +550,18 @@ def mdl_join_objects(
     objects: typing.Iterable[bpy.types.Object],
     new_name: str = '',
 ) -> bpy.types.Object:
-    """TODO"""
+    """
+    Joins the given Objects into the last one (see bpy.ops.object.join()), without changing the selection.
+
+    :param objects: The Objects to join.
+    :param new_name: Name of the joined Object (and its data).
+    :returns: The joined Object.
+    """
     objects = [obj for obj in objects if obj.data]
-    bpy_scn.scn_select_items(items=objects)
-    bpy.ops.object.join()
-    new_obj = bpy.context.active_object
-    new_obj.name = new_name or bpy.context.active_object.name
+    new_obj = objects[-1]
+    with bpy_ctx.ctx_override(objects, active_obj=new_obj):
+        bpy.ops.object.join()
+    new_obj.name = new_name or new_obj.name
     new_obj.data.name = new_obj.name
 
     return new_obj
@@ -285,6 +590,61 @@ def mdl_set_origin(
     obj.matrix_world.translation = origin_vec
 
 
+def mdl_reorder_shape_keys(
+    obj: bpy.types.Object,
+    shape_key_names: typing.Iterable[str],
+    index: int = 1,
+) -> None:
+    """
+    Moves the named Shape Keys to the given index (in the given order), without operators.
+    Shape Keys from the first changed position onwards are recreated in the new order
+    (their vertex positions and properties are copied in bulk).
+
+    :param obj: The Object with the Shape Keys.
+    :param shape_key_names: Names of the Shape Keys to move.
+    :param index: Index to move the Shape Keys to (the basis cannot be moved; default: 1).
+    """
+    key_blocks = obj.data.shape_keys.key_blocks
+    key_names = [key_block.name for key_block in key_blocks]
+    moved_names = [key_name for key_name in shape_key_names if key_name in key_names]
+    index = max(1, min(index, len(key_names)))
+
+    kept_names = [key_name for key_name in key_names if key_name not in moved_names]
+    new_key_names = kept_names[:index] + moved_names + kept_names[index:]
+    changed_index = next(
+        (i for i, (key_name, new_key_name) in enumerate(zip(key_names, new_key_names))
+         if key_name != new_key_name),
+        len(key_names),
+    )
+    if changed_index == len(key_names):
+        return
+
+    # Snapshot the Shape Keys to recreate, and the relative Shape Keys of all Shape Keys.
+    relative_key_names = {key_block.name: key_block.relative_key.name for key_block in key_blocks}
+    key_snapshots = {}
+    for key_name in key_names[changed_index:]:
+        key_block = key_blocks[key_name]
+        coords = np.empty(len(key_block.data) * 3, dtype=np.float32)
+        key_block.data.foreach_get('co', coords)
+        key_snapshots[key_name] = (
+            coords, {prop_name: getattr(key_block, prop_name) for prop_name in MDL_SHAPE_KEY_PROPS}
+        )
+
+    for key_name in reversed(key_names[changed_index:]):
+        obj.shape_key_remove(key_blocks[key_name])
+
+    for key_name in new_key_names[changed_index:]:
+        coords, key_props = key_snapshots[key_name]
+        key_block = obj.shape_key_add(name=key_name, from_mix=False)
+        key_block.data.foreach_set('co', coords)
+        for prop_name, prop_val in key_props.items():
+            setattr(key_block, prop_name, prop_val)
+
+    key_blocks = obj.data.shape_keys.key_blocks
+    for key_name, relative_key_name in relative_key_names.items():
+        key_blocks[key_name].relative_key = key_blocks[relative_key_name]
+
+
 def mdl_remove_modifiers(
     obj: bpy.types.Object,
 ):
@@ -11,9 +11,11 @@ import re
 import typing
 
 import bpy
+import numpy as np
 
-from mas_blender.mas_bpy._bpy_core import bpy_scn
-from mas_blender.mas_py import py_util
+from mas_blender.mas_bpy import bpy_mdl, bpy_node
+from mas_blender.mas_bpy._bpy_core import bpy_ctx
+from mas_blender.mas_py import py_img, py_util
 
 
 # Load default data from config file.
@@ -21,6 +23,220 @@ bpy_mtl_config_file_path = pathlib.Path(__file__).parent.joinpath('bpy_mtl.confi
 with bpy_mtl_config_file_path.open('r', encoding='UTF-8') as readfile:
     MTL_PBR_PREFS = json.load(readfile)
 
+#: Custom property of images resized by mtl_resize_images() that stores their source file path.
+MTL_IMG_SRC_FILEPATH_PROP = 'mas_src_filepath'
+
+#: Types of users recorded for each image by MtlImageUsageIndex.
+MTL_IMG_USER_TYPES = ('collections', 'materials', 'modifiers', 'node_trees', 'objects')
+
+
+class MtlImageUsageIndex(object):
+    """
+    Index of the images used by Objects, built in one pass: through their Materials
+    (Image Texture nodes, including in node groups, see bpy_node.NodeTreeIndex)
+    and their Modifiers (ImageTexture inputs, see bpy_mdl.mdl_get_inputs_from_modifiers()).
+    Each image is mapped to the node trees, Materials, Modifiers, Objects and Collections
+    (including parent Collections) that use it, and the images of each Material, Object and Collection
+    are recorded for reverse lookups, so per-Collection texture work is a dictionary lookup.
+    The index is a snapshot: call build() again after the Objects' Materials or Modifiers change.
+
+    .. code-block:: python
+
+        img_usage_index = bpy_mtl.MtlImageUsageIndex()
+        for img in img_usage_index.get_collection_images(bpy.data.collections['COL_body']):
+            print(img.name, img_usage_index.get_image_users(img)['materials'])
+
+    """
+
+    def __init__(
+        self,
+        objs: typing.Union[typing.Iterable[bpy.types.Object], None] = None,
+    ) -> None:
+        """
+        Constructor method.
+
+        :param objs: The Objects to index (by default, all Objects and Materials of the file).
+        """
+        self.objs = objs if objs is None else list(objs)
+
+        self._col_images = {}
+        self._col_mdfr_images = {}
+        self._col_parents = None
+        self._image_users = {}
+        self._mtl_images = {}
+        self._obj_mdfr_images = {}
+        self._obj_mtls = {}
+
+        self.build()
+
+    def _add_user(self, img: bpy.types.Image, user_type: str, user) -> None:
+        """
+        Records a user of an image.
+        """
+        img_users = self._image_users.get(img)
+        if img_users is None:
+            img_users = self._image_users[img] = {user_type: {} for user_type in MTL_IMG_USER_TYPES}
+        img_users[user_type][user] = None
+
+    def _get_collections(self, col: bpy.types.Collection, cols: dict) -> None:
+        """
+        Adds a Collection and its parent Collections (recursively) to the given dict.
+        """
+        if col in cols:
+            return
+        cols[col] = None
+        for parent_col in self._col_parents.get(col, ()):
+            self._get_collections(parent_col, cols)
+
+    def _index_material(self, mtl: bpy.types.Material) -> None:
+        """
+        Indexes the images of a Material's Image Texture nodes (if not indexed yet).
+        """
+        if mtl in self._mtl_images:
+            return
+
+        tex_img_nodes = bpy_node.node_get_node_tree_index().get_nodes(
+            mtl.node_tree,
+            node_types=(bpy.types.ShaderNodeTexImage,),
+        ) if mtl.node_tree is not None else []
+
+        mtl_images = {}
+        for tex_img in tex_img_nodes:
+            if tex_img.image is not None:
+                mtl_images[tex_img.image] = None
+                self._add_user(tex_img.image, 'node_trees', tex_img.id_data)
+                self._add_user(tex_img.image, 'materials', mtl)
+        self._mtl_images[mtl] = list(mtl_images)
+
+    def build(self) -> None:
+        """
+        (Re)builds the index.
+        """
+        self._col_images.clear()
+        self._col_mdfr_images.clear()
+        self._image_users.clear()
+        self._mtl_images.clear()
+        self._obj_mdfr_images.clear()
+        self._obj_mtls.clear()
+
+        # Map each Collection to its parent Collection(s), to record the images of the Objects' parent Collections.
+        self._col_parents = {}
+        for col in bpy.data.collections:
+            for child_col in col.children:
+                self._col_parents.setdefault(child_col, []).append(col)
+        col_ancestors = {}
+
+        for obj in bpy.data.objects if self.objs is None else self.objs:
+            obj_mtls = [mtl for mtl in dict.fromkeys(mtl_get_mtls_from_obj(obj)) if mtl is not None]
+            obj_images = {}
+            for mtl in obj_mtls:
+                self._index_material(mtl)
+                obj_images.update(dict.fromkeys(self._mtl_images[mtl]))
+            self._obj_mtls[obj] = obj_mtls
+
+            obj_mdfr_images = {}
+            for mdfr in obj.modifiers:
+                img_texs = bpy_mdl.mdl_get_inputs_from_modifiers(
+                    obj=obj,
+                    input_types=(bpy.types.ImageTexture,),
+                    mdfrs=(mdfr,),
+                ).values()
+                for img_tex in img_texs:
+                    if img_tex.image is not None:
+                        obj_mdfr_images[img_tex.image] = None
+                        self._add_user(img_tex.image, 'modifiers', mdfr)
+            self._obj_mdfr_images[obj] = list(obj_mdfr_images)
+
+            # Record the images for the Object, its Collection(s) and their parent Collection(s).
+            obj_cols = {}
+            for usr_col in obj.users_collection:
+                if usr_col not in col_ancestors:
+                    col_ancestors[usr_col] = {}
+                    self._get_collections(usr_col, col_ancestors[usr_col])
+                obj_cols.update(col_ancestors[usr_col])
+
+            for img in {**obj_images, **obj_mdfr_images}:
+                self._add_user(img, 'objects', obj)
+            for col in obj_cols:
+                self._col_images.setdefault(col, {}).update(obj_images)
+                self._col_mdfr_images.setdefault(col, {}).update(obj_mdfr_images)
+                for img in {**obj_images, **obj_mdfr_images}:
+                    self._add_user(img, 'collections', col)
+
+        # Index unused Materials too when indexing the whole file.
+        if self.objs is None:
+            for mtl in bpy.data.materials:
+                self._index_material(mtl)
+
+    def get_collection_images(
+        self,
+        col: bpy.types.Collection,
+        modifiers: bool = True,
+    ) -> list:
+        """
+        Gets the images used by the indexed Objects in a Collection (and its child Collections).
+
+        :param col: The Collection.
+        :param modifiers: If True, include the images used by the Objects' Modifiers.
+        :returns: The images.
+        """
+        col_images = dict(self._col_images.get(col, {}))
+        if modifiers:
+            col_images.update(self._col_mdfr_images.get(col, {}))
+
+        return list(col_images)
+
+    def get_image_users(
+        self,
+        img: bpy.types.Image,
+    ) -> dict:
+        """
+        Gets the users of an image.
+
+        :param img: The image.
+        :returns: The node trees, Materials, Modifiers, Objects and Collections that use the image,
+            keyed by user type (see MTL_IMG_USER_TYPES).
+        """
+        img_users = self._image_users.get(img, {})
+
+        return {user_type: list(img_users.get(user_type, ())) for user_type in MTL_IMG_USER_TYPES}
+
+    def get_images(self) -> list:
+        """
+        :returns: All indexed images.
+        """
+        return list(self._image_users)
+
+    def get_material_images(
+        self,
+        mtl: bpy.types.Material,
+    ) -> list:
+        """
+        Gets the images used by a Material.
+
+        :param mtl: The Material.
+        :returns: The images.
+        """
+        return list(self._mtl_images.get(mtl, ()))
+
+    def get_object_images(
+        self,
+        obj: bpy.types.Object,
+        modifiers: bool = True,
+    ) -> list:
+        """
+        Gets the images used by an Object.
+
+        :param obj: The Object.
+        :param modifiers: If True, include the images used by the Object's Modifiers.
+        :returns: The images (of the Materials, in Material Slot order, then of the Modifiers).
+        """
+        obj_images = {img: None for mtl in self._obj_mtls.get(obj, ()) for img in self._mtl_images[mtl]}
+        if modifiers:
+            obj_images.update(dict.fromkeys(self._obj_mdfr_images.get(obj, ())))
+
+        return list(obj_images)
+
 
 def mtl_assign_material(
     target_object: bpy.types.Object,
@@ -50,15 +266,33 @@ def mtl_get_mtls_from_obj(
     active_mtl_only: bool = False,
     in_use_mtls_only: bool = False,
 ) -> list:
-    """"""
+    """
+    Gets the Materials of the Object's Material Slots.
+
+    :param obj: The Object to get Materials from.
+    :param active_mtl_only: If True, only get the active Material.
+    :param in_use_mtls_only: If True, only get Materials assigned to polygons
+        (ordered by first use in the Mesh).
+    :returns: List of Materials.
+    """
     
     if active_mtl_only:
         return [obj.active_material]
 
     elif in_use_mtls_only:
+        if not obj.material_slots:
+            return []
+
+        # Read all polygon material indices in bulk, then reduce them to the unique indices
+        # ordered by first occurrence (polygon order).
+        mtl_indices = np.empty(len(obj.data.polygons), dtype=np.int32)
+        obj.data.polygons.foreach_get('material_index', mtl_indices)
+        mtl_indices = np.clip(mtl_indices, 0, len(obj.material_slots) - 1)
+        unique_mtl_indices, first_indices = np.unique(mtl_indices, return_index=True)
+
         mtls = []
-        for f in obj.data.polygons:
-            f_mtl = obj.material_slots[f.material_index].material
+        for mtl_index in unique_mtl_indices[np.argsort(first_indices)].tolist():
+            f_mtl = obj.material_slots[mtl_index].material
             if f_mtl not in mtls:
                 mtls.append(f_mtl)
         return mtls
@@ -86,44 +320,113 @@ def mtl_remove_unused_material_slots(
             removed_mtl_slots[mtl_slot.slot_index] = mtl
             mtl_slot.material = None
     
-    # 
-    current_sl = bpy_scn.scn_select_items(
-        items=[obj]
-    )
-    bpy.ops.object.material_slot_remove_unused()
-    bpy_scn.scn_select_items(
-        items=current_sl[0],
-        active_obj=current_sl[1]
-    )
+    # Remove the emptied Material Slots (without changing the selection).
+    with bpy_ctx.ctx_override([obj]):
+        bpy.ops.object.material_slot_remove_unused()
 
     return removed_mtl_slots
 
 
-# def mtl_resize_image_textures(
-#     images: typing.Iterable[bpy.types.Image],
-#     max_height: int = 2048,
-#     max_width: int = 2048,
-#     proportional: bool = True
-# ) -> list:
-#     """TODO depreciate"""
-#     resized_images = []
-
-#     for image in images:
-#         if (image.size[0] > max_width) or (image.size[1] > max_height):
-
-#             if proportional:
-#                 scale_val = max(((image.size[0] / max_width), (image.size[1] / max_height)))
-#                 scale_width = int(image.size[0] / scale_val)
-#                 scale_height = int(image.size[1] / scale_val)
-
-#             else:
-#                 scale_width = int(image.size[0] / (image.size[0] / max_width))
-#                 scale_height = int(image.size[1] / (image.size[1] / max_height))
+def mtl_reset_resized_images(
+    images: typing.Iterable[bpy.types.Image],
+) -> None:
+    """
+    Reverts images resized by mtl_resize_images():
+    images repointed to resized files are pointed back to their source files,
+    and images scaled in the session are reloaded from disk.
 
-#             image.scale(scale_width, scale_height)
-#             resized_images.append(image)
+    :param images: The images to revert.
+    """
+    for img in images:
+        if MTL_IMG_SRC_FILEPATH_PROP in img:
+            img.filepath = img[MTL_IMG_SRC_FILEPATH_PROP]
+            del img[MTL_IMG_SRC_FILEPATH_PROP]
+        else:
+            img.reload()
+
+
+def mtl_resize_images(
+    images: typing.Iterable[bpy.types.Image],
+    scale_factor: float = 1.0,
+    minimum_dimensions: typing.Sequence[int] = (0, 0),
+    maximum_dimensions: typing.Sequence[int] = (0, 0),
+    dir_path: typing.Union[pathlib.Path, str, None] = None,
+    rename: bool = False,
+    max_workers: typing.Union[int, None] = None,
+    cache: bool = True,
+) -> typing.List[bpy.types.Image]:
+    """
+    Resizes images by a scale factor and/or to fit maximum dimensions.
+    Images with a source file on disk are resized outside of Blender, in a pool of worker processes
+    (see py_img.img_resize_files()), without loading their pixels into the session:
+    the resized copies are written as "<name>_<width>x<height>_<source>" files
+    (see py_img.img_get_resized_file_path()) and the images are repointed to them. The source file path is kept in the MTL_IMG_SRC_FILEPATH_PROP custom property,
+    so repeated resizes always start from the source file (see mtl_reset_resized_images()).
+    Other images (packed, generated, or files that could not be resized) are scaled in the session.
+
+    :param images: The images to resize.
+    :param scale_factor: Factor to scale the width and height by.
+    :param minimum_dimensions: Minimum width and height after scaling.
+    :param maximum_dimensions: Maximum width and height after scaling (0 for no maximum).
+        Larger images are scaled down proportionally to fit.
+    :param dir_path: Directory for the resized files (default: each source file's directory).
+    :param rename: If True, rename the images to "<name>_<width>x<height>" (default: False).
+    :param max_workers: Number of worker processes (default: the number of CPU cores).
+    :param cache: If True, reuse resized files from the texture cache (see py_img.ImgCache)
+        and only resize files that are not in it (default: True).
+    :returns: The resized images.
+    """
+    file_images = {}
+    session_images = []
+    for img in dict.fromkeys(images):
+        src_file_path = img.get(MTL_IMG_SRC_FILEPATH_PROP, img.filepath)
+        img_file_path = pathlib.Path(bpy.path.abspath(src_file_path, library=img.library)) \
+            if src_file_path else None
+        if img.source == 'FILE' and img.packed_file is None \
+            and img_file_path is not None and img_file_path.is_file():
+            file_images.setdefault(img_file_path.as_posix(), []).append(img)
+        else:
+            session_images.append(img)
+
+    resized_images = []
+    resized_data = py_img.img_resize_files(
+        file_images,
+        scale_factor=scale_factor,
+        minimum_dimensions=minimum_dimensions,
+        maximum_dimensions=maximum_dimensions,
+        dir_path=dir_path,
+        max_workers=max_workers,
+        cache=py_img.img_get_cache() if cache else None,
+    )
+    for img_file_path, resized_file_data in resized_data.items():
+
+        # Fall back to scaling in the session if the file could not be resized.
+        if resized_file_data is None:
+            session_images.extend(file_images[img_file_path])
+            continue
+
+        resized_file_path, dimensions = resized_file_data
+        for img in file_images[img_file_path]:
+            if resized_file_path is not None:
+                img[MTL_IMG_SRC_FILEPATH_PROP] = img.get(MTL_IMG_SRC_FILEPATH_PROP, img.filepath)
+                img.filepath = resized_file_path
+                resized_images.append(img)
+            elif MTL_IMG_SRC_FILEPATH_PROP in img:
+                mtl_reset_resized_images((img,))
+            if rename:
+                img.name = py_img.img_get_resized_name(img.name, dimensions)
+
+    for img in session_images:
+        dimensions = py_img.img_get_resize_dimensions(
+            img.size, scale_factor, minimum_dimensions, maximum_dimensions
+        )
+        if dimensions != tuple(img.size):
+            img.scale(*dimensions)
+            resized_images.append(img)
+        if rename:
+            img.name = py_img.img_get_resized_name(img.name, dimensions)
 
-#     return resized_images
+    return resized_images
 
 
 def mtl_search_replace_image_dir_paths(
@@ -143,17 +446,8 @@ def mtl_search_replace_image_dir_paths(
     updated_img_nodes = []
 
     if collection:
-        img_nodes, mtl_list = [], []
-        mesh_objs = (obj for obj in collection.all_objects if obj.type == 'MESH')
-        for mesh_obj in mesh_objs:
-            for mtl in mesh_obj.data.materials:
-                if mtl not in mtl_list:
-                    for grp in (n for n in mtl.node_tree.nodes if n.type == 'GROUP'):
-                        for tex_img in (n for n in grp.node_tree.nodes if n.type == 'TEX_IMAGE'):
-                            img_nodes.append(tex_img.image)
-                    for tex_img in (n for n in mtl.node_tree.nodes if n.type == 'TEX_IMAGE'):
-                        img_nodes.append(tex_img.image)
-                mtl_list.append(mtl)
+        img_usage_index = MtlImageUsageIndex(obj for obj in collection.all_objects if obj.type == 'MESH')
+        img_nodes = img_usage_index.get_collection_images(collection, modifiers=False)
 
     else:
         img_nodes = bpy.data.images
@@ -209,12 +503,27 @@ def mtl_set_material_at_index(
     if mtl_index < 0:
         mtl_index = obj.active_material_index
 
-    bpy_scn.scn_select_items(items=[obj])
-
+    # Insert the Material Slot at the index through the data API (as material_slot_add() then material_slot_move()):
+    # the Materials and links of the following slots, and the Material indices of the faces using them, shift up.
+    # Out of range face Material indices (e.g. all faces when there were no slots) are clamped to the new slots.
     if (not replace_existing) or (len(obj.material_slots) == 0):
-        bpy.ops.object.material_slot_add()
-        for _ in range(len(obj.material_slots) - mtl_index - 1):
-            bpy.ops.object.material_slot_move(direction='UP')
+        mtl_slots = obj.material_slots
+        old_slot_count = len(mtl_slots)
+        obj.data.materials.append(None)
+        for slot_index in range(len(mtl_slots) - 1, mtl_index, -1):
+            mtl_slots[slot_index].link = mtl_slots[slot_index - 1].link
+            mtl_slots[slot_index].material = mtl_slots[slot_index - 1].material
+        if mtl_index < len(mtl_slots) - 1:
+            mtl_slots[mtl_index].link = 'DATA'
+            mtl_slots[mtl_index].material = None
+
+        for mtl_elems in (getattr(obj.data, 'polygons', None), getattr(obj.data, 'splines', None)):
+            if mtl_elems:
+                mtl_indices = np.empty(len(mtl_elems), dtype=np.int32)
+                mtl_elems.foreach_get('material_index', mtl_indices)
+                mtl_indices[(mtl_indices >= mtl_index) & (mtl_indices < old_slot_count)] += 1
+                np.clip(mtl_indices, 0, len(mtl_slots) - 1, out=mtl_indices)
+                mtl_elems.foreach_set('material_index', mtl_indices)
     
     obj.material_slots[mtl_index].material = mtl
     
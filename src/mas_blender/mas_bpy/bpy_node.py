@@ -6,10 +6,238 @@ MAS Blender - BPY - NODE
 """
 
 import re
+import typing
 
 import bpy
 
-from mas_blender.mas_bpy._bpy_core import bpy_obj, bpy_scn
+from mas_blender.mas_bpy._bpy_core import bpy_ctx, bpy_obj, bpy_scn
+
+
+#: Node types whose node tree is traversed as a node group.
+NODE_GROUP_TYPES = (
+    bpy.types.CompositorNodeGroup,
+    bpy.types.GeometryNodeGroup,
+    bpy.types.NodeGroup,
+    bpy.types.ShaderNodeGroup,
+    bpy.types.TextureNodeGroup,
+)
+
+#: Session-wide node tree index created by node_get_node_tree_index().
+NODE_TREE_INDEX = None
+
+
+class NodeTreeIndex(object):
+    """
+    Memoized traversal of node trees. The nodes of each node tree are indexed once, bucketed by type,
+    with the node trees of its node groups; traversals then combine the cached entries,
+    visiting each node tree once (so node groups shared by many Materials, or by several group nodes,
+    are not walked again, and recursive node groups do not recurse forever).
+    As a result, a node group used by several group nodes of one traversal yields its nodes once
+    (the previous recursive implementation yielded them once per group node).
+
+    An entry is rebuilt when its node tree's signature changed (the names of its nodes, the number of links,
+    and the node trees of its group nodes, looked up by name) and, once registered,
+    when the node tree (or the Material, World, etc. that embeds it) is updated in the depsgraph
+    (see bpy.app.handlers). File loads and undo/redo invalidate all entries.
+
+    .. code-block:: python
+
+        node_index = bpy_node.node_get_node_tree_index()
+        img_nodes = node_index.get_nodes_from_node_trees(
+            (mtl.node_tree for mtl in bpy.data.materials),
+            node_types=(bpy.types.ShaderNodeTexImage,),
+        )
+
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor method.
+        """
+        self._entries = {}
+
+        # bpy.app.handlers.persistent() only accepts functions,
+        # so the methods are wrapped for the handlers to be kept when another file is loaded.
+        self._handlers = {
+            handler_name: bpy.app.handlers.persistent(lambda *args, _handler=handler: _handler(*args))
+            for handler_name, handler in (
+                ('depsgraph_update_post', self._on_depsgraph_update_post),
+                ('load_post', self._on_invalidate),
+                ('redo_post', self._on_invalidate),
+                ('undo_post', self._on_invalidate),
+            )
+        }
+
+    def _add_nodes(
+        self,
+        node_tree: bpy.types.NodeTree,
+        node_types: tuple,
+        sub_grps: bool,
+        visited: set,
+        nodes: list,
+    ) -> None:
+        """
+        Adds the nodes of the given types in a node tree (and its node groups) that was not visited yet.
+        """
+        if node_tree is None or node_tree in visited:
+            return
+        visited.add(node_tree)
+
+        entry = self.get_entry(node_tree)
+        for node_type, type_nodes in entry['nodes'].items():
+            if issubclass(node_type, node_types):
+                nodes.extend(type_nodes)
+
+        if sub_grps:
+            for grp_node_tree in entry['node_groups']:
+                self._add_nodes(grp_node_tree, node_types, sub_grps, visited, nodes)
+
+    @staticmethod
+    def _get_signature(
+        node_tree: bpy.types.NodeTree,
+        grp_node_names: typing.Sequence[str],
+    ) -> tuple:
+        """
+        Gets the signature of a node tree's entry: the names of the nodes (so a node removed and another added
+        do not go unseen), the number of links, and the node trees of the given group nodes
+        (looked up by name, as removed nodes are invalid).
+        """
+        return (
+            tuple(node_tree.nodes.keys()),
+            len(node_tree.links),
+            tuple(getattr(node_tree.nodes.get(node_name), 'node_tree', None) for node_name in grp_node_names),
+        )
+
+    def _on_depsgraph_update_post(self, scn, depsgraph, *args):
+        """Invalidates the entries of the updated node trees (including node trees embedded in updated datablocks)."""
+        for update in depsgraph.updates:
+            data = update.id.original
+            node_tree = data if isinstance(data, bpy.types.NodeTree) else getattr(data, 'node_tree', None)
+            if node_tree is not None:
+                self.invalidate(node_tree)
+
+    def _on_invalidate(self, *args):
+        """Invalidates all entries (i.e. when a file is loaded, as its datablocks are new)."""
+        self.invalidate()
+
+    def get_entry(
+        self,
+        node_tree: bpy.types.NodeTree,
+    ) -> dict:
+        """
+        Gets the entry of a node tree, indexing it if needed.
+
+        :param node_tree: The node tree.
+        :returns: The entry, with the nodes of the node tree bucketed by type ("nodes"),
+            the node trees of its group nodes, in order of first use ("node_groups"),
+            the names of its group nodes ("group_node_names")
+            and the signature it was indexed with ("signature", see _get_signature()).
+        """
+        entry = self._entries.get(node_tree)
+        if entry is None or entry['signature'] != self._get_signature(node_tree, entry['group_node_names']):
+            type_nodes = {}
+            grp_node_trees = {}
+            grp_node_names = []
+            for node in node_tree.nodes:
+                type_nodes.setdefault(type(node), []).append(node)
+                if isinstance(node, NODE_GROUP_TYPES):
+                    grp_node_names.append(node.name)
+                    if node.node_tree is not None:
+                        grp_node_trees[node.node_tree] = None
+
+            entry = self._entries[node_tree] = {
+                'group_node_names': grp_node_names,
+                'node_groups': list(grp_node_trees),
+                'nodes': type_nodes,
+                'signature': self._get_signature(node_tree, grp_node_names),
+            }
+
+        return entry
+
+    def get_nodes(
+        self,
+        node_tree: bpy.types.NodeTree,
+        node_types: tuple = (bpy.types.Node,),
+        sub_grps: bool = True,
+    ) -> list:
+        """
+        Gets the nodes of the given types in a node tree (see node_get_nodes_from_node_tree()).
+
+        :param node_tree: The node tree (i.e. of a Material, node group or Geometry Nodes Modifier).
+        :param node_types: The node types to get.
+        :param sub_grps: If True, include the nodes of the node groups
+            (once per node group, even if several group nodes use it).
+        :returns: The nodes.
+        """
+        return self.get_nodes_from_node_trees((node_tree,), node_types=node_types, sub_grps=sub_grps)
+
+    def get_nodes_from_node_trees(
+        self,
+        node_trees: typing.Iterable[bpy.types.NodeTree],
+        node_types: tuple = (bpy.types.Node,),
+        sub_grps: bool = True,
+    ) -> list:
+        """
+        Gets the nodes of the given types in several node trees in a single pass,
+        visiting each node tree (and node group) once.
+
+        :param node_trees: The node trees (None values are skipped).
+        :param node_types: The node types to get.
+        :param sub_grps: If True, include the nodes of the node groups.
+        :returns: The nodes, by node tree (in order), then by type.
+        """
+        visited = set()
+        nodes = []
+        for node_tree in node_trees:
+            self._add_nodes(node_tree, node_types, sub_grps, visited, nodes)
+
+        return nodes
+
+    def invalidate(
+        self,
+        node_tree: typing.Union[bpy.types.NodeTree, None] = None,
+    ) -> None:
+        """
+        Clears the entry of a node tree (by default, all entries), which is rebuilt on the next traversal.
+
+        :param node_tree: The node tree.
+        """
+        if node_tree is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(node_tree, None)
+
+    def register(self) -> None:
+        """
+        Adds the index's handlers to bpy.app.handlers.
+        """
+        for handler_name, handler in self._handlers.items():
+            handlers = getattr(bpy.app.handlers, handler_name)
+            if handler not in handlers:
+                handlers.append(handler)
+
+    def unregister(self) -> None:
+        """
+        Removes the index's handlers from bpy.app.handlers.
+        """
+        for handler_name, handler in self._handlers.items():
+            handlers = getattr(bpy.app.handlers, handler_name)
+            if handler in handlers:
+                handlers.remove(handler)
+
+
+def node_get_node_tree_index() -> NodeTreeIndex:
+    """
+    Gets the session-wide node tree index (created and registered on first use).
+
+    :returns: The node tree index.
+    """
+    global NODE_TREE_INDEX
+    if NODE_TREE_INDEX is None:
+        NODE_TREE_INDEX = NodeTreeIndex()
+        NODE_TREE_INDEX.register()
+
+    return NODE_TREE_INDEX
 
 
 def node_get_nodes_from_node_tree(
@@ -17,29 +245,12 @@ def node_get_nodes_from_node_tree(
     node_types: tuple = (bpy.types.Node,),
     sub_grps: bool = True,
 ) -> list:
-    """Works for any tree of nodes, including Materials, Groups, and NodeTrees"""
-
-    nodes = []
-
-    for n in node_tree.nodes:
-
-        if isinstance(n, node_types):
-            nodes.append(n)
-
-        if sub_grps and isinstance(n, (
-            bpy.types.CompositorNodeGroup,
-            bpy.types.GeometryNodeGroup,
-            bpy.types.NodeGroup,
-            bpy.types.ShaderNodeGroup,
-            bpy.types.TextureNodeGroup,
-        )):
-            nodes.extend(node_get_nodes_from_node_tree(
-                n.node_tree,
-                node_types,
-                sub_grps,
-            ))
-    
-    return nodes
+    """
+    Works for any tree of nodes, including Materials, Groups, and NodeTrees.
+    Node groups are traversed once each, from the cached entries of the node tree index (see NodeTreeIndex),
+    so a node group used by several group nodes yields its nodes once.
+    """
+    return node_get_node_tree_index().get_nodes(node_tree, node_types=node_types, sub_grps=sub_grps)
 
 
 def node_instances_from_geometry_nodes(
@@ -74,12 +285,17 @@ def node_instances_from_geometry_nodes(
     dup_obj = bpy_scn.scn_duplicate_object(obj, instance=not new_data)
     bpy_scn.scn_link_objects_to_collection(col, [dup_obj], exclusive=True)
 
-    # Make the instanced Object(s) generated by the Geometry Node Modifier real (temporarily),
-    # Clear the redundant Modifiers and make them instances of the original duplicated Object.
-    bpy.ops.object.duplicates_make_real(use_base_parent=False, use_hierarchy=False)
-    for obj in col.objects:
-        obj.modifiers.clear()
-        obj.data = dup_obj.data
+    # Make the instances generated by the Geometry Node Modifier real, as instances of the duplicated Object's data,
+    # through the evaluated depsgraph (bpy.ops.object.duplicates_make_real() depends on the selection).
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    inst_matrices = [
+        obj_inst.matrix_world.copy() for obj_inst in depsgraph.object_instances
+        if obj_inst.is_instance and obj_inst.parent.original == dup_obj
+    ]
+    for inst_matrix in inst_matrices:
+        inst_obj = bpy.data.objects.new(dup_obj.name, dup_obj.data)
+        inst_obj.matrix_world = inst_matrix
+        col.objects.link(inst_obj)
     
     # Delete the origin duplicated Object.
     bpy.data.objects.remove(dup_obj)
@@ -95,8 +311,5 @@ def node_instances_from_geometry_nodes(
             if new_data and i < 1: 
                 obj.data.name = obj.name
 
-    bpy_scn.scn_select_items(col.objects)
-    bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
-
-    # Clear the selection.
-    bpy_scn.scn_select_items()
+    with bpy_ctx.ctx_override(col.objects):
+        bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
@@ -6,6 +6,6 @@ MAS Blender - DB (Database)
 .. code-block:: python
 
     # Import MAS Blender - DB
-    from mas_blender.mas_db import db_sql
+    from mas_blender.mas_db import db_sql, db_sql_async
 
 """
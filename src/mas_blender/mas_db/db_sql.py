@@ -8,13 +8,17 @@ MAS Blender - DB - SQL
 import logging
 import pathlib
 import sys
+import time
 import typing
 
 import sqlalchemy
+import sqlalchemy.dialects.sqlite
+import sqlalchemy.event
 import sqlalchemy.exc
 import sqlalchemy.ext.declarative
 import sqlalchemy.orm
 import sqlalchemy.orm.exc
+import sqlalchemy.schema
 import sqlalchemy.util._collections
 
 
@@ -22,6 +26,24 @@ __LOGGER__ = logging.getLogger(__name__)
 __LOGGER__.addHandler(logging.StreamHandler(sys.stdout))
 __LOGGER__.setLevel(logging.INFO)
 
+#: Process-wide registry of Engines created by db_get_engine(), keyed by database url.
+DB_ENGINES = {}
+
+#: Settings each registered Engine was created with (see db_get_engine()), keyed by database url.
+DB_ENGINE_SETTINGS = {}
+
+#: PRAGMA statements run for every new SQLite connection made by db_get_engine().
+DB_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -64000,
+    'mmap_size': 268435456,
+}
+
+#: Callables invoked after db_upsert(), db_upsert_batch() and db_delete_rows() write to a database.
+#: Each callback receives the Engine and a tuple of the written Table names.
+DB_WRITE_CALLBACKS = []
+
 
 class DBObjectBase(object):
     """
@@ -59,12 +81,21 @@ DBObjectBase = sqlalchemy.ext.declarative.declarative_base(
 )
 
 # Association table between projects and users.
-# TODO Not yet functional.
+# The composite Primary Key indexes lookups by project; lookups by user use a separate index.
 DBUserProjects = sqlalchemy.Table(
     'user_projects',
     DBObjectBase.metadata,
-    sqlalchemy.Column('project_id', sqlalchemy.ForeignKey('projects.id'), primary_key=True),
-    sqlalchemy.Column('user_id', sqlalchemy.ForeignKey('users.id'), primary_key=True),
+    sqlalchemy.Column(
+        'project_id',
+        sqlalchemy.ForeignKey('projects.id', ondelete='CASCADE'),
+        primary_key=True,
+    ),
+    sqlalchemy.Column(
+        'user_id',
+        sqlalchemy.ForeignKey('users.id', ondelete='CASCADE'),
+        primary_key=True,
+    ),
+    sqlalchemy.Index('ix_user_projects_user_id', 'user_id'),
 )
 
 
@@ -82,12 +113,12 @@ class DBProject(DBObjectBase):
     #: Project disk location path property (JSON)
     pipeline = sqlalchemy.Column(sqlalchemy.JSON)
     #: Users relationship property (DBUser)
-    # users = sqlalchemy.orm.relationship(
-    #     'DBUser',
-    #     order_by='DBUser.id',
-    #     secondary=DBUserProjects,
-    #     back_populates='projects',
-    # )
+    users = sqlalchemy.orm.relationship(
+        'DBUser',
+        order_by='DBUser.id',
+        secondary=DBUserProjects,
+        back_populates='projects',
+    )
 
 
 class DBUser(DBObjectBase):
@@ -98,35 +129,146 @@ class DBUser(DBObjectBase):
     #: Unique user name property (String)
     name = sqlalchemy.Column(sqlalchemy.String, nullable=False, unique=True)
     #: Users relationship property (DBProject)
-    # projects = sqlalchemy.orm.relationship(
-    #     'DBProject',
-    #     order_by='DBProject.id',
-    #     secondary=DBUserProjects,
-    #     back_populates='users',
-    # )
+    projects = sqlalchemy.orm.relationship(
+        'DBProject',
+        order_by='DBProject.id',
+        secondary=DBUserProjects,
+        back_populates='users',
+    )
 
 
 DBModels = (DBProject, DBUser)
 
 
+def _db_upsert_chunk(
+    db_session: sqlalchemy.orm.Session,
+    db_cls: DBObjectBase,
+    db_entries: typing.Sequence[DBObjectBase],
+    chunk_indexes: typing.List[int],
+    db_key_col: sqlalchemy.Column,
+    use_on_conflict: bool,
+) -> typing.List[int]:
+    """
+    Writes a chunk of entries of one entry class for db_upsert_batch() (without committing).
+
+    :returns: The indexes of the written entries (entries matching several Rows are skipped).
+    """
+    db_table = db_cls.__table__
+    db_val_cols = [col for col in db_table.columns if not col.primary_key]
+
+    if use_on_conflict:
+        db_upsert_rows, db_insert_rows = [], []
+        for i in chunk_indexes:
+            db_row = {col.key: getattr(db_entries[i], col.key) for col in db_val_cols}
+            db_key_val = getattr(db_entries[i], db_key_col.key)
+            # Entries without a value for the filter Column can only be inserted.
+            if db_key_val is None:
+                db_insert_rows.append(db_row)
+            else:
+                db_row[db_key_col.key] = db_key_val
+                db_upsert_rows.append(db_row)
+
+        if db_upsert_rows:
+            db_stmt = sqlalchemy.dialects.sqlite.insert(db_table).values(db_upsert_rows)
+            db_set_cols = {
+                col.key: db_stmt.excluded[col.key]
+                for col in db_val_cols if col is not db_key_col
+            }
+            # Nothing to update if the filter Column is the only Column.
+            if db_set_cols:
+                db_stmt = db_stmt.on_conflict_do_update(
+                    index_elements=[db_key_col],
+                    set_=db_set_cols,
+                )
+            else:
+                db_stmt = db_stmt.on_conflict_do_nothing(
+                    index_elements=[db_key_col],
+                )
+            db_session.execute(db_stmt)
+
+        if db_insert_rows:
+            db_session.execute(sqlalchemy.insert(db_table), db_insert_rows)
+
+    else:
+        # Resolve the existing Row(s) for the chunk with a single IN query.
+        db_key_vals = [getattr(db_entries[i], db_key_col.key) for i in chunk_indexes]
+        db_existing_ids = {}
+        db_query = sqlalchemy.select(db_key_col, db_table.c.id) \
+                             .where(db_key_col.in_(set(db_key_vals)))
+        for db_key_val, db_id in db_session.execute(db_query):
+            db_existing_ids.setdefault(db_key_val, []).append(db_id)
+
+        db_update_rows, db_insert_rows, db_skipped_indexes = [], [], []
+        for i, db_key_val in zip(chunk_indexes, db_key_vals):
+            db_row = {col.key: getattr(db_entries[i], col.key) for col in db_val_cols}
+            db_ids = db_existing_ids.get(db_key_val, [])
+
+            if len(db_ids) > 1:
+                logger_msg = f'Database error: Two or more rows found ' \
+                             f'with the same {db_key_col.key}: {db_key_val}.'
+                __LOGGER__.warning(logger_msg)
+                db_skipped_indexes.append(i)
+            elif db_ids:
+                db_row['id'] = db_ids[0]
+                db_update_rows.append(db_row)
+            else:
+                if db_key_col.primary_key and db_key_val is not None:
+                    db_row['id'] = db_key_val
+                db_insert_rows.append(db_row)
+
+        if db_update_rows:
+            db_session.execute(sqlalchemy.update(db_cls), db_update_rows)
+        # Rows with and without Primary Key values are inserted separately,
+        # as each executemany statement requires the same parameters.
+        for db_rows in (
+            [db_row for db_row in db_insert_rows if 'id' in db_row],
+            [db_row for db_row in db_insert_rows if 'id' not in db_row],
+        ):
+            if db_rows:
+                db_session.execute(sqlalchemy.insert(db_cls), db_rows)
+
+        chunk_indexes = [i for i in chunk_indexes if i not in db_skipped_indexes]
+
+    return chunk_indexes
+
+
+def db_add_write_callback(
+    callback: typing.Callable[[sqlalchemy.engine.base.Engine, typing.Tuple[str]], None],
+) -> None:
+    """
+    Registers a callback to run after rows are written to a database (e.g. to invalidate caches).
+
+    :param callback: Callable receiving the Engine and a tuple of the written Table names.
+    """
+    if callback not in DB_WRITE_CALLBACKS:
+        DB_WRITE_CALLBACKS.append(callback)
+
+
 def db_create_table(
     db_engine: sqlalchemy.engine.base.Engine,
     drop_existing: bool = False,
+    migrate: bool = True,
 ) -> None:
     """
     Check for existence of Tables with Engine metadata, and create them if necessary.
-    https://docs.sqlalchemy.org/en/14/core/metadata.html#creating-and-dropping-database-tables
+    Existing Tables are migrated to the current schema (see db_migrate()), so no data is lost.
+    https://docs.sqlalchemy.org/en/20/core/metadata.html#creating-and-dropping-database-tables
 
     :param db_engine: The connected Engine.
     :param drop_existing: If True,
         drop the table(s) in the engine metadata to reset schema
-        before creating Tables (default: False).
+        before creating Tables (default: False). All existing data is lost.
+    :param migrate: If True,
+        add missing Columns and Indexes to existing Tables (default: True).
     """
     if drop_existing:
         DBObjectBase.metadata.drop_all(db_engine)
 
     DBObjectBase.metadata.create_all(db_engine)
 
+    if migrate and not drop_existing:
+        db_migrate(db_engine)
+
 
 def db_delete_rows(
     db_engine: sqlalchemy.engine.base.Engine,
@@ -141,13 +283,25 @@ def db_delete_rows(
     :param filters: The attribute name(s) and value(s) used to query for Rows to delete.
         Each filter is submitted as a tuple: (str, object)
     """
-    db_table = sqlalchemy.Table if isinstance(db_cls, sqlalchemy.Table) else db_cls.__table__
-    db_del = sqlalchemy.delete(db_table)
-    for col_attr_name, col_val in filters:
-        col_attr = db_table.columns[col_attr_name]
-        db_del = db_del.where(col_attr == col_val)
+    db_table = db_cls if isinstance(db_cls, sqlalchemy.Table) else db_cls.__table__
+    db_where = [db_table.columns[col_attr_name] == col_val for col_attr_name, col_val in filters]
+    db_table_names = [db_table.name]
+
+    with db_engine.begin() as db_conn:
+        # Delete association Rows (i.e. user_projects) that reference the Rows to delete,
+        # as foreign key enforcement (ON DELETE CASCADE) is disabled by default in SQLite.
+        for db_ref_table in DBObjectBase.metadata.sorted_tables:
+            for db_fk in db_ref_table.foreign_keys:
+                if db_fk.column.table is db_table:
+                    db_ref_ids = sqlalchemy.select(db_fk.column).where(*db_where)
+                    db_conn.execute(
+                        sqlalchemy.delete(db_ref_table).where(db_fk.parent.in_(db_ref_ids))
+                    )
+                    db_table_names.append(db_ref_table.name)
 
-    db_engine.execute(db_del)
+        db_conn.execute(sqlalchemy.delete(db_table).where(*db_where))
+
+    db_notify_write(db_engine, db_table_names)
 
 
 def db_get_columns(db_row: DBObjectBase) -> dict:
@@ -160,20 +314,130 @@ def db_get_columns(db_row: DBObjectBase) -> dict:
     return db_row.__class__.__table__.columns
 
 
+def db_dispose_engines(
+    db_url: typing.Union[pathlib.Path, str] = '',
+) -> None:
+    """
+    Closes the pooled connections of Engine(s) created by db_get_engine()
+    and removes them from the Engine registry.
+
+    :param db_url: The DBMS-formatted database url of the Engine to dispose.
+        If no url is given, all registered Engines are disposed.
+    """
+    if isinstance(db_url, sqlalchemy.engine.URL):
+        db_url = db_url.render_as_string(hide_password=False)
+    db_urls = [str(db_url)] if db_url else list(DB_ENGINES)
+
+    for db_url_key in db_urls:
+        db_engine = DB_ENGINES.pop(db_url_key, None)
+        DB_ENGINE_SETTINGS.pop(db_url_key, None)
+        if db_engine is not None:
+            db_engine.dispose()
+
+
+def db_explain_query_plan(
+    db_engine: sqlalchemy.engine.base.Engine,
+    db_stmt: sqlalchemy.Executable,
+) -> typing.List[str]:
+    """
+    Gets the query plan the database uses for a statement (i.e. to verify that Indexes are used).
+    SQLite databases use EXPLAIN QUERY PLAN; other databases use EXPLAIN.
+
+    :param db_engine: The connected Engine.
+    :param db_stmt: The statement to explain (i.e. the result of db_get_select()).
+    :returns: The lines of the query plan (for SQLite: "SEARCH ... USING INDEX ..." or "SCAN ...").
+    """
+    db_stmt_str = str(
+        db_stmt.compile(dialect=db_engine.dialect, compile_kwargs={'literal_binds': True})
+    )
+    db_explain = 'EXPLAIN QUERY PLAN' if db_engine.dialect.name == 'sqlite' else 'EXPLAIN'
+
+    with db_engine.connect() as db_conn:
+        if db_engine.dialect.name == 'sqlite':
+            # EXPLAIN does not check for schema changes (i.e. Indexes added by db_migrate())
+            # made on other pooled connections, so read the schema first to reload it if necessary,
+            # and make the statement unique so a stale cached (prepared) statement isn't reused.
+            db_conn.exec_driver_sql('SELECT COUNT(*) FROM sqlite_master').all()
+            db_stmt_str = f'{db_stmt_str} /* {time.perf_counter_ns()} */'
+        db_plan_rows = db_conn.exec_driver_sql(f'{db_explain} {db_stmt_str}').all()
+
+    # SQLite rows: (id, parent, notused, detail)
+    return [str(db_plan_row[-1]) for db_plan_row in db_plan_rows]
+
+
 def db_get_engine(
     db_url: typing.Union[pathlib.Path, str],
+    echo: typing.Union[bool, None] = None,
+    pool_settings: dict = None,
+    sqlite_pragmas: dict = None,
+    force_new: bool = False,
 ) -> typing.Union[sqlalchemy.engine.base.Engine, None]:
     """
-    Creates a SQLAlchemy Engine for the given DB url (connects automatically, if able).
+    Gets the SQLAlchemy Engine for the given DB url (connects automatically, if able).
+    Engines are created once per url and reused from the registry for the rest of the session.
+    A registered Engine is shared, so it is never changed: if the given settings differ from
+    the settings it was created with, a warning is logged and the registered Engine is returned as is
+    (use force_new=True to create an Engine with the new settings).
 
     :param db_url: The DBMS-formatted database url.
+    :param echo: If True, log all SQL statements issued by the Engine (default: False).
+    :param pool_settings: Connection pool keyword arguments for sqlalchemy.create_engine()
+        (i.e. "pool_size", "max_overflow", "pool_timeout", "pool_pre_ping").
+    :param sqlite_pragmas: PRAGMA names and values to set for each new SQLite connection
+        (default: DB_SQLITE_PRAGMAS).
+    :param force_new: If True, dispose the registered Engine for the url
+        and create a new one (default: False).
     :returns: The Engine for the database.
     """
+    db_url_key = db_url.render_as_string(hide_password=False) \
+        if isinstance(db_url, sqlalchemy.engine.URL) else str(db_url)
+
+    if force_new:
+        db_dispose_engines(db_url_key)
+
+    db_engine = DB_ENGINES.get(db_url_key)
+    if db_engine is not None:
+        db_engine_settings = DB_ENGINE_SETTINGS.get(db_url_key, {})
+        db_settings = {'echo': echo, 'pool_settings': pool_settings, 'sqlite_pragmas': sqlite_pragmas}
+        db_changed_settings = [
+            setting_name for setting_name, setting_val in db_settings.items()
+            if setting_val is not None and setting_val != db_engine_settings.get(setting_name)
+        ]
+        if db_changed_settings:
+            logger_msg = f'Engine for {db_url_key} is registered with different settings ' \
+                         f'({", ".join(db_changed_settings)}); use force_new=True to apply them.'
+            __LOGGER__.warning(logger_msg)
+        return db_engine
+
+    echo = bool(echo)
+    pool_settings = pool_settings or {}
     try:
-        return sqlalchemy.create_engine(db_url, echo=True)
+        db_engine = sqlalchemy.create_engine(db_url, echo=echo, **pool_settings)
     except sqlalchemy.exc.ArgumentError:
         return None
 
+    if db_engine.dialect.name == 'sqlite':
+        sqlite_pragmas = DB_SQLITE_PRAGMAS if sqlite_pragmas is None else sqlite_pragmas
+
+        @sqlalchemy.event.listens_for(db_engine, 'connect')
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            """
+            Sets the PRAGMA values for each new DBAPI connection.
+            """
+            cursor = dbapi_connection.cursor()
+            for pragma_name, pragma_val in sqlite_pragmas.items():
+                cursor.execute(f'PRAGMA {pragma_name}={pragma_val}')
+            cursor.close()
+
+    DB_ENGINES[db_url_key] = db_engine
+    DB_ENGINE_SETTINGS[db_url_key] = {
+        'echo': echo,
+        'pool_settings': pool_settings,
+        'sqlite_pragmas': sqlite_pragmas,
+    }
+
+    return db_engine
+
 
 def db_get_metadata(
     db_engine: sqlalchemy.engine.base.Engine,
@@ -190,6 +454,41 @@ def db_get_metadata(
     return db_metadata
 
 
+def db_get_select(
+    db_cls: DBObjectBase,
+    limit: int = -1,
+    columns: typing.Sequence[typing.Union[sqlalchemy.Column, str]] = (),
+    filters: typing.Iterable[typing.Sequence] = (),
+) -> sqlalchemy.Select:
+    """
+    Builds the SELECT statement used by db_query_basic() and db_query_stream().
+
+    :param db_cls: Entry class for Rows to query.
+    :param limit: Total number of results to return (no limit if negative).
+    :param columns: Load only the specified Column(s) (or Column names) for matching Row(s).
+        The Primary Key column is always loaded.
+    :param filters: The attribute name(s) and value(s) used to query for Rows.
+        Each filter is submitted as a tuple: (str, object)
+    :returns: The SELECT statement.
+    """
+    db_select = sqlalchemy.select(db_cls)
+
+    if columns:
+        col_attrs = [
+            getattr(db_cls, col if isinstance(col, str) else col.key) for col in columns
+        ]
+        db_select = db_select.options(sqlalchemy.orm.load_only(*col_attrs))
+
+    for col_attr_name, col_val in filters:
+        col_attr = db_cls.__table__.columns[col_attr_name]
+        db_select = db_select.where(col_attr == col_val)
+
+    if limit >= 0:
+        db_select = db_select.limit(limit)
+
+    return db_select
+
+
 def db_get_url(
     db_name: str,
     db_root_path: str,
@@ -211,42 +510,163 @@ def db_get_url(
     return ''
 
 
+def db_migrate(
+    db_engine: typing.Union[sqlalchemy.engine.base.Engine, sqlalchemy.engine.base.Connection],
+) -> typing.List[str]:
+    """
+    Lightweight, additive schema migration from the Engine metadata:
+    missing Tables are created, and missing Columns and Indexes are added to existing Tables.
+    Columns and Tables are never removed or altered, so existing data is preserved.
+    Columns added to existing Tables cannot be NOT NULL/UNIQUE without a server default;
+    such Columns are added as nullable (UNIQUE Columns get a unique Index instead).
+
+    :param db_engine: The connected Engine (or a Connection, to migrate within its transaction).
+    :returns: The DDL statements issued (empty if the schema is up to date).
+    """
+    if isinstance(db_engine, sqlalchemy.engine.base.Engine):
+        with db_engine.begin() as db_conn:
+            return db_migrate(db_conn)
+
+    db_conn = db_engine
+    db_ddl_stmts = []
+    db_preparer = db_conn.dialect.identifier_preparer
+    db_inspector = sqlalchemy.inspect(db_conn)
+    db_table_names = set(db_inspector.get_table_names())
+
+    for db_table in DBObjectBase.metadata.sorted_tables:
+
+        if db_table.name not in db_table_names:
+            db_table.create(db_conn)
+            db_ddl_stmts.append(str(sqlalchemy.schema.CreateTable(db_table).compile(db_conn)))
+            continue
+
+        db_col_names = {col['name'] for col in db_inspector.get_columns(db_table.name)}
+        db_idx_names = {idx['name'] for idx in db_inspector.get_indexes(db_table.name)}
+
+        for db_col in db_table.columns:
+            if db_col.name in db_col_names:
+                continue
+
+            db_col_type = db_col.type.compile(dialect=db_conn.dialect)
+            db_ddl_stmt = f'ALTER TABLE {db_preparer.format_table(db_table)} ' \
+                          f'ADD COLUMN {db_preparer.format_column(db_col)} {db_col_type}'
+            if db_col.server_default is not None:
+                db_default = db_col.server_default.arg
+                db_default = db_default.text if hasattr(db_default, 'text') else repr(db_default)
+                db_ddl_stmt += f' DEFAULT {db_default}'
+                if not db_col.nullable:
+                    db_ddl_stmt += ' NOT NULL'
+            db_ddl_stmts.append(db_ddl_stmt)
+            db_conn.exec_driver_sql(db_ddl_stmt)
+
+            if db_col.unique:
+                db_ddl_stmt = f'CREATE UNIQUE INDEX ' \
+                              f'{db_preparer.quote(f"uq_{db_table.name}_{db_col.name}")} ' \
+                              f'ON {db_preparer.format_table(db_table)} ' \
+                              f'({db_preparer.format_column(db_col)})'
+                db_ddl_stmts.append(db_ddl_stmt)
+                db_conn.exec_driver_sql(db_ddl_stmt)
+
+        for db_index in db_table.indexes:
+            if db_index.name in db_idx_names:
+                continue
+
+            db_index.create(db_conn)
+            db_ddl_stmts.append(str(sqlalchemy.schema.CreateIndex(db_index).compile(db_conn)))
+
+    for db_ddl_stmt in db_ddl_stmts:
+        logger_msg = f'Database migrated: {db_ddl_stmt.strip()}.'
+        __LOGGER__.info(logger_msg)
+
+    return db_ddl_stmts
+
+
+def db_notify_write(
+    db_engine: sqlalchemy.engine.base.Engine,
+    table_names: typing.Iterable[str] = (),
+) -> None:
+    """
+    Runs the registered write callbacks (see db_add_write_callback()).
+    Errors raised by a callback are logged, so they do not interrupt the write operation.
+
+    :param db_engine: The Engine written to.
+    :param table_names: Names of the written Tables.
+    """
+    table_names = tuple(table_names)
+
+    for callback in tuple(DB_WRITE_CALLBACKS):
+        try:
+            callback(db_engine, table_names)
+
+        except Exception as cb_err:
+            logger_msg = f'Database write callback error: {cb_err}.'
+            __LOGGER__.warning(logger_msg)
+
+
 def db_query_basic(
     db_engine: sqlalchemy.engine.base.Engine,
     db_cls: DBObjectBase,
     limit: int = -1,
-    columns: typing.Sequence[sqlalchemy.Column] = (),
+    columns: typing.Sequence[typing.Union[sqlalchemy.Column, str]] = (),
     filters: typing.Iterable[typing.Sequence] = (),
 ) -> list:
     """
-    Queries Table(s) for Rows that match the given arguments.
+    Queries Table(s) for Rows that match the given arguments (in a single round trip).
+    Columns that are not loaded (see columns) cannot be accessed on the returned Rows.
 
     :param db_engine: The connected Engine.
     :param db_cls: Entry class for Rows to query.
     :param limit: Total number of results to return.
     :param columns: Load only the specified Column(s) for matching Row(s).
-    :param filters: The attribute name(s) and value(s) used to query for Rows to delete.
+    :param filters: The attribute name(s) and value(s) used to query for Rows.
     :returns: List of matching Rows.
     """
-    results = []
+    db_select = db_get_select(db_cls, limit=limit, columns=columns, filters=filters)
 
     with sqlalchemy.orm.Session(db_engine) as db_session:
-        db_query = db_session.query(db_cls)
-        db_query.options(sqlalchemy.orm.load_only(columns))
-
-        for col_attr_name, col_val in filters:
-            col_attr = db_cls.__table__.columns[col_attr_name]
-            db_query = db_query.filter(col_attr == col_val)
-
-        if db_query.first() is not None:
-            if limit < 0:
-                results.extend(db_query.all())
-            elif limit == 1:
-                results.append(db_query.one())
-            else:
-                results.extend(db_query.limit(limit))
+        results = db_session.scalars(db_select).all()
+
+    return list(results)
+
+
+def db_query_stream(
+    db_engine: sqlalchemy.engine.base.Engine,
+    db_cls: DBObjectBase,
+    limit: int = -1,
+    columns: typing.Sequence[typing.Union[sqlalchemy.Column, str]] = (),
+    filters: typing.Iterable[typing.Sequence] = (),
+    chunk_size: int = 100,
+) -> typing.Iterator[DBObjectBase]:
+    """
+    Generator variant of db_query_basic(),
+    which yields matching Rows while fetching them from the database in chunks.
+
+    :param db_engine: The connected Engine.
+    :param db_cls: Entry class for Rows to query.
+    :param limit: Total number of results to return.
+    :param columns: Load only the specified Column(s) for matching Row(s).
+    :param filters: The attribute name(s) and value(s) used to query for Rows.
+    :param chunk_size: Number of Rows fetched from the database at a time (default: 100).
+    :returns: An iterator of matching Rows.
+    """
+    db_select = db_get_select(db_cls, limit=limit, columns=columns, filters=filters)
+    db_select = db_select.execution_options(yield_per=chunk_size)
+
+    with sqlalchemy.orm.Session(db_engine) as db_session:
+        for db_row in db_session.scalars(db_select):
+            yield db_row
 
-    return results
+
+def db_remove_write_callback(
+    callback: typing.Callable[[sqlalchemy.engine.base.Engine, typing.Tuple[str]], None],
+) -> None:
+    """
+    Unregisters a callback added with db_add_write_callback().
+
+    :param callback: The registered callable.
+    """
+    if callback in DB_WRITE_CALLBACKS:
+        DB_WRITE_CALLBACKS.remove(callback)
 
 
 def db_test_connection(
@@ -260,7 +680,9 @@ def db_test_connection(
     """
     try:
         assert isinstance(db_engine, sqlalchemy.engine.base.Engine)
-        db_engine.connect()
+        # Return the connection to the pool immediately after the test.
+        with db_engine.connect():
+            pass
         __LOGGER__.info('Database connection verified.')
 
         return True
@@ -285,6 +707,7 @@ def db_upsert(
     :returns: Success results for each upsert operation for each Row (ordered by entries given).
     """
     db_entries_updated = []
+    db_table_names = set()
 
     with sqlalchemy.orm.Session(db_engine) as db_session:
 
@@ -292,6 +715,7 @@ def db_upsert(
 
             try:
                 db_cls = db_entry.__class__
+                db_table_names.add(db_cls.__table__.name)
                 # Query the DB using a simple equal operator for the given column attribute.
                 if column_name_filter:
                     db_col_attr = db_cls.__table__.columns[column_name_filter]
@@ -333,4 +757,79 @@ def db_upsert(
 
         db_session.commit()
 
+    db_notify_write(db_engine, db_table_names)
+
+    return tuple(db_entries_updated)
+
+
+def db_upsert_batch(
+    db_engine: sqlalchemy.engine.base.Engine,
+    db_entries: typing.Iterable[DBObjectBase] = (),
+    column_name_filter: str = None,
+    chunk_size: int = 500,
+) -> typing.Iterable[bool]:
+    """
+    Batched variant of db_upsert() for syncing large numbers of entries.
+    Entries are grouped by entry class and written in chunks (one round trip per chunk).
+    SQLite databases use INSERT ... ON CONFLICT DO UPDATE when the filter Column is unique;
+    otherwise existing Rows are resolved with one IN query per chunk
+    and written with executemany UPDATE/INSERT statements.
+
+    :param db_engine: The connected Engine.
+    :param db_entries: The entries to upsert as Rows.
+    :param column_name_filter: The unique Column used to match existing Rows
+        (default: the Primary Key column, aka "id").
+    :param chunk_size: Maximum number of entries written per statement (default: 500).
+    :returns: Success results for each upsert operation for each Row (ordered by entries given).
+    """
+    db_entries = list(db_entries)
+    db_entries_updated = [False] * len(db_entries)
+
+    # Group the entries (and their positions) by entry class.
+    db_cls_entries = {}
+    for i, db_entry in enumerate(db_entries):
+        db_cls_entries.setdefault(db_entry.__class__, []).append(i)
+
+    with sqlalchemy.orm.Session(db_engine) as db_session:
+
+        for db_cls, db_entry_indexes in db_cls_entries.items():
+
+            db_key_col = db_cls.__table__.columns[column_name_filter or 'id']
+            use_on_conflict = all((
+                db_engine.dialect.name == 'sqlite',
+                db_key_col.primary_key or db_key_col.unique,
+            ))
+
+            for chunk_start in range(0, len(db_entry_indexes), chunk_size):
+                db_chunks = [db_entry_indexes[chunk_start:chunk_start + chunk_size]]
+
+                # A chunk that fails (i.e. one entry violates a unique constraint) is retried row by row,
+                # so only the failing entries are reported as unsuccessful.
+                while db_chunks:
+                    chunk_indexes = db_chunks.pop(0)
+                    try:
+                        chunk_indexes = _db_upsert_chunk(
+                            db_session, db_cls, db_entries, chunk_indexes, db_key_col, use_on_conflict
+                        )
+                        db_session.commit()
+
+                    except sqlalchemy.exc.SQLAlchemyError as sqle:
+                        db_session.rollback()
+                        if len(chunk_indexes) > 1:
+                            db_chunks[:0] = [[i] for i in chunk_indexes]
+                            logger_msg = f'Database error: {sqle}. Retrying {len(chunk_indexes)} entries row by row.'
+                            __LOGGER__.debug(logger_msg)
+                        else:
+                            logger_msg = f'Database error: {sqle}.'
+                            __LOGGER__.warning(logger_msg)
+                        continue
+
+                    for i in chunk_indexes:
+                        db_entries_updated[i] = True
+
+                    logger_msg = f'{db_cls} entries upserted: {len(chunk_indexes)}.'
+                    __LOGGER__.debug(logger_msg)
+
+    db_notify_write(db_engine, {db_cls.__table__.name for db_cls in db_cls_entries})
+
     return tuple(db_entries_updated)
@@ -0,0 +1,286 @@
+#!$BLENDER_PATH/python/bin python
+
+"""
+MAS Blender - DB - SQL (Async)
+
+Coroutine counterparts of the db_sql functions,
+built on the SQLAlchemy asyncio extension (SQLite databases use the aiosqlite driver).
+
+.. code-block:: python
+
+    import asyncio
+    from mas_blender.mas_db import db_sql, db_sql_async
+
+    async_engine = db_sql_async.db_get_engine('sqlite:///C:/mas/mas_blender.db')
+    db_projects = asyncio.run(db_sql_async.db_query_basic(async_engine, db_sql.DBProject))
+
+"""
+
+import logging
+import pathlib
+import sys
+import typing
+
+import sqlalchemy
+import sqlalchemy.event
+import sqlalchemy.exc
+import sqlalchemy.ext.asyncio
+
+from mas_blender.mas_db import db_sql
+
+
+__LOGGER__ = logging.getLogger(__name__)
+__LOGGER__.addHandler(logging.StreamHandler(sys.stdout))
+__LOGGER__.setLevel(logging.INFO)
+
+#: Process-wide registry of AsyncEngines created by db_get_engine(), keyed by database url.
+DB_ASYNC_ENGINES = {}
+
+#: Async DBAPI drivers used in place of the default (blocking) driver of each dialect.
+DB_ASYNC_DRIVERS = {
+    'sqlite': 'aiosqlite',
+}
+
+
+async def db_create_table(
+    async_engine: sqlalchemy.ext.asyncio.AsyncEngine,
+    drop_existing: bool = False,
+    migrate: bool = True,
+) -> None:
+    """
+    Async variant of db_sql.db_create_table().
+
+    :param async_engine: The connected AsyncEngine.
+    :param drop_existing: If True,
+        drop the table(s) in the engine metadata to reset schema
+        before creating Tables (default: False). All existing data is lost.
+    :param migrate: If True,
+        add missing Columns and Indexes to existing Tables (default: True).
+    """
+    async with async_engine.begin() as db_conn:
+        if drop_existing:
+            await db_conn.run_sync(db_sql.DBObjectBase.metadata.drop_all)
+
+        await db_conn.run_sync(db_sql.DBObjectBase.metadata.create_all)
+
+        if migrate and not drop_existing:
+            await db_conn.run_sync(db_sql.db_migrate)
+
+
+async def db_delete_rows(
+    async_engine: sqlalchemy.ext.asyncio.AsyncEngine,
+    db_cls: typing.Union[db_sql.DBObjectBase, sqlalchemy.Table],
+    filters: typing.Iterable[typing.Sequence] = (),
+) -> None:
+    """
+    Async variant of db_sql.db_delete_rows().
+
+    :param async_engine: The connected AsyncEngine.
+    :param db_cls: The entry (or entry's Table) class of the Rows to delete.
+    :param filters: The attribute name(s) and value(s) used to query for Rows to delete.
+        Each filter is submitted as a tuple: (str, object)
+    """
+    db_table = db_cls if isinstance(db_cls, sqlalchemy.Table) else db_cls.__table__
+    db_where = [db_table.columns[col_attr_name] == col_val for col_attr_name, col_val in filters]
+    db_table_names = [db_table.name]
+
+    async with async_engine.begin() as db_conn:
+        # Delete association Rows that reference the Rows to delete (see db_sql.db_delete_rows()).
+        for db_ref_table in db_sql.DBObjectBase.metadata.sorted_tables:
+            for db_fk in db_ref_table.foreign_keys:
+                if db_fk.column.table is db_table:
+                    db_ref_ids = sqlalchemy.select(db_fk.column).where(*db_where)
+                    await db_conn.execute(
+                        sqlalchemy.delete(db_ref_table).where(db_fk.parent.in_(db_ref_ids))
+                    )
+                    db_table_names.append(db_ref_table.name)
+
+        await db_conn.execute(sqlalchemy.delete(db_table).where(*db_where))
+
+    db_sql.db_notify_write(async_engine.sync_engine, db_table_names)
+
+
+def db_dispose_engines(
+    db_url: typing.Union[pathlib.Path, str] = '',
+) -> None:
+    """
+    Removes AsyncEngine(s) created by db_get_engine() from the AsyncEngine registry.
+    The pooled connections of an AsyncEngine must be closed on the event loop that opened them,
+    so await the AsyncEngine's dispose() method first if the loop is still running.
+
+    :param db_url: The DBMS-formatted database url of the AsyncEngine to remove.
+        If no url is given, all registered AsyncEngines are removed.
+    """
+    db_urls = [db_get_url(db_url)] if db_url else list(DB_ASYNC_ENGINES)
+
+    for db_url_key in db_urls:
+        DB_ASYNC_ENGINES.pop(db_url_key, None)
+
+
+def db_get_engine(
+    db_url: typing.Union[pathlib.Path, str],
+    echo: typing.Union[bool, None] = None,
+    sqlite_pragmas: dict = None,
+) -> typing.Union[sqlalchemy.ext.asyncio.AsyncEngine, None]:
+    """
+    Gets the AsyncEngine for the given DB url.
+    The url is converted to use the async driver of its dialect (see db_get_url()).
+    AsyncEngines are created once per url and reused from the registry for the rest of the session.
+
+    :param db_url: The DBMS-formatted database url (e.g. the url of a db_sql Engine).
+    :param echo: If True, log all SQL statements issued by the AsyncEngine (default: False).
+    :param sqlite_pragmas: PRAGMA names and values to set for each new SQLite connection
+        (default: db_sql.DB_SQLITE_PRAGMAS).
+    :returns: The AsyncEngine for the database.
+    """
+    db_url_key = db_get_url(db_url)
+
+    async_engine = DB_ASYNC_ENGINES.get(db_url_key)
+    if async_engine is not None:
+        # The registered AsyncEngine is shared, so it is not changed (see db_sql.db_get_engine()).
+        if echo is not None and echo != async_engine.echo:
+            logger_msg = f'AsyncEngine for {db_url_key} is registered with echo={async_engine.echo}; ' \
+                         f'dispose it (see db_dispose_engines()) to apply echo={echo}.'
+            __LOGGER__.warning(logger_msg)
+        return async_engine
+
+    try:
+        async_engine = sqlalchemy.ext.asyncio.create_async_engine(db_url_key, echo=bool(echo))
+    except (ImportError, sqlalchemy.exc.ArgumentError) as sqle:
+        logger_msg = f'Database error: {sqle}.'
+        __LOGGER__.warning(logger_msg)
+        return None
+
+    if async_engine.dialect.name == 'sqlite':
+        sqlite_pragmas = db_sql.DB_SQLITE_PRAGMAS if sqlite_pragmas is None else sqlite_pragmas
+
+        @sqlalchemy.event.listens_for(async_engine.sync_engine, 'connect')
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            """
+            Sets the PRAGMA values for each new DBAPI connection.
+            """
+            cursor = dbapi_connection.cursor()
+            for pragma_name, pragma_val in sqlite_pragmas.items():
+                cursor.execute(f'PRAGMA {pragma_name}={pragma_val}')
+            cursor.close()
+
+    DB_ASYNC_ENGINES[db_url_key] = async_engine
+
+    return async_engine
+
+
+def db_get_url(
+    db_url: typing.Union[sqlalchemy.engine.URL, str],
+) -> str:
+    """
+    Converts a DBMS-formatted database url to use the async driver of its dialect
+    (e.g. "sqlite:///..." becomes "sqlite+aiosqlite:///...").
+
+    :param db_url: The DBMS-formatted database url.
+    :returns: The database url for the async driver.
+    """
+    db_url = sqlalchemy.engine.make_url(str(db_url)) \
+        if not isinstance(db_url, sqlalchemy.engine.URL) else db_url
+
+    db_async_driver = DB_ASYNC_DRIVERS.get(db_url.get_backend_name())
+    if db_async_driver is not None:
+        db_url = db_url.set(drivername=f'{db_url.get_backend_name()}+{db_async_driver}')
+
+    return db_url.render_as_string(hide_password=False)
+
+
+async def db_query_basic(
+    async_engine: sqlalchemy.ext.asyncio.AsyncEngine,
+    db_cls: db_sql.DBObjectBase,
+    limit: int = -1,
+    columns: typing.Sequence[typing.Union[sqlalchemy.Column, str]] = (),
+    filters: typing.Iterable[typing.Sequence] = (),
+) -> list:
+    """
+    Async variant of db_sql.db_query_basic().
+
+    :param async_engine: The connected AsyncEngine.
+    :param db_cls: Entry class for Rows to query.
+    :param limit: Total number of results to return.
+    :param columns: Load only the specified Column(s) for matching Row(s).
+    :param filters: The attribute name(s) and value(s) used to query for Rows.
+    :returns: List of matching Rows.
+    """
+    db_select = db_sql.db_get_select(db_cls, limit=limit, columns=columns, filters=filters)
+
+    async with sqlalchemy.ext.asyncio.AsyncSession(async_engine) as db_session:
+        results = await db_session.scalars(db_select)
+
+        return list(results.all())
+
+
+async def db_upsert(
+    async_engine: sqlalchemy.ext.asyncio.AsyncEngine,
+    db_entries: typing.Iterable[db_sql.DBObjectBase] = (),
+    column_name_filter: str = None,
+) -> typing.Iterable[bool]:
+    """
+    Async variant of db_sql.db_upsert().
+
+    :param async_engine: The connected AsyncEngine.
+    :param db_entries: The entries to upsert as Rows.
+    :param column_name_filter: The Column used to match existing Rows
+        (default: the Primary Key column, aka "id").
+    :returns: Success results for each upsert operation for each Row (ordered by entries given).
+    """
+    db_entries_updated = []
+    db_table_names = set()
+
+    async with sqlalchemy.ext.asyncio.AsyncSession(async_engine) as db_session:
+
+        for db_entry in db_entries:
+
+            try:
+                # Each entry is written in a savepoint, so a failed entry is rolled back on its own.
+                async with db_session.begin_nested():
+                    db_cls = db_entry.__class__
+                    db_table_names.add(db_cls.__table__.name)
+                    db_col_attr = db_cls.__table__.columns[column_name_filter or 'id']
+                    db_query = sqlalchemy.select(db_cls.__table__.c.id) \
+                                         .where(db_col_attr == getattr(db_entry, db_col_attr.key))
+                    db_id = (await db_session.execute(db_query)).scalar_one_or_none()
+
+                    # If no results are found, add the entry to the DB
+                    if db_id is None:
+                        db_session.add(db_entry)
+                        logger_msg = f'{db_cls} entry added for {db_entry}.'
+                        __LOGGER__.debug(logger_msg)
+
+                    # Otherwise, update all columns for the existing entry.
+                    else:
+                        db_vals = {
+                            key: getattr(db_entry, key)
+                            for key, val in db_sql.db_get_columns(db_entry).items()
+                            if not val.primary_key
+                        }
+                        db_update = sqlalchemy.update(db_cls) \
+                                              .where(db_cls.__table__.c.id == db_id) \
+                                              .values(**db_vals)
+                        await db_session.execute(db_update)
+                        logger_msg = f'{db_cls} entry updated for {db_entry}.'
+                        __LOGGER__.debug(logger_msg)
+
+                    await db_session.flush()
+                db_entries_updated.append(True)
+
+            except sqlalchemy.exc.MultipleResultsFound as sqle:
+                logger_msg = f'Database error: {sqle}. \
+                               Two or more tables found with the same name: {db_entry.name}.'
+                __LOGGER__.warning(logger_msg)
+                db_entries_updated.append(False)
+
+            except sqlalchemy.exc.SQLAlchemyError as sqle:
+                logger_msg = f'Database error: {sqle}.'
+                __LOGGER__.warning(logger_msg)
+                db_entries_updated.append(False)
+
+        await db_session.commit()
+
+    db_sql.db_notify_write(async_engine.sync_engine, db_table_names)
+
+    return tuple(db_entries_updated)
@@ -31,12 +31,21 @@ MAS Blender - OPS (Operators)
 #     project_pipeline=proj.pipeline
 # )
 
+import json
 import pathlib
 import typing
 
 import sqlalchemy
 
 from mas_blender.mas_db import db_sql
+from mas_blender.mas_py import py_util
+
+
+#: Maximum number of entries kept in each OpsSessionData cache.
+OPS_CACHE_MAX_SIZE = 64
+
+#: Seconds before a cached OpsSessionData entry is queried/computed again.
+OPS_CACHE_TTL = 300.0
 
 
 class OpsSessionDataMeta(type):
@@ -55,11 +64,14 @@ class OpsSessionDataMeta(type):
             pipeline={},
         )
         cls._project_path = pathlib.Path(cls._project.path)
+        cls._proj_cache = py_util.UtilLRUCache(max_size=OPS_CACHE_MAX_SIZE, ttl=OPS_CACHE_TTL)
+        cls._proj_paths_cache = py_util.UtilLRUCache(max_size=OPS_CACHE_MAX_SIZE, ttl=OPS_CACHE_TTL)
 
     @property
     def db_engine(cls) -> sqlalchemy.engine.base.Engine:
         """
         Persistent Database Engine property for the Blender session.
+        The Engine is shared with the db_sql Engine registry (see db_sql.db_get_engine()).
         """
         return cls._db_engine
 
@@ -67,7 +79,11 @@ class OpsSessionDataMeta(type):
     def db_engine(cls, db_engine: sqlalchemy.engine.base.Engine):
         """
         Persistent Database Engine setter for the Blender session.
+        Cached project data is cleared if the Engine changes.
         """
+        if db_engine is not cls._db_engine:
+            cls._proj_cache.clear()
+
         cls._db_engine = db_engine
 
     @property
@@ -95,7 +111,74 @@ class OpsSessionDataMeta(type):
 class OpsSessionData(dict, metaclass=OpsSessionDataMeta):
     """
     Global class with persistent class properties available for the duration of the Blender session.
+    Project rows and pipeline Paths are cached (read-through, LRU + TTL),
+    and cached project rows are cleared whenever the projects Table is written to.
     """
+    @classmethod
+    def proj_cache_clear(
+        cls,
+        db_engine: sqlalchemy.engine.base.Engine = None,
+        table_names: typing.Iterable[str] = (),
+    ) -> None:
+        """
+        Clears cached project data. Registered as a db_sql write callback.
+
+        :param db_engine: The Engine written to (only the session database clears the cache).
+        :param table_names: Names of the written Tables.
+            If given, the cache is only cleared if the projects Table was written to.
+        """
+        # Compare databases rather than Engines, as async writes (see db_sql_async) use their own Engine.
+        if db_engine is not None and \
+                db_engine.url.database != getattr(getattr(cls.db_engine, 'url', None), 'database', None):
+            return
+
+        if table_names and db_sql.DBProject.__tablename__ not in table_names:
+            return
+
+        cls._proj_cache.clear()
+
+    @classmethod
+    def proj_get_project(
+        cls,
+        project_name: str,
+    ) -> typing.Optional[db_sql.DBProject]:
+        """
+        Gets the project with the given name from the session database (cached).
+
+        :param project_name: Name of the project to query.
+        :returns: The (detached) DBProject object, if one exists; otherwise, None.
+        """
+        def _query_project():
+            db_projects = db_sql.db_query_basic(
+                cls.db_engine,
+                db_sql.DBProject,
+                limit=1,
+                columns=('code', 'name', 'path', 'pipeline'),
+                filters=(('name', project_name),)
+            )
+
+            return db_projects[0] if db_projects else None
+
+        return cls._proj_cache.get_or_set(('project', project_name), _query_project)
+
+    @classmethod
+    def proj_get_project_names(cls) -> typing.Tuple[str]:
+        """
+        Gets the names of all projects in the session database (cached).
+
+        :returns: Project names.
+        """
+        def _query_project_names():
+            db_projects = db_sql.db_query_stream(
+                cls.db_engine,
+                db_sql.DBProject,
+                columns=('name',),
+            )
+
+            return tuple(db_project.name for db_project in db_projects)
+
+        return cls._proj_cache.get_or_set(('project_names',), _query_project_names)
+
     @classmethod
     def proj_pipeline_paths(
         cls,
@@ -104,20 +187,45 @@ class OpsSessionData(dict, metaclass=OpsSessionDataMeta):
     ) -> typing.Dict[str, pathlib.Path]:
         """
         Creates a list of Paths for all folders in a project.
+        Results are cached per project path and pipeline data.
 
         :param project_pipeline: Project pipeline heirarchy data.
         :returns: A dictionary of Paths for each folder in the pipeline data.
         """
+        cache_key = (
+            cls.project_path.as_posix(),
+            json.dumps(project_pipeline, sort_keys=True),
+            sub_dir_str,
+        )
+        project_dir_paths = cls._proj_paths_cache.get_or_set(
+            cache_key,
+            lambda: cls._proj_pipeline_paths_recur(project_pipeline, sub_dir_str),
+        )
+
+        return dict(project_dir_paths)
+
+    @classmethod
+    def _proj_pipeline_paths_recur(
+        cls,
+        project_pipeline: dict,
+        sub_dir_str: str = ''
+    ) -> typing.Dict[str, pathlib.Path]:
+        """
+        Recursive (uncached) implementation of proj_pipeline_paths().
+        """
         sub_dir_path = cls.project_path.joinpath(sub_dir_str)
         project_dir_paths = {sub_dir_str: sub_dir_path}
 
         for key, val in project_pipeline.items():
             sub_dir_str_ext = '/'.join((sub_dir_str, key)).strip('/')
             project_dir_paths.update(
-                cls.proj_pipeline_paths(
+                cls._proj_pipeline_paths_recur(
                     project_pipeline=val,
                     sub_dir_str=sub_dir_str_ext
                 )
             )
 
         return project_dir_paths
+
+
+db_sql.db_add_write_callback(OpsSessionData.proj_cache_clear)
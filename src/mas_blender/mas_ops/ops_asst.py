@@ -57,7 +57,7 @@ def asst_swap_armature(*modified_objs) -> bool:
     """
     os.system('cls')
 
-    armature_objs = bpy_scn.scn_get_objects_of_type('ARMATURE')
+    armature_objs = bpy_scn.scn_get_scene_index().get_objects_of_type('ARMATURE')
 
     armature_obj = qt_ui.ui_get_item(
         title='Select Armature',
@@ -6,19 +6,22 @@ MAS Blender - UE - I/O
 """
 
 import copy
+import hashlib
 import json
 import os
 import pathlib
 import re
 import typing
 
+import numpy as np
 from PySide6 import QtCore, QtWidgets
 # from __feature__ import snake_case, true_property
 
 import bpy
 
 from mas_blender.mas_bpy._bpy_core import bpy_ctx, bpy_io, bpy_scn
-from mas_blender.mas_bpy import bpy_ani, bpy_mdl, bpy_mtl
+from mas_blender.mas_bpy import bpy_ani, bpy_mdl, bpy_mtl, bpy_node
+from mas_blender.mas_py import py_img
 from mas_blender.mas_qt import qt_ui
 from mas_blender.mas_ops import OpsSessionData
 
@@ -28,6 +31,60 @@ ops_io_config_file_path = pathlib.Path(__file__).parent.joinpath('ops_io.config.
 with ops_io_config_file_path.open('r', encoding='UTF-8') as readfile:
     IO_CONFIG_DATA = json.load(readfile)
 
+#: Version of the export manifest format (see io_plan_export()).
+IO_MANIFEST_VERSION = 1
+
+#: Name of the export manifest file written to the export directory (see io_run_export_manifest()).
+IO_MANIFEST_FILE_NAME = 'export_manifest.json'
+
+#: Name of the file of export unit fingerprints, written to the export directory
+#: (see IOExporter.export_objects()).
+IO_FINGERPRINTS_FILE_NAME = 'export_fingerprints.json'
+
+#: Properties of Nodes and Modifiers ignored by export fingerprints
+#: (they only affect how data is displayed in Blender).
+IO_FINGERPRINT_IGNORED_PROPS = frozenset((
+    'color', 'dimensions', 'height', 'hide', 'is_active', 'label', 'location', 'parent', 'rna_type', 'select',
+    'show_expanded', 'show_options', 'show_preview', 'show_texture', 'use_custom_color', 'width',
+    'width_hidden',
+))
+
+#: Properties of datablocks and nested structs (e.g. color ramp elements) ignored by export fingerprints.
+IO_FINGERPRINT_IGNORED_STRUCT_PROPS = frozenset(('hide', 'rna_type', 'select'))
+
+#: Bulk accessor property, item size and buffer type of each Mesh attribute data type hashed by export fingerprints
+#: (attributes of other data types make the fingerprint unique, so their units are always exported).
+IO_FINGERPRINT_ATTRIBUTE_BUFFERS = {
+    'BOOLEAN': ('value', 1, bool),
+    'BYTE_COLOR': ('color', 4, np.float32),
+    'FLOAT': ('value', 1, np.float32),
+    'FLOAT2': ('vector', 2, np.float32),
+    'FLOAT4X4': ('value', 16, np.float32),
+    'FLOAT_COLOR': ('color', 4, np.float32),
+    'FLOAT_VECTOR': ('vector', 3, np.float32),
+    'INT': ('value', 1, np.int32),
+    'INT32_2D': ('value', 2, np.int32),
+    'INT8': ('value', 1, np.int32),
+    'QUATERNION': ('value', 4, np.float32),
+}
+
+#: Maximum nesting depth of the structs hashed by export fingerprints (e.g. Node > curve mapping > curve > point).
+IO_FINGERPRINT_MAX_DEPTH = 4
+
+#: Datablock types hashed by their properties in export fingerprints (other types are hashed by type).
+IO_FINGERPRINT_PROPS_ID_TYPES = (
+    bpy.types.Camera, bpy.types.Light, bpy.types.Material, bpy.types.Texture, bpy.types.World,
+)
+
+#: Estimated bytes per exported vertex (float32 position, normal and one UV set).
+IO_VERTEX_BYTES = 32
+
+#: Estimated bytes per vertex of each exported Shape Key (float32 position offsets).
+IO_SHAPE_KEY_VERTEX_BYTES = 12
+
+#: Estimated bytes per texel of an uncompressed RGBA texture, including mipmaps.
+IO_TEXEL_BYTES = 4 * 4 / 3
+
 # rigify_armature_obj = bpy_ani.ani_rigify_for_ue(
 #     active_bone_layer_ids=(3, 4, 8, 11, 13, 14, 15, 16, 17, 18,)
 # )
@@ -105,24 +162,17 @@ class IOExportDialogUI(qt_ui.UIDialogBase):
         """
         Performs the export operation based on options set in the UI.
         """
-        current_file_path = bpy_io.io_get_current_file_path()
-
         export_dir_path = self._ui.io_proj_export_dir_lnedit.text()
         export_platform_name = self._ui.io_export_platform_btngrp.checkedButton().text()
-        export_platform_data = IO_CONFIG_DATA['export']['platforms'][export_platform_name]
-        export_settings = export_platform_data['settings']
-        export_file_suffix = export_platform_data['suffix']
-        for type_k, type_v in export_platform_data['convert'].items():
-            # export_settings[type_k] = vars(__builtins__)[type_k](export_settings[type_v])
-            export_settings[type_k] = dict(__builtins__)[type_v](export_settings[type_k])
 
         # Override export settings, if directed.
+        export_settings_overrides = {}
         for grpbox in self._ui.io_export_options_frame.findChildren(QtWidgets.QGroupBox):
             if grpbox.isEnabled() and grpbox.isVisible():
                 for label in grpbox.findChildren(QtWidgets.QLabel):
                     setting_name = label.property('setting_name')
                     setting_value = label.buddy().text()
-                    export_settings[setting_name] = setting_value
+                    export_settings_overrides[setting_name] = setting_value
 
         # Customize the export based on method selected in by the user.
         export_method = self._ui.io_export_method_btngrp.checkedId()
@@ -162,61 +212,30 @@ class IOExportDialogUI(qt_ui.UIDialogBase):
                 },
             }
 
-        export_obj_names = sum(
-            [list(export_data['objects']) for export_data in export_data.values()],
-            list()
-        )
-
-        mdfrs_as_shape_keys = self._ui.io_export_mdfr_grpbox.isChecked()
-        mdfr_start_frame = self._ui.io_export_mdfr_start_frame_spbox.value()
-        mdfr_end_frame = self._ui.io_export_mdfr_end_frame_spbox.value()
-        mdfr_frame_step = self._ui.io_export_mdfr_frame_step_spbox.value()
-        mdfr_frame_range = (mdfr_start_frame, mdfr_end_frame, mdfr_frame_step)
-        mdfr_name_prefix = self._ui.io_export_mdfr_name_lnedit.text()
-        mdfr_names = [
-            btn.text() for btn in self._ui.io_export_mdfr_type_btngrp.buttons() if btn.isChecked()
-        ]
-        mdfr_types = tuple(getattr(bpy.types, mdfr_name) for mdfr_name in mdfr_names)
-
-        # Instanciate Exporter
-        b3d_exporter = IOExporter(
-            root_export_dir_path=export_dir_path
-        )
-        b3d_exporter.bake_ue2rigify_rig_to_source()
-
-        if export_obj_names and mdfrs_as_shape_keys:
-            b3d_exporter.prepare_shape_keys_from_modifiers(
-                modifier_types=mdfr_types,
-                keep_as_separate=False,
-                object_names=export_obj_names,
-                shape_key_name_prefix=mdfr_name_prefix,
-                modifier_frame_range=mdfr_frame_range
-            )
-            b3d_exporter.apply_modifiers(
-                object_names=export_obj_names
-            )
-            b3d_exporter.apply_shape_keys_from_modifiers(
-                move_shape_keys_to_top=True
-            )
-
-        # Call export function
-        b3d_exporter.export_objects(
-            export_object_data=export_data,
-            export_file_suffix=export_file_suffix,
-            export_sub_dir=export_platform_name,
-            **export_settings
+        # Resolve the export into a manifest, then run it.
+        export_manifest = io_plan_export(
+            export_data=export_data,
+            root_export_dir_path=export_dir_path,
+            export_platform_name=export_platform_name,
+            export_settings_overrides=export_settings_overrides,
+            mdfr_enable=self._ui.io_export_mdfr_grpbox.isChecked(),
+            mdfr_type_names=[
+                btn.text() for btn in self._ui.io_export_mdfr_type_btngrp.buttons() if btn.isChecked()
+            ],
+            mdfr_frame_range=(
+                self._ui.io_export_mdfr_start_frame_spbox.value(),
+                self._ui.io_export_mdfr_end_frame_spbox.value(),
+                self._ui.io_export_mdfr_frame_step_spbox.value(),
+            ),
+            mdfr_name_prefix=self._ui.io_export_mdfr_name_lnedit.text(),
         )
-
-        # Prompt the user to reopen the original file used for the export, if desired.
-        open_original_file = qt_ui.ui_message_box(
+        # The export is isolated (see bpy_io.IOSnapshot), so the original file does not need to be reopened.
+        io_run_export_manifest(export_manifest, isolate=True)
+        qt_ui.ui_message_box(
             title='Export Complete',
-            text=f'{export_platform_name} export completed successfully.\n' + \
-                f'Reopen {current_file_path.name}?',
-            message_box_type='question'
+            text=f'{export_platform_name} export completed successfully.',
+            message_box_type='information'
         )
-        if open_original_file:
-            # Reopen original file
-            bpy.ops.wm.open_mainfile(filepath=current_file_path.as_posix())
 
         self.done(0)
 
@@ -386,25 +405,28 @@ class IOExporter(object):
 
     def __init__(
         self,
-        root_export_dir_path: typing.Union[pathlib.Path, str]
+        root_export_dir_path: typing.Union[pathlib.Path, str],
+        snapshot_datablocks: typing.Union[typing.Iterable[bpy.types.ID], None] = None,
     ):
-        """TODO"""
+        """
+        Constructor method.
+
+        :param root_export_dir_path: The root export directory
+            (files are exported into a directory named after the current file).
+        :param snapshot_datablocks: If given, only these datablocks (and the datablocks they use,
+            see bpy_io.IOSnapshot) are snapshot before the export, to be restored by restore().
+            Otherwise, the current file is saved as a separate file in the session's temp directory,
+            and the original file must be reopened after the export.
+        """
         root_export_dir_path = pathlib.Path(root_export_dir_path)
         self.export_dir_path = root_export_dir_path.joinpath(bpy_io.io_get_current_file_path().stem)
         self.export_dir_path.mkdir(parents=True, exist_ok=True)
-        #
-        # Save as a separate file in the temp directory for the session.
-        current_file_name = bpy_io.io_get_current_file_path().name
-        temp_dir_path = bpy_io.io_get_temp_dir(context='session')
-        save_file_path = temp_dir_path.joinpath(current_file_name)
-        bpy_io.io_save_as(
-            file_path=save_file_path,
-            check_existing=False
-        )
+        self.snapshot = None
+
         #
         self.armature_obj = None
         self.control_rig = None
-        self.shape_key_objs = {}
+        self.shape_key_baker = bpy_mdl.MdlShapeKeyBaker()
         self.shape_key_modifier_types = set()
 
         ue2rigify_loaded = all((
@@ -422,6 +444,48 @@ class IOExporter(object):
                     ue2rigify.constants.Rigify.CONTROL_RIG_NAME
                 )
 
+        # Snapshot the datablocks the export changes (including the rigs baked by ue2rigify).
+        if snapshot_datablocks is not None:
+            self.snapshot = bpy_io.IOSnapshot(
+                list(snapshot_datablocks) + [obj for obj in (self.armature_obj, self.control_rig) if obj]
+            )
+
+        # Otherwise, save as a separate file in the temp directory for the session.
+        else:
+            current_file_name = bpy_io.io_get_current_file_path().name
+            temp_dir_path = bpy_io.io_get_temp_dir(context='session')
+            save_file_path = temp_dir_path.joinpath(current_file_name)
+            bpy_io.io_save_as(
+                file_path=save_file_path,
+                check_existing=False
+            )
+
+    def _get_export_dir_path(
+        self,
+        export_sub_dir: typing.Union[str, None] = None,
+    ) -> pathlib.Path:
+        """
+        :returns: The export directory (with the given sub-directory).
+        """
+        export_dir_path = self.export_dir_path
+        if export_sub_dir is not None:
+            export_dir_path = export_dir_path.joinpath(export_sub_dir)
+
+        return export_dir_path
+
+    def _read_fingerprints(
+        self,
+        export_dir_path: pathlib.Path,
+    ) -> dict:
+        """
+        :returns: The fingerprints recorded in an export directory (see IO_FINGERPRINTS_FILE_NAME).
+        """
+        try:
+            with export_dir_path.joinpath(IO_FINGERPRINTS_FILE_NAME).open('r', encoding='UTF-8') as r_file:
+                return json.load(r_file)
+        except (OSError, ValueError):
+            return {}
+
     def _validate_for_shape_keys(
         self,
         object_to_validate: bpy.types.Object
@@ -443,9 +507,9 @@ class IOExporter(object):
         An Object cannot be exported from Blender with Shape Keys if any modifiers are active.
         Sadly, most modifiers cannot be applied to an Object if it has any shape keys.
         apply_modifiers() work-around:
-        1. Creates temporary Object duplicate(s) for each shape key on an Object.
-        2. Removes all shape keys from source Object so that modifiers can be applied.
-        3. Creates a new shape key from each temporary Object duplicate.
+        1. Removes the modifiers baked by prepare_shape_keys_from_modifiers().
+        2. Applies all other modifiers (except Armature modifiers) to the Object,
+           recreating its existing Shape Keys from the evaluated mesh (see bpy_mdl.MdlShapeKeyBaker).
         IMPORTANT:
         To apply modifiers as Shape Keys, run the following methods in the following order:
         1. prepare_shape_keys_from_modifiers()
@@ -458,68 +522,32 @@ class IOExporter(object):
             if self._validate_for_shape_keys(orig_obj):
 
                 bpy_scn.scn_set_all_hidden(orig_obj, False)
-                dup_objs = {}
 
                 if orig_obj.data.shape_keys:
                     # Clear drivers and/or keyframes driving shape keys and set their values to 0
-                    # shape_key_data_name = orig_obj.active_shape_key.id_data.name
-                    # anim_data = bpy.data.shape_keys[shape_key_data_name].animation_data
-                    # if anim_data:
-                    #     action_fcrvs = anim_data.action.fcurves if anim_data.action else []
-                    #     for _ in action_fcrvs:
-                    #         action_fcrvs.remove(action_fcrvs[0])
-                    #     driver_fcrvs = anim_data.drivers
-                    #     for _ in driver_fcrvs:
-                    #         driver_fcrvs.remove(driver_fcrvs[0])
                     bpy_ani.ani_break_inputs(
                         target_object=orig_obj,
                         on_data=True
                     )
-
-                    orig_shape_keys = orig_obj.data.shape_keys.key_blocks
-                    for shape_key in orig_shape_keys:
-                        shape_key.value = 0
-
-                    # Create Object duplicate(s) for each shape key on the Object.
-                    for shape_key in orig_shape_keys[1:]:
-                        bpy_scn.scn_select_items(items=[orig_obj])
-                        shape_key.value = 1
-                        bpy.ops.object.duplicate(linked=False)
-                        dup_obj = bpy.context.object
-                        dup_objs[shape_key.name] = dup_obj
-                        bpy.ops.object.shape_key_remove(all=True, apply_mix=True)
-                        for dup_mod in dup_obj.modifiers:
-                            if not isinstance(dup_mod, bpy.types.ArmatureModifier):
-                                if isinstance(dup_mod, tuple(self.shape_key_modifier_types)):
-                                    bpy.ops.object.modifier_remove(modifier=dup_mod.name)
-                                else:
-                                    try:
-                                        bpy.ops.object.modifier_apply(modifier=dup_mod.name)
-                                    except RuntimeError as r_e:
-                                        print(r_e)
+                    for shape_key in orig_obj.data.shape_keys.key_blocks:
                         shape_key.value = 0
 
-                bpy_scn.scn_select_items(items=[orig_obj])
-                orig_obj.shape_key_clear()
-                for mod in orig_obj.modifiers:
+                apply_mdfrs = []
+                for mod in list(orig_obj.modifiers):
                     if not isinstance(mod, bpy.types.ArmatureModifier):
                         if isinstance(mod, tuple(self.shape_key_modifier_types)):
-                            bpy.ops.object.modifier_remove(modifier=mod.name)
+                            orig_obj.modifiers.remove(mod)
                         else:
-                            try:
-                                bpy.ops.object.modifier_apply(modifier=mod.name)
-                            except RuntimeError as r_e:
-                                print(r_e)
-
-                for shape_key_name, dup_obj in dup_objs.items():
-                    bpy_scn.scn_select_items(items=[dup_obj, orig_obj])
-                    bpy.ops.object.join_shapes()
-                    shape_key_index = len(orig_obj.data.shape_keys.key_blocks) - 1
-                    orig_obj.active_shape_key_index = shape_key_index
-                    orig_obj.active_shape_key.name = shape_key_name
-                    bpy_scn.scn_select_items(items=[dup_obj])
-                    bpy.ops.object.delete(use_global=False)
-                    bpy.context.view_layer.objects.active = orig_obj
+                            apply_mdfrs.append(mod)
+
+                try:
+                    bpy_mdl.mdl_apply_modifiers_to_object(
+                        obj=orig_obj,
+                        mdfr_list=apply_mdfrs,
+                    )
+                except ValueError as v_e:
+                    print(v_e)
+
                 orig_obj.active_shape_key_index = 0
 
     def apply_shape_keys_from_modifiers(
@@ -528,24 +556,13 @@ class IOExporter(object):
     ):
         """
         Step 3 to apply deformation from modifier(a) as Shape Keys.
-        Creates Shape Keys from mesh duplicates created with prepare_shape_keys_from_modifiers().
+        Creates Shape Keys from the vertex positions baked with prepare_shape_keys_from_modifiers().
         See the apply_modifiers() method for more information.
         """
-        for orig_obj, shape_key_objs in self.shape_key_objs.items():
-            for i, (shape_key_name, shape_key_obj) in enumerate(shape_key_objs.items(), 1):
-                bpy_scn.scn_select_items(items=[shape_key_obj, orig_obj])
-                bpy.ops.object.join_shapes()
-                bpy_scn.scn_select_items(items=[orig_obj])
-                shape_key_index = len(orig_obj.data.shape_keys.key_blocks) - 1
-                orig_obj.active_shape_key_index = shape_key_index
-                orig_obj.active_shape_key.name = shape_key_name
-                if move_shape_keys_to_top:
-                    bpy.ops.object.shape_key_move(type='TOP')
-                    while orig_obj.active_shape_key_index < i:
-                        bpy.ops.object.shape_key_move(type='DOWN')
-
-                bpy_scn.scn_select_items(items=[shape_key_obj])
-                bpy.ops.object.delete(use_global=False)
+        orig_objs = {orig_obj for orig_obj, _ in self.shape_key_baker.coords}
+        self.shape_key_baker.write(move_to_top=move_shape_keys_to_top)
+
+        for orig_obj in orig_objs:
             orig_obj.active_shape_key_index = 0
 
     def bake_ue2rigify_rig_to_source(self):
@@ -596,15 +613,22 @@ class IOExporter(object):
         export_object_data: dict,
         export_file_suffix: str,
         export_sub_dir: typing.Union[str, None] = None,
+        skip_unchanged: bool = True,
+        unit_fingerprints: typing.Union[dict, None] = None,
         **export_settings
     ):
         """
-        TODO
+        Exports each export unit to its own file.
+        If skip_unchanged is True, units whose fingerprint (see io_get_export_fingerprint())
+        matches the one recorded for their existing file in IO_FINGERPRINTS_FILE_NAME are skipped.
+        Fingerprints should be taken before the scene is edited for the export (i.e. Modifiers are applied),
+        and given as unit_fingerprints (see get_unit_fingerprints()); otherwise they are taken here.
         """
-        export_dir_path = self.export_dir_path
-        if export_sub_dir is not None:
-            export_dir_path = export_dir_path.joinpath(export_sub_dir)
+        export_dir_path = self._get_export_dir_path(export_sub_dir)
         export_dir_path.mkdir(parents=True, exist_ok=True)
+
+        fingerprints_path = export_dir_path.joinpath(IO_FINGERPRINTS_FILE_NAME)
+        fingerprints = self._read_fingerprints(export_dir_path)
         export_file_format = IO_CONFIG_DATA['export']['file_formats'][export_file_suffix]
         export_function = getattr(bpy.ops.export_scene, export_file_format) #TODO develop solution for vrm
 
@@ -621,15 +645,24 @@ class IOExporter(object):
             for override_k, override_v in export_obj_data['overrides'].items():
                 export_settings_copy[override_k] = override_v
 
+            # Skip the unit if it has not changed since its file was exported.
+            fingerprint = (unit_fingerprints or {}).get(export_obj_name) or io_get_export_fingerprint(
+                export_obj_name, export_obj_data, export_settings_copy, self.armature_obj
+            )
+            if skip_unchanged and export_file_path.is_file() \
+                and fingerprints.get(export_obj_name) == fingerprint:
+                print(f'Skipped unchanged export: {export_file_path.name}')
+                continue
+
             #
             for img_data in export_obj_data['textures']:
                 images = [
                     bpy.data.images[img] for img in img_data['images'] if bpy.data.images.get(img)
                 ]
-                bpy_mtl.mtl_resize_image_textures(
+                bpy_mtl.mtl_resize_images(
                     images=images,
-                    max_height=img_data['height'],
-                    max_width=img_data['width'],
+                    maximum_dimensions=(img_data['width'], img_data['height']),
+                    dir_path=export_dir_path.joinpath('textures'),
                 )
 
             orig_obj_data_path_data = {}
@@ -703,10 +736,51 @@ class IOExporter(object):
 
             # Reset image texture sizes to pre-export sizes
             for img_data in export_obj_data['textures']:
-                for img_name in img_data['images']:
-                    img = bpy.data.images.get(img_name)
-                    if img is not None:
-                        img.reload()
+                bpy_mtl.mtl_reset_resized_images(
+                    [bpy.data.images[img] for img in img_data['images'] if bpy.data.images.get(img)]
+                )
+
+            # Record the fingerprint after each export, so an interrupted export keeps its progress.
+            fingerprints[export_obj_name] = fingerprint
+            temp_fingerprints_path = fingerprints_path.with_suffix(f'.{os.getpid()}.tmp')
+            with temp_fingerprints_path.open('w', encoding='UTF-8') as w_file:
+                json.dump(fingerprints, w_file, indent=4)
+            os.replace(temp_fingerprints_path, fingerprints_path)
+
+    def get_unit_fingerprints(
+        self,
+        export_object_data: dict,
+        export_file_suffix: str,
+        export_sub_dir: typing.Union[str, None] = None,
+        **export_settings
+    ) -> typing.Tuple[dict, typing.List[str]]:
+        """
+        Gets the fingerprint of each export unit (see io_get_export_fingerprint()),
+        before the scene is edited for the export, so unchanged units can be left out of all processing.
+
+        :param export_object_data: The export units, keyed by exported file stem.
+        :param export_file_suffix: The exported file suffix.
+        :param export_sub_dir: The export sub-directory (see export_objects()).
+        :returns: The fingerprints, keyed by unit name, and the names of the units whose fingerprint
+            matches the one recorded for their existing file in IO_FINGERPRINTS_FILE_NAME.
+        """
+        export_dir_path = self._get_export_dir_path(export_sub_dir)
+        fingerprints = self._read_fingerprints(export_dir_path)
+
+        unit_fingerprints = {}
+        unchanged_unit_names = []
+        for export_obj_name, export_obj_data in export_object_data.items():
+            unit_fingerprints[export_obj_name] = io_get_export_fingerprint(
+                export_obj_name,
+                export_obj_data,
+                dict(copy.deepcopy(export_settings), **export_obj_data['overrides']),
+                self.armature_obj,
+            )
+            if export_dir_path.joinpath(export_obj_name).with_suffix(export_file_suffix).is_file() \
+                and fingerprints.get(export_obj_name) == unit_fingerprints[export_obj_name]:
+                unchanged_unit_names.append(export_obj_name)
+
+        return unit_fingerprints, unchanged_unit_names
 
     def prepare_shape_keys_from_modifiers(
         self,
@@ -718,26 +792,16 @@ class IOExporter(object):
     ):
         """
         Step 1 to apply deformation from modifier(a) as Shape Keys.
-        Duplicates the mesh with the speicified modifier(s) applied,
-        to be used as Shape Key source meshes in apply_shape_keys_from_modifiers().
+        Bakes the evaluated mesh with the specified modifier(s) for each frame (without duplicating Objects),
+        to be used as Shape Keys in apply_shape_keys_from_modifiers().
         See the apply_modifiers() method for more information.
         """
-        def _add_shape_key_obj(
-            orig_obj: bpy.types.Object,
-            shape_key_name: str,
-            shape_key_obj: bpy.types.Object
-        ):
-            """
-            Adds an entry for tracking temporary mesh(es) to be applied as Shape Key(s).
-            """
-            if orig_obj not in self.shape_key_objs:
-                self.shape_key_objs[orig_obj] = {}
-            self.shape_key_objs[orig_obj][shape_key_name] = shape_key_obj
+        frames = range(*modifier_frame_range)
 
         #
-        for i in range(*modifier_frame_range):
+        for i in frames:
 
-            if len(range(*modifier_frame_range)) > 1:
+            if len(frames) > 1:
                 shape_key_name = f'{shape_key_name_prefix}_{i:02d}'
             else:
                 shape_key_name = shape_key_name_prefix
@@ -752,77 +816,417 @@ class IOExporter(object):
                     )):
                         continue
 
-                    # Force driver updates
-                    bpy.context.scene.frame_set(i)
-                    anim_data = orig_obj.animation_data
-                    if anim_data:
-                        for fcrv in orig_obj.animation_data.drivers:
-                            fcrv.driver.expression = fcrv.driver.expression
-                            fcrv.update()
-
                     # If a separate shape key is needed for each modifier of the given type(s),
-                    # create a duplicate object for each modifier.
+                    # bake a shape key with only that modifier (of the given type(s)) shown.
                     if keep_as_separate:
                         for j, mod in enumerate(orig_obj.modifiers):
                             if isinstance(mod, modifier_types):
-                                dup_obj_name = \
-                                    f'{shape_key_name}_{j:03d}' if shape_key_name else mod.name
-                                bpy_scn.scn_select_items(items=[orig_obj])
-                                dup_obj = bpy_scn.scn_duplicate_object(
+                                self.shape_key_baker.add_job(
                                     obj=orig_obj,
-                                    name=dup_obj_name
-                                )
-                                if dup_obj.data.shape_keys:
-                                    bpy.ops.object.shape_key_clear()
-                                    bpy.ops.object.shape_key_remove(all=True, apply_mix=False)
-                                _add_shape_key_obj(
-                                    orig_obj=orig_obj,
-                                    shape_key_name=dup_obj_name,
-                                    shape_key_obj=dup_obj
+                                    shape_key_name=f'{shape_key_name}_{j:03d}' if shape_key_name else mod.name,
+                                    frame=i,
+                                    mdfrs=[
+                                        bake_mod for bake_mod in orig_obj.modifiers
+                                        if bake_mod == mod or not isinstance(bake_mod, modifier_types)
+                                    ],
                                 )
 
-                                for dup_mod in dup_obj.modifiers:
-                                    if isinstance(dup_mod, modifier_types):
-                                        if dup_mod.name == mod.name:
-                                            bpy_mdl.mdl_set_modifier_display(
-                                                modifier=dup_mod, visibility=True
-                                            )
-                                        else:
-                                            bpy.ops.object.modifier_remove(modifier=dup_mod.name)
-                                    try:
-                                        bpy.ops.object.modifier_apply(modifier=dup_mod.name)
-                                    except RuntimeError as r_e:
-                                        print(r_e)
-
                     # If a single shape key is needed for all the deformer(s),
-                    # create a single duplicate object from all modifiers of the given type(s).
+                    # bake a single shape key from all modifiers of the given type(s).
                     else:
-                        bpy_scn.scn_select_items(items=[orig_obj])
-                        dup_obj = bpy_scn.scn_duplicate_object(
+                        self.shape_key_baker.add_job(
                             obj=orig_obj,
-                            name=shape_key_name
-                        )
-                        if dup_obj.data.shape_keys:
-                            bpy.ops.object.shape_key_clear()
-                            bpy.ops.object.shape_key_remove(all=True, apply_mix=False)
-                        _add_shape_key_obj(
-                            orig_obj=orig_obj,
                             shape_key_name=shape_key_name,
-                            shape_key_obj=dup_obj
+                            frame=i,
+                            mdfrs=list(orig_obj.modifiers),
                         )
 
-                        for dup_mod in dup_obj.modifiers:
-                            if isinstance(dup_mod, modifier_types):
-                                bpy_mdl.mdl_set_modifier_display(modifier=dup_mod, visibility=True)
-                            try:
-                                bpy.ops.object.modifier_apply(modifier=dup_mod.name)
-                            except RuntimeError as r_e:
-                                print(r_e)
-
             self.shape_key_modifier_types = self.shape_key_modifier_types.union(modifier_types)
 
+        # Evaluate each frame once for all Objects.
+        self.shape_key_baker.evaluate()
+
         bpy.context.scene.frame_set(modifier_frame_range[0])
 
+    def restore(self) -> None:
+        """
+        Restores the datablocks snapshot by the constructor (if any) to their state before the export.
+        References to those datablocks (i.e. armature_obj) are no longer valid afterwards.
+        """
+        if self.snapshot is not None:
+            self.snapshot.restore()
+            self.snapshot = None
+
+
+def _io_get_image_size(
+    img: bpy.types.Image,
+) -> typing.Tuple[int, int]:
+    """
+    Gets the dimensions of an Image, from its file header if it has a file (without loading its pixels).
+    """
+    img_file_path = pathlib.Path(bpy.path.abspath(img.filepath, library=img.library)) \
+        if img.source == 'FILE' and img.packed_file is None and img.filepath else None
+    if img_file_path is not None and img_file_path.is_file():
+        try:
+            return tuple(py_img.img_get_size(img_file_path))
+        except OSError:
+            pass
+
+    return tuple(img.size)
+
+
+def _io_get_json_value(
+    val: typing.Any,
+) -> typing.Any:
+    """
+    Converts values that are not JSON serializable (sets, vectors, matrices, etc.) for json.dumps().
+    """
+    if isinstance(val, (set, frozenset)):
+        return sorted(val, key=repr)
+    if hasattr(val, '__iter__'):
+        return list(val)
+    return repr(val)
+
+
+def io_diff_export_manifests(
+    export_manifest: dict,
+    prev_export_manifest: dict,
+) -> dict:
+    """
+    Compares an export manifest with the manifest of a previous export (see io_plan_export()).
+
+    :param export_manifest: The export manifest.
+    :param prev_export_manifest: The previous export manifest (an empty dict if there is none).
+    :returns: The names of the "added" and "removed" export units,
+        the "changed" export units with the names of their changed keys,
+        and the changed export "options" (e.g. "settings" or "modifiers").
+    """
+    units = export_manifest.get('units', {})
+    prev_units = prev_export_manifest.get('units', {})
+
+    changed_units = {}
+    for unit_name in sorted(set(units) & set(prev_units)):
+        unit_keys = set(units[unit_name]) | set(prev_units[unit_name])
+        changed_keys = sorted(
+            k for k in unit_keys if units[unit_name].get(k) != prev_units[unit_name].get(k)
+        )
+        if changed_keys:
+            changed_units[unit_name] = changed_keys
+
+    return {
+        'added': sorted(set(units) - set(prev_units)),
+        'removed': sorted(set(prev_units) - set(units)),
+        'changed': changed_units,
+        'options': sorted(
+            k for k in ('convert', 'file_suffix', 'modifiers', 'settings')
+            if prev_export_manifest and export_manifest.get(k) != prev_export_manifest.get(k)
+        ),
+    }
+
+
+def io_get_export_fingerprint(
+    export_obj_name: str,
+    export_obj_data: dict,
+    export_settings: dict,
+    armature_obj: typing.Union[bpy.types.Object, None] = None,
+) -> str:
+    """
+    Gets the fingerprint of an export unit (see IOExporter.export_objects()):
+    a hash of the export settings and unit data, and of each exported Object's transform,
+    Modifier settings (including Geometry Nodes inputs), keyframes, drivers, mesh buffers
+    (vertices, loops, polygons, UVs, colors, vertex group weights and Shape Keys, with their animation)
+    or Armature bones, and Material node trees, including the file stamps (size and modification time)
+    of their images. Datablocks the hashed data points to (e.g. Modifier target Objects or node groups)
+    are hashed in full, and structs (e.g. color ramps or curve mappings) are hashed recursively.
+    If the unit has data the fingerprint cannot see (e.g. Curve Objects), the fingerprint is unique,
+    so the unit is always treated as changed.
+    Buffers are read in bulk (foreach_get), so the Objects are not evaluated or changed.
+
+    :param export_obj_name: Name of the export unit (the exported file stem).
+    :param export_obj_data: The unit's "objects", "overrides" and "textures".
+    :param export_settings: The export operator settings (with the unit's overrides).
+    :param armature_obj: The Armature Object exported with selected Objects, if any.
+    :returns: The hexadecimal fingerprint.
+    """
+    fp_hash = hashlib.sha1()
+    hashed_ids = set()
+    hashed_structs = set()
+    id_prop_names = frozenset(prop.identifier for prop in bpy.types.ID.bl_rna.properties)
+    imgs = {}
+    unseen_data = []
+
+    def _hash_val(val):
+        """Hashes a value (JSON-encoded)."""
+        fp_hash.update(json.dumps(val, sort_keys=True, default=_io_get_json_value).encode())
+
+    def _hash_buffer(collection, attr, item_size, dtype=np.float32):
+        """Hashes an attribute of all items of a collection."""
+        buffer = np.empty(len(collection) * item_size, dtype=dtype)
+        collection.foreach_get(attr, buffer)
+        fp_hash.update(buffer.tobytes())
+
+    def _get_val(val, depth):
+        """Gets a JSON-encodable value, hashing the datablocks and structs it points to."""
+        if isinstance(val, bpy.types.ID):
+            _hash_id(val)
+            return [val.bl_rna.identifier, val.name, val.library.filepath if val.library else None]
+        if isinstance(val, bpy.types.bpy_struct):
+            _hash_props(val, depth + 1)
+            return val.bl_rna.identifier
+        if hasattr(val, 'to_dict'):
+            val = val.to_dict()
+        elif hasattr(val, 'to_list'):
+            val = val.to_list()
+        if isinstance(val, dict):
+            return {k: _get_val(v, depth) for k, v in val.items()}
+        if isinstance(val, (list, tuple)):
+            return [_get_val(v, depth) for v in val]
+        return val
+
+    def _hash_props(data, depth=0):
+        """
+        Hashes the property values and custom (ID) properties of a datablock or struct (once),
+        and the structs and collections of structs nested in it (up to IO_FINGERPRINT_MAX_DEPTH).
+        """
+        if data.as_pointer() in hashed_structs:
+            return
+        if depth > IO_FINGERPRINT_MAX_DEPTH:
+            unseen_data.append(data.bl_rna.identifier)
+            return
+        hashed_structs.add(data.as_pointer())
+
+        if isinstance(data, bpy.types.ID):
+            ignored_props = IO_FINGERPRINT_IGNORED_STRUCT_PROPS | id_prop_names
+        elif depth == 0:
+            ignored_props = IO_FINGERPRINT_IGNORED_PROPS
+        else:
+            ignored_props = IO_FINGERPRINT_IGNORED_STRUCT_PROPS
+        props = {}
+        for prop in data.bl_rna.properties:
+            if prop.identifier in ignored_props or (prop.type == 'COLLECTION' and depth == 0):
+                continue
+            prop_val = getattr(data, prop.identifier, None)
+            if prop.type == 'COLLECTION':
+                props[prop.identifier] = [_get_val(item, depth) for item in prop_val]
+            else:
+                props[prop.identifier] = _get_val(prop_val, depth)
+
+        # I.e. the inputs of Geometry Nodes Modifiers.
+        try:
+            props['id_props'] = {k: _get_val(data[k], depth) for k in data.keys()}
+        except TypeError:
+            pass
+
+        _hash_val([data.bl_rna.identifier, props])
+
+    def _hash_fcurve(fcrv):
+        """Hashes the data path and keyframes of an F-Curve."""
+        _hash_val([fcrv.data_path, fcrv.array_index])
+        _hash_buffer(fcrv.keyframe_points, 'co', 2)
+
+    def _hash_anim(id_data):
+        """Hashes the Action, NLA strips and drivers of a datablock."""
+        anim_data = getattr(id_data, 'animation_data', None)
+        if anim_data is None:
+            return
+
+        if anim_data.action is not None:
+            _hash_id(anim_data.action)
+        for nla_track in anim_data.nla_tracks:
+            _hash_val([nla_track.name, nla_track.mute])
+            for nla_strip in nla_track.strips:
+                _hash_props(nla_strip)
+
+        for fcrv in anim_data.drivers:
+            _hash_fcurve(fcrv)
+            _hash_val([fcrv.driver.type, fcrv.driver.expression, fcrv.driver.use_self])
+            for drv_var in fcrv.driver.variables:
+                _hash_val([drv_var.name, drv_var.type])
+                for drv_target in drv_var.targets:
+                    _hash_props(drv_target)
+
+    def _hash_node_tree(node_tree):
+        """Hashes the nodes, input values and links of a node tree (and its node groups)."""
+        for node in node_tree.nodes:
+            _hash_props(node)
+            _hash_val([
+                [node_input.identifier, _get_val(getattr(node_input, 'default_value', None), 0)]
+                for node_input in node.inputs
+            ])
+
+        _hash_val([
+            [lnk.from_node.name, lnk.from_socket.identifier, lnk.to_node.name, lnk.to_socket.identifier, lnk.is_muted]
+            for lnk in node_tree.links
+        ])
+
+    def _hash_mesh(mesh):
+        """Hashes the buffers, attributes and Shape Keys of a Mesh."""
+        _hash_buffer(mesh.vertices, 'co', 3)
+        _hash_buffer(mesh.edges, 'vertices', 2, np.int32)
+        _hash_buffer(mesh.loops, 'vertex_index', 1, np.int32)
+        _hash_buffer(mesh.polygons, 'loop_total', 1, np.int32)
+        _hash_buffer(mesh.polygons, 'material_index', 1, np.int32)
+        _hash_buffer(mesh.polygons, 'use_smooth', 1, bool)
+        for uv_lyr in mesh.uv_layers:
+            _hash_val(uv_lyr.name)
+            _hash_buffer(uv_lyr.data, 'uv', 2)
+        for color_attr in mesh.color_attributes:
+            _hash_val(color_attr.name)
+            _hash_buffer(color_attr.data, 'color', 4)
+
+        # Generic attributes (e.g. edge creases, sharp edges and faces, geometry node outputs).
+        for attr in mesh.attributes:
+            _hash_val([attr.name, attr.domain, attr.data_type])
+            if attr.data_type in IO_FINGERPRINT_ATTRIBUTE_BUFFERS:
+                _hash_buffer(attr.data, *IO_FINGERPRINT_ATTRIBUTE_BUFFERS[attr.data_type])
+            else:
+                unseen_data.append(f'{attr.name} ({attr.data_type})')
+
+        if mesh.has_custom_normals:
+            _hash_buffer(mesh.loops, 'normal', 3)
+
+        # Vertex group weights have no bulk accessor.
+        fp_hash.update(np.fromiter(
+            (val for vtx in mesh.vertices for grp in vtx.groups for val in (grp.group, grp.weight)),
+            dtype=np.float32,
+        ).tobytes())
+
+        if mesh.shape_keys is not None:
+            for key_block in mesh.shape_keys.key_blocks:
+                _hash_val([key_block.name, key_block.value, key_block.mute, key_block.relative_key.name])
+                _hash_buffer(key_block.data, 'co', 3)
+            _hash_anim(mesh.shape_keys)
+
+    def _hash_obj(obj):
+        """Hashes the transform, Modifiers, animation, data and Materials of an Object."""
+        _hash_val([
+            obj.name,
+            obj.type,
+            obj.parent.name if obj.parent else None,
+            obj.data.name if obj.data else None,
+            obj.matrix_world,
+            obj.vertex_groups.keys(),
+        ])
+        for mdfr in obj.modifiers:
+            _hash_props(mdfr)
+        _hash_anim(obj)
+
+        if obj.type == 'ARMATURE':
+            _hash_val(obj.data.bones.keys())
+            _hash_buffer(obj.data.bones, 'head_local', 3)
+            _hash_buffer(obj.data.bones, 'tail_local', 3)
+            _hash_buffer(obj.pose.bones, 'matrix_basis', 16)
+            _hash_anim(obj.data)
+        elif obj.data is not None:
+            _hash_id(obj.data)
+
+        for mtl_slot in obj.material_slots:
+            if mtl_slot.material is not None:
+                _hash_id(mtl_slot.material)
+
+    def _hash_id(id_data):
+        """Hashes a datablock (once), by type."""
+        if id_data.as_pointer() in hashed_ids:
+            return
+        hashed_ids.add(id_data.as_pointer())
+
+        if isinstance(id_data, bpy.types.Object):
+            _hash_obj(id_data)
+        elif isinstance(id_data, bpy.types.Mesh):
+            _hash_mesh(id_data)
+            _hash_anim(id_data)
+        elif isinstance(id_data, bpy.types.NodeTree):
+            _hash_node_tree(id_data)
+            _hash_anim(id_data)
+        elif isinstance(id_data, bpy.types.Image):
+            imgs[id_data.name] = id_data
+        elif isinstance(id_data, bpy.types.Action):
+            for fcrv in id_data.fcurves:
+                _hash_fcurve(fcrv)
+        elif isinstance(id_data, bpy.types.Collection):
+            coll_objs = sorted(id_data.all_objects, key=lambda obj: obj.name)
+            _hash_val([obj.name for obj in coll_objs])
+            for obj in coll_objs:
+                _hash_id(obj)
+        elif isinstance(id_data, IO_FINGERPRINT_PROPS_ID_TYPES):
+            _hash_props(id_data)
+            _hash_anim(id_data)
+        else:
+            unseen_data.append(id_data.bl_rna.identifier)
+
+    _hash_val([bpy.app.version_string, export_obj_name, export_obj_data, export_settings])
+
+    _, objs = io_get_export_unit_objects(export_obj_name, export_obj_data, export_settings, armature_obj)
+    for obj in sorted(set(objs), key=lambda obj: obj.name):
+        _hash_id(obj)
+
+    for img_name in sorted(imgs):
+        img = imgs[img_name]
+        img_file_path = pathlib.Path(bpy.path.abspath(
+            img.get(bpy_mtl.MTL_IMG_SRC_FILEPATH_PROP, img.filepath), library=img.library
+        ))
+        try:
+            img_file_stat = img_file_path.stat()
+            img_file_stamp = [img_file_stat.st_size, img_file_stat.st_mtime_ns]
+        except OSError:
+            img_file_stamp = None
+        _hash_val([
+            img.name,
+            img.source,
+            img_file_path.as_posix(),
+            img_file_stamp,
+            img.packed_file.size if img.packed_file else None,
+            img.is_dirty,
+            img.colorspace_settings.name,
+        ])
+
+    # Data the fingerprint cannot see could have changed, so it never matches a recorded fingerprint.
+    if unseen_data:
+        fp_hash.update(os.urandom(16))
+
+    return fp_hash.hexdigest()
+
+
+def io_get_export_unit_objects(
+    export_obj_name: str,
+    export_obj_data: dict,
+    export_settings: dict,
+    armature_obj: typing.Union[bpy.types.Object, None] = None,
+) -> typing.Tuple[typing.Union[str, None], typing.List[bpy.types.Object]]:
+    """
+    Gets the Objects of an export unit, the same way as IOExporter.export_objects() selects them:
+    all Objects of the Layer Collection named after the unit ("collection" mode),
+    or the unit's Objects and their Armatures ("selection" mode).
+
+    :param export_obj_name: Name of the export unit (the exported file stem).
+    :param export_obj_data: The unit's "objects", "overrides" and "textures".
+    :param export_settings: The export operator settings (with the unit's overrides).
+    :param armature_obj: The Armature Object exported with selected Objects, if any.
+    :returns: The export mode (None if the unit is not exported) and the Objects.
+    """
+    objs = []
+    if export_settings.get('use_active_collection') and not export_settings.get('use_selection'):
+        for lyr_col in bpy.context.view_layer.layer_collection.children:
+            if lyr_col.name == export_obj_name:
+                objs = list(lyr_col.collection.all_objects)
+                break
+        return 'collection', objs
+
+    if export_settings.get('use_selection') and not export_settings.get('use_active_collection'):
+        if armature_obj is not None:
+            objs.append(armature_obj)
+        for obj_name in export_obj_data['objects']:
+            obj = bpy.data.objects.get(obj_name)
+            if obj is not None:
+                objs.extend(
+                    mdfr.object for mdfr in obj.modifiers
+                    if isinstance(mdfr, bpy.types.ArmatureModifier) and mdfr.object is not None
+                )
+                objs.append(obj)
+        return 'selection', list(dict.fromkeys(objs))
+
+    return None, objs
+
 
 def io_launch_export_dialog_ui() -> None:
     """
@@ -831,3 +1235,304 @@ def io_launch_export_dialog_ui() -> None:
     os.system('cls')
 
     qt_ui.ui_launch_dialog(IOExportDialogUI)
+
+
+def io_plan_export(
+    export_data: dict,
+    root_export_dir_path: typing.Union[pathlib.Path, str],
+    export_platform_name: str,
+    export_settings_overrides: typing.Union[dict, None] = None,
+    mdfr_enable: bool = False,
+    mdfr_type_names: typing.Iterable[str] = (),
+    mdfr_frame_range: typing.Sequence[int] = (1, 2, 1),
+    mdfr_name_prefix: str = '',
+) -> dict:
+    """
+    Resolves an export into a serializable (JSON) manifest, without changing the Scene:
+    the Objects of each export unit, the Modifiers to bake as Shape Keys or apply,
+    the textures to resize, the output paths and the estimated vertex and texture memory.
+    The manifest can be inspected, compared with the last export (see io_diff_export_manifests())
+    and run without the UI, including in a background Blender process (see io_run_export_manifest()).
+
+    :param export_data: The export units, keyed by exported file stem,
+        each with its "objects", "overrides" and "textures" (see ./ops_io_examples for template files).
+    :param root_export_dir_path: The root export directory (see IOExporter).
+    :param export_platform_name: Name of the export platform (see IO_CONFIG_DATA).
+    :param export_settings_overrides: Export settings that override the platform's settings.
+    :param mdfr_enable: If True, bake Modifiers of the given types as Shape Keys
+        and apply all other Modifiers (except Armature Modifiers) before the export.
+    :param mdfr_type_names: Names of the Modifier types to bake as Shape Keys (e.g. "SubsurfModifier").
+    :param mdfr_frame_range: The start, end and step of the frames to bake.
+    :param mdfr_name_prefix: Prefix of the baked Shape Keys' names.
+    :returns: The export manifest.
+    """
+    current_file_path = bpy_io.io_get_current_file_path()
+    export_platform_data = IO_CONFIG_DATA['export']['platforms'][export_platform_name]
+    export_file_suffix = export_platform_data['suffix']
+    export_settings = copy.deepcopy(export_platform_data['settings'])
+    export_settings.update(export_settings_overrides or {})
+    export_dir_path = pathlib.Path(root_export_dir_path).joinpath(current_file_path.stem, export_platform_name)
+
+    mdfr_types = tuple(getattr(bpy.types, mdfr_type_name) for mdfr_type_name in mdfr_type_names)
+    mdfr_frame_count = len(range(*mdfr_frame_range)) if mdfr_enable else 0
+    mdfr_obj_names = list(dict.fromkeys(
+        obj_name for unit_data in export_data.values() for obj_name in unit_data['objects']
+    )) if mdfr_enable else []
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+
+    units = {}
+    for unit_name, unit_data in export_data.items():
+        unit_mode, objs = io_get_export_unit_objects(
+            unit_name, unit_data, dict(export_settings, **unit_data['overrides'])
+        )
+
+        unit_objs = {}
+        unit_imgs = {}
+        vertex_memory = 0
+        for obj in dict.fromkeys(objs):
+            obj_data = unit_data['objects'].get(obj.name, {})
+            obj_entry = {
+                'type': obj.type,
+                'material': obj_data.get('material', ''),
+                'modifiers': obj_data.get('modifiers', {}),
+                'shape_keys': obj_data.get('shape_keys', {}),
+                'bake_modifiers': [],
+                'apply_modifiers': [],
+                'vertex_count': 0,
+                'shape_key_count': 0,
+            }
+
+            if obj.name in mdfr_obj_names:
+                for mdfr in obj.modifiers:
+                    if isinstance(mdfr, mdfr_types):
+                        obj_entry['bake_modifiers'].append(mdfr.name)
+                    elif not isinstance(mdfr, bpy.types.ArmatureModifier):
+                        obj_entry['apply_modifiers'].append(mdfr.name)
+
+            if obj.type == 'MESH':
+                obj_entry['vertex_count'] = len(obj.evaluated_get(depsgraph).data.vertices)
+                shape_keys = obj.data.shape_keys
+                obj_entry['shape_key_count'] = max(len(shape_keys.key_blocks) - 1, 0) if shape_keys else 0
+                if obj_entry['bake_modifiers']:
+                    obj_entry['shape_key_count'] += mdfr_frame_count
+                vertex_memory += obj_entry['vertex_count'] * (
+                    IO_VERTEX_BYTES + obj_entry['shape_key_count'] * IO_SHAPE_KEY_VERTEX_BYTES
+                )
+
+                for n in bpy_node.node_get_node_tree_index().get_nodes_from_node_trees(
+                    (mtl.node_tree for mtl in bpy_mtl.mtl_get_mtls_from_obj(obj) if mtl is not None),
+                    node_types=(bpy.types.ShaderNodeTexImage,),
+                ):
+                    if n.image is not None:
+                        unit_imgs[n.image.name] = n.image
+
+            unit_objs[obj.name] = obj_entry
+
+        # Textures are exported at their size, or resized to fit the unit's texture dimensions.
+        img_max_dimensions = {}
+        for img_data in unit_data['textures']:
+            for img_name in img_data['images']:
+                img = bpy.data.images.get(img_name)
+                if img is not None:
+                    unit_imgs[img_name] = img
+                    img_max_dimensions[img_name] = (img_data['width'], img_data['height'])
+
+        unit_textures = {}
+        for img_name, img in unit_imgs.items():
+            src_size = _io_get_image_size(img)
+            size = py_img.img_get_resize_dimensions(
+                src_size, maximum_dimensions=img_max_dimensions[img_name]
+            ) if img_name in img_max_dimensions else src_size
+            unit_textures[img_name] = {
+                'file_path': bpy.path.abspath(img.filepath, library=img.library) if img.filepath else '',
+                'resize': img_name in img_max_dimensions,
+                'source_size': list(src_size),
+                'size': list(size),
+            }
+
+        units[unit_name] = {
+            'mode': unit_mode,
+            'file_path': export_dir_path.joinpath(unit_name).with_suffix(export_file_suffix).as_posix(),
+            'overrides': unit_data['overrides'],
+            'objects': unit_objs,
+            'textures': unit_data['textures'],
+            'images': unit_textures,
+            'memory': {
+                'vertex': vertex_memory,
+                'texture': int(sum(w * h * IO_TEXEL_BYTES for w, h in (
+                    img_entry['size'] for img_entry in unit_textures.values()
+                ))),
+            },
+        }
+
+    return {
+        'version': IO_MANIFEST_VERSION,
+        'blend_file': current_file_path.as_posix(),
+        'root_export_dir': pathlib.Path(root_export_dir_path).as_posix(),
+        'export_dir': export_dir_path.as_posix(),
+        'platform': export_platform_name,
+        'file_suffix': export_file_suffix,
+        'settings': export_settings,
+        'convert': export_platform_data['convert'],
+        'modifiers': {
+            'enable': mdfr_enable,
+            'types': list(mdfr_type_names),
+            'frame_range': list(mdfr_frame_range),
+            'name_prefix': mdfr_name_prefix,
+            'object_names': mdfr_obj_names,
+        },
+        'units': units,
+        'memory': {
+            mem_k: sum(unit['memory'][mem_k] for unit in units.values()) for mem_k in ('vertex', 'texture')
+        },
+    }
+
+
+def io_read_export_manifest(
+    manifest_path: typing.Union[pathlib.Path, str],
+) -> typing.Union[dict, None]:
+    """
+    Reads an export manifest file (see io_plan_export()).
+
+    :param manifest_path: Path to the manifest file
+        (or to an export directory with an IO_MANIFEST_FILE_NAME file).
+    :returns: The export manifest, if the file exists and is a manifest of the current version.
+    """
+    manifest_path = pathlib.Path(manifest_path)
+    if manifest_path.is_dir():
+        manifest_path = manifest_path.joinpath(IO_MANIFEST_FILE_NAME)
+
+    try:
+        with manifest_path.open('r', encoding='UTF-8') as r_file:
+            export_manifest = json.load(r_file)
+    except (OSError, ValueError):
+        return None
+
+    return export_manifest if export_manifest.get('version') == IO_MANIFEST_VERSION else None
+
+
+def io_run_export_manifest(
+    export_manifest: typing.Union[dict, pathlib.Path, str],
+    dry_run: bool = False,
+    force: bool = False,
+    isolate: bool = True,
+) -> dict:
+    """
+    Runs an export manifest (see io_plan_export()) with an IOExporter
+    and writes it to the export directory, as the baseline of the next export.
+    It does not need the UI, so it can be run in a background Blender process:
+
+    .. code-block:: python
+
+        blender -b character.blend --python-expr "from mas_blender.mas_ops import ops_io; \
+            ops_io.io_run_export_manifest('C:/models/character/FBX/export_manifest.json')"
+
+    :param export_manifest: The export manifest (or the path to a manifest file).
+    :param dry_run: If True, only report the planned export and its differences with the last export.
+    :param force: If True, export all units, including units that have not changed
+        since their last export (see IOExporter.export_objects()).
+    :param isolate: If True, snapshot the exported Objects (and the datablocks they use)
+        and restore them after the export (see bpy_io.IOSnapshot).
+        Otherwise, the current file is saved as a temp file to export from (see IOExporter),
+        and the original file must be reopened after the export.
+    :returns: The differences with the last export (see io_diff_export_manifests()).
+    """
+    if not isinstance(export_manifest, dict):
+        export_manifest_path = export_manifest
+        export_manifest = io_read_export_manifest(export_manifest_path)
+        if export_manifest is None:
+            raise ValueError(f'No export manifest found: {export_manifest_path}.')
+
+    manifest_path = pathlib.Path(export_manifest['export_dir']).joinpath(IO_MANIFEST_FILE_NAME)
+    manifest_diff = io_diff_export_manifests(export_manifest, io_read_export_manifest(manifest_path) or {})
+
+    print(
+        f'Export plan: {len(export_manifest["units"])} file(s) to {export_manifest["export_dir"]} | '
+        f'vertex memory {export_manifest["memory"]["vertex"] / 1024 ** 2:.1f} MB | '
+        f'texture memory {export_manifest["memory"]["texture"] / 1024 ** 2:.1f} MB'
+    )
+    for diff_k in ('added', 'removed', 'changed', 'options'):
+        if manifest_diff[diff_k]:
+            print(f'    {diff_k}: {manifest_diff[diff_k]}')
+
+    if dry_run:
+        return manifest_diff
+
+    export_settings = copy.deepcopy(export_manifest['settings'])
+    for type_k, type_v in export_manifest['convert'].items():
+        export_settings[type_k] = dict(__builtins__)[type_v](export_settings[type_k])
+
+    mdfr_data = export_manifest['modifiers']
+    export_obj_names = mdfr_data['object_names']
+
+    # Snapshot the Objects of all export units (with their data, Materials and images), if isolated.
+    snapshot_datablocks = None
+    if isolate:
+        snapshot_datablocks = []
+        for unit_name, unit_data in export_manifest['units'].items():
+            snapshot_datablocks.extend(io_get_export_unit_objects(
+                unit_name, unit_data, dict(export_settings, **unit_data['overrides'])
+            )[1])
+            snapshot_datablocks.extend(
+                bpy.data.images[img_name] for img_data in unit_data['textures']
+                for img_name in img_data['images'] if bpy.data.images.get(img_name)
+            )
+
+    # Instanciate Exporter
+    b3d_exporter = IOExporter(
+        root_export_dir_path=export_manifest['root_export_dir'],
+        snapshot_datablocks=snapshot_datablocks,
+    )
+    try:
+        # Fingerprint the units before any processing, and leave unchanged units (and their Objects) out of it.
+        units = export_manifest['units']
+        unit_fingerprints, unchanged_unit_names = b3d_exporter.get_unit_fingerprints(
+            units, export_manifest['file_suffix'], export_sub_dir=export_manifest['platform'], **export_settings
+        )
+        if unchanged_unit_names and not force:
+            for unit_name in unchanged_unit_names:
+                print(f'Skipped unchanged export: {unit_name}{export_manifest["file_suffix"]}')
+            units = {unit_name: unit_data for unit_name, unit_data in units.items()
+                     if unit_name not in unchanged_unit_names}
+            unit_obj_names = {
+                obj.name for unit_name, unit_data in units.items() for obj in io_get_export_unit_objects(
+                    unit_name, unit_data, dict(export_settings, **unit_data['overrides']), b3d_exporter.armature_obj
+                )[1]
+            }
+            export_obj_names = [obj_name for obj_name in export_obj_names if obj_name in unit_obj_names]
+
+        b3d_exporter.bake_ue2rigify_rig_to_source()
+
+        if export_obj_names and mdfr_data['enable']:
+            b3d_exporter.prepare_shape_keys_from_modifiers(
+                modifier_types=tuple(getattr(bpy.types, mdfr_type_name) for mdfr_type_name in mdfr_data['types']),
+                keep_as_separate=False,
+                object_names=export_obj_names,
+                shape_key_name_prefix=mdfr_data['name_prefix'],
+                modifier_frame_range=mdfr_data['frame_range']
+            )
+            b3d_exporter.apply_modifiers(
+                object_names=export_obj_names
+            )
+            b3d_exporter.apply_shape_keys_from_modifiers(
+                move_shape_keys_to_top=True
+            )
+
+        # Call export function
+        b3d_exporter.export_objects(
+            export_object_data=units,
+            export_file_suffix=export_manifest['file_suffix'],
+            export_sub_dir=export_manifest['platform'],
+            skip_unchanged=not force,
+            unit_fingerprints=unit_fingerprints,
+            **export_settings
+        )
+
+    finally:
+        b3d_exporter.restore()
+
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    with manifest_path.open('w', encoding='UTF-8') as w_file:
+        json.dump(export_manifest, w_file, indent=4)
+
+    return manifest_diff
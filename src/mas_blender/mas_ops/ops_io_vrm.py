@@ -11,14 +11,14 @@ import bpy
 
 from mas_blender.mas_bpy._bpy_core import bpy_io, bpy_obj, bpy_scn
 from mas_blender.mas_bpy import bpy_ani, bpy_mdl, bpy_mtl, bpy_node
-from mas_blender.mas_py import py_util
-from mas_blender.mas_qt import qt_ui
+from mas_blender.mas_py import py_img, py_util
+from mas_blender.mas_qt import qt_os, qt_ui
 
 
 #
 import importlib 
 
-for module in (bpy_io, bpy_scn, bpy_ani, bpy_mdl, bpy_mtl, bpy_node, py_util, qt_ui):
+for module in (bpy_io, bpy_scn, bpy_ani, bpy_mdl, bpy_mtl, bpy_node, py_img, py_util, qt_os, qt_ui):
     importlib.reload(module)
 
 
@@ -30,62 +30,63 @@ ops_io_config_file_path = pathlib.Path(__file__).parent.joinpath('ops_io.config.
 with ops_io_config_file_path.open('r', encoding='UTF-8') as readfile:
     IO_CONFIG_DATA = json.load(readfile)
 
+#: Suffix of the copy of the current file that parallel exports are run from (see IOExporter.export()).
+IO_EXPORT_BLEND_COPY_SUFFIX = '_mas_export'
+
+#: Name of the summary file of a parallel export, written to the export directory.
+IO_EXPORT_SUMMARY_FILE_NAME = 'export_summary.json'
+
+
+def io_get_images_for_object(
+    obj: bpy.types.Object,
+) -> list:
+    """
+    Gets the images used by an Object's Materials (Image Texture nodes) and Modifiers (Image Textures).
+    Images with unsaved changes are excluded.
+
+    :param obj: The Object.
+    :returns: The images.
+    """
+    images = bpy_mtl.MtlImageUsageIndex([obj]).get_object_images(obj)
+
+    return [img for img in images if not img.is_dirty]
+
 
 def io_resize_images_for_object(
     obj: bpy.types.Object,
     scale_factor: float = 1.0,
     minimum_dimensions: tuple = (0, 0),
-    # rename_format: str = '<name>_<width>x<height>',
+    dir_path: typing.Union[pathlib.Path, str, None] = None,
+    rename: bool = False,
     reset: bool = False,
 ) -> list:
-    """"""
-    #
-    images = []
-
-    #
-    mtls = bpy_mtl.mtl_get_mtls_from_obj(obj=obj)
-    for mtl in mtls:
-
-        nodes = bpy_node.node_get_nodes_from_node_tree(
-            node_tree=mtl.node_tree,
-            node_types=(bpy.types.ShaderNodeTexImage,),
+    """
+    Resizes (or resets) the images used by an Object (see bpy_mtl.mtl_resize_images()).
+
+    :param obj: The Object.
+    :param scale_factor: Factor to scale the width and height by.
+    :param minimum_dimensions: Minimum width and height after scaling.
+    :param dir_path: Directory for the resized files (default: each source file's directory).
+    :param rename: If True, rename the images to "<name>_<width>x<height>" (default: False).
+    :param reset: If True, revert previously resized images instead (default: False).
+    :returns: The images used by the Object.
+    """
+    images = io_get_images_for_object(obj)
+
+    if reset:
+        bpy_mtl.mtl_reset_resized_images(images)
+
+    elif scale_factor != 1.0:
+        bpy_mtl.mtl_resize_images(
+            images,
+            scale_factor=scale_factor,
+            minimum_dimensions=minimum_dimensions,
+            dir_path=dir_path,
+            rename=rename,
         )
-        images.extend(n.image for n in nodes if n.image is not None)
-
-    img_texs = bpy_mdl.mdl_get_inputs_from_modifiers(
-        obj=obj,
-        input_types=(bpy.types.ImageTexture,)
-    ).values()
-
-    images.extend(img_tex.image for img_tex in img_texs if img_tex.image is not None)
-    images = list({img for img in images if not img.is_dirty})
 
-    #
-    for img in images:
-
-        if reset:
-            img.reload()
-        
-        # 
-        elif scale_factor != 1.0:
-            scale_w, scale_h = int(img.size[0] * scale_factor), int(img.size[1] * scale_factor)
-            dimensions = (max((scale_w, minimum_dimensions[0])), max((scale_h, minimum_dimensions[1])))
-            if dimensions[0] != img.size[0] or dimensions[1] != img.size[1]:
-                # Set image width & height scale.
-                img.scale(dimensions[0], dimensions[1])
-    
     return images
 
-    # Rename image file
-    if rename_with_suffix:
-
-        # Factor in Image names that have file suffixes before renaming.
-        img_file_name = pathlib.Path(img.name)
-
-        # Rename the Node if the Node's name doesn't already end with the given suffix.
-        if not img_file_name.stem.endswith(rename_with_suffix):
-            img.name = f'{img_file_name.stem}{rename_with_suffix}{img_file_name.suffix}'
-
 
 def io_save_mtl_images(
     dir_path: typing.Union[pathlib.Path, str],
@@ -94,17 +95,13 @@ def io_save_mtl_images(
 ) -> None:
     """TODO"""
     dir_path = pathlib.Path(dir_path)
-    images = []
 
-    for mtl in mtls:
-
-        nodes = bpy_node.node_get_nodes_from_node_tree(
-            node_tree=mtl.node_tree,
-            node_types=(bpy.types.ShaderNodeTexImage,),
-        )
-        for n in nodes:
-            if n.image is not None and n.image not in images:
-                images.append(n.image)
+    # Traverse the Materials' node trees in a single pass (shared node groups are visited once).
+    nodes = bpy_node.node_get_node_tree_index().get_nodes_from_node_trees(
+        (mtl.node_tree for mtl in mtls if mtl is not None),
+        node_types=(bpy.types.ShaderNodeTexImage,),
+    )
+    images = list({n.image: None for n in nodes if n.image is not None})
     
     for img in images:
 
@@ -117,12 +114,20 @@ def io_save_mtl_images(
 
         img_file_path = dir_path.joinpath(f'{img_file_stem}{src_img_file_path.suffix}')
 
-        if not img_file_path.exists():
+        if img_file_path.exists():
+            continue
+
+        # Link (or copy) unmodified source files instead of re-encoding them.
+        abs_img_file_path = pathlib.Path(bpy.path.abspath(img.filepath, library=img.library))
+        if img.source == 'FILE' and img.packed_file is None and not img.is_dirty \
+            and abs_img_file_path.is_file() and abs_img_file_path.suffix == img_file_path.suffix:
+            py_img.img_link_file(abs_img_file_path, img_file_path)
+        else:
             img.save(
                 filepath=img_file_path.as_posix(),
                 quality=100,
             )
-            img.filepath = f'//{img_file_path.name}'
+        img.filepath = f'//{img_file_path.name}'
 
 
 class IOExporter(object):
@@ -134,14 +139,23 @@ class IOExporter(object):
         self,
         root_export_dir_path: typing.Union[pathlib.Path, str],
         lyr_cols: typing.Sequence = (),
+        export_dir_path: typing.Union[pathlib.Path, str, None] = None,
+        snapshot: bool = False,
     ):
         """TODO"""
+        # Snapshot the Layer Collections (and their Objects) to restore after the export, if directed.
+        self.snapshot = bpy_io.IOSnapshot(
+            [lyr_col.collection for lyr_col in lyr_cols] + \
+                [obj for lyr_col in lyr_cols for obj in lyr_col.collection.all_objects]
+        ) if snapshot else None
+
         #
         self.layer_collections = self._set_layer_collections(lyr_cols)
 
-        #
+        # Export into a directory named after the current file, unless an export directory is given.
         root_export_dir_path = pathlib.Path(root_export_dir_path)
-        self.export_dir_path = root_export_dir_path.joinpath(bpy_io.io_get_current_file_path().stem)
+        self.export_dir_path = pathlib.Path(export_dir_path) if export_dir_path \
+            else root_export_dir_path.joinpath(bpy_io.io_get_current_file_path().stem)
 
         # Create the export directory if it does not yet exist.
         self.export_dir_path.mkdir(exist_ok=True, parents=True)
@@ -150,6 +164,7 @@ class IOExporter(object):
         """"""
         _lyr_cols = {lyr_col.name: {} for lyr_col in lyr_cols}
         col_name_pattern = re.compile('^(COL_)?(?P<descriptor>(?P<prefix>[A-Z1-9]+)?_?\w+)$')
+        scn_index = bpy_scn.scn_get_scene_index()
 
         for lyr_col in lyr_cols:
 
@@ -168,7 +183,7 @@ class IOExporter(object):
 
             # Create a list of all Mesh Objects in the Layer Collection.
             # mesh_objs = [obj for obj in lyr_col.collection.objects if isinstance(obj.data, bpy.types.Mesh)]
-            mesh_objs = bpy_scn.scn_get_objects_of_type('MESH', lyr_col.collection.name)
+            mesh_objs = scn_index.get_objects_of_type('MESH', lyr_col.collection.name)
             _lyr_cols[lyr_col.name]['mesh_objs'] = mesh_objs
         
         return _lyr_cols
@@ -269,7 +284,7 @@ class IOExporter(object):
                         self.layer_collections[mesh_obj_col.name]['mesh_objs'].pop(mesh_obj_index)
                         mesh_obj_cols[mesh_obj_col] = mesh_obj_index
 
-                    # The process that applies modifiers to the mesh creates a new Mesh Object.
+                    # Modifiers are applied to a new Mesh for the Mesh Object (Shape Keys are recreated).
                     mesh_obj = bpy_mdl.mdl_apply_modifiers_to_object(
                         obj=mesh_obj,
                         mdfr_list=mdfr_list,
@@ -317,126 +332,309 @@ class IOExporter(object):
         copy_imgs: bool = False,
         current_pose: bool = False,
         vrm_meta: dict = {},
+        parallel: bool = False,
+        worker_count: int = None,
         **export_settings
-    ) -> None:
-        """TODO export each action as a separate glb"""
-        #
-        export_file_format = IO_CONFIG_DATA['export']['file_formats'][export_file_suffix]
-        export_function = getattr(bpy.ops.export_scene, export_file_format)
-
+    ) -> dict:
+        """
+        Exports each child Layer Collection to its own file (see export_layer_collection()).
+        In parallel mode, the prepared state of the current file is saved once as a copy,
+        and each Layer Collection is exported from it by a headless Blender process (see qt_os.OSBlenderPool),
+        with a log file for each export in a "logs" folder of the export directory.
+
+        :param export_file_suffix: File suffix of the export format (see IO_CONFIG_DATA).
+        :param export_file_prefix: Prefix of the exported file names.
+        :param copy_imgs: If True, save the Materials' image textures into the export directory.
+        :param current_pose: If True, export using the current pose; if False, the rest pose.
+        :param vrm_meta: VRM metadata to set on the Armature of each Layer Collection.
+        :param parallel: If True, export the Layer Collections in background Blender processes.
+        :param worker_count: Number of Blender processes run at the same time in parallel mode
+            (default: the number of CPU cores).
+        :param export_settings: Keyword arguments for the export operator.
+        :returns: The summary of each Layer Collection's export: the exported file path, state
+            ("DONE" or "FAILED"), log file path, exit code and number of attempts, keyed by name.
+            In parallel mode, the summary is also written to IO_EXPORT_SUMMARY_FILE_NAME.
+        """
         # Exclude all child Layer Collections initially (they will be included one by one).
         for lyr_col_name in self.layer_collections:
             self.layer_collections[lyr_col_name]['lyr_col'].exclude = True
 
+        if parallel:
+            return self._export_parallel(
+                export_file_suffix=export_file_suffix,
+                export_file_prefix=export_file_prefix,
+                copy_imgs=copy_imgs,
+                current_pose=current_pose,
+                vrm_meta=vrm_meta,
+                worker_count=worker_count,
+                export_settings=export_settings,
+            )
+
         # Iterate through the child Layer Collections for individual export.
-        for lyr_col_name, lyr_col_data in self.layer_collections.items():
+        export_summary = {}
+        for lyr_col_name in self.layer_collections:
+            export_file_path = self.export_layer_collection(
+                lyr_col_name,
+                export_file_suffix=export_file_suffix,
+                export_file_prefix=export_file_prefix,
+                copy_imgs=copy_imgs,
+                current_pose=current_pose,
+                vrm_meta=vrm_meta,
+                **export_settings
+            )
+            export_summary[lyr_col_name] = {
+                'file_path': export_file_path.as_posix(),
+                'state': 'DONE',
+                'log_path': '',
+                'return_code': None,
+                'attempts': 1,
+            }
 
-            #
-            export_file_descriptor = lyr_col_data['name_grps'][1]
-            export_file_stem = f'{export_file_prefix}_{export_file_descriptor}'.strip('_')
-            export_file_path = self.export_dir_path.joinpath(export_file_stem).with_suffix(export_file_suffix)
-            export_file_path.parent.mkdir(parents=True, exist_ok=True)
+        return export_summary
 
-            # Include the child Layer Collection and set it to active.
-            lyr_col_data['lyr_col'].exclude = False
-            bpy.context.view_layer.active_layer_collection = lyr_col_data['lyr_col']
+    def _export_parallel(
+        self,
+        export_file_suffix: str,
+        export_file_prefix: str,
+        copy_imgs: bool,
+        current_pose: bool,
+        vrm_meta: dict,
+        worker_count: typing.Union[int, None],
+        export_settings: dict,
+    ) -> dict:
+        """
+        Exports each child Layer Collection in a headless Blender process (see export()).
+        """
+        current_file_path = bpy_io.io_get_current_file_path()
+        blend_file_path = self.export_dir_path.joinpath(
+            f'{current_file_path.stem}{IO_EXPORT_BLEND_COPY_SUFFIX}.blend'
+        )
+        bpy_io.io_save_as(blend_file_path, copy=True)
 
-            # 
-            export_settings_copy = copy.deepcopy(export_settings)
-            if lyr_col_data['armature_obj'] is not None:
-            
-                # Reset the armature.
-                bpy_ani.ani_reset_armature_transforms(
-                    armature_obj=lyr_col_data['armature_obj'],
-                    reset_pose=not current_pose,
-                    set_to_rest=not current_pose
-                )
+        # Datablocks (i.e. the VRM thumbnail Image) are passed to the workers by name.
+        vrm_meta = {
+            k: v.name if isinstance(v, bpy.types.ID) else v for k, v in vrm_meta.items()
+        }
 
-                for export_k in ('armature_object_name',):
-                    if export_k in export_settings_copy:
-                        export_settings_copy[export_k] = lyr_col_data['armature_obj'].name
+        def _log_progress(job, blender_pool):
+            if job.state != 'RUNNING':
+                logger_msg = f'Export {blender_pool.get_progress():.0%} | {job.name}: {job.state}'
+                print(logger_msg)
+
+        blender_pool = qt_os.OSBlenderPool(
+            blender_app_path=bpy.app.binary_path or None,
+            worker_count=worker_count,
+            threads_per_worker=1,
+            log_dir_path=self.export_dir_path.joinpath('logs'),
+            progress_callback=_log_progress,
+        )
+        export_jobs = {}
+        for lyr_col_name in self.layer_collections:
+            export_kwargs = {
+                'lyr_col_name': lyr_col_name,
+                'export_dir_path': self.export_dir_path.as_posix(),
+                'export_file_suffix': export_file_suffix,
+                'export_file_prefix': export_file_prefix,
+                'copy_imgs': copy_imgs,
+                'current_pose': current_pose,
+                'vrm_meta': vrm_meta,
+                'export_settings': export_settings,
+            }
+            export_jobs[lyr_col_name] = blender_pool.submit(qt_os.OSBlenderJob(
+                blend_file=blend_file_path,
+                args=(
+                    '--python-exit-code', '1',
+                    '--python-expr',
+                    'from mas_blender.mas_ops import ops_io_vrm; '
+                    f'ops_io_vrm.io_export_layer_collection(**{export_kwargs!r})',
+                ),
+                name=f'{current_file_path.stem}_{lyr_col_name}',
+                render=False,
+            ))
+
+        blender_pool.start()
+        blender_pool.wait()
+        blend_file_path.unlink(missing_ok=True)
+
+        export_summary = {}
+        for lyr_col_name, job in export_jobs.items():
+            export_file_path = self.get_export_file_path(lyr_col_name, export_file_suffix, export_file_prefix)
+
+            # An export without its file is a failure, even if Blender exited normally.
+            export_state = job.state
+            if export_state == 'DONE' and not export_file_path.is_file():
+                export_state = 'FAILED'
+            if export_state != 'DONE':
+                logger_msg = f'Export of {lyr_col_name} failed (exit code {job.return_code}), ' \
+                             f'see log: {job.log_path}.'
+                print(logger_msg)
+
+            export_summary[lyr_col_name] = {
+                'file_path': export_file_path.as_posix(),
+                'state': export_state,
+                'log_path': job.log_path.as_posix() if job.log_path else '',
+                'return_code': job.return_code,
+                'attempts': job.attempts,
+            }
+
+        export_failures = [name for name, data in export_summary.items() if data['state'] != 'DONE']
+        logger_msg = f'Exported {len(export_summary) - len(export_failures)}/{len(export_summary)} ' \
+                     f'Layer Collection(s) to {self.export_dir_path}' \
+                     + (f' (failed: {", ".join(export_failures)}).' if export_failures else '.')
+        print(logger_msg)
+
+        with self.export_dir_path.joinpath(IO_EXPORT_SUMMARY_FILE_NAME).open('w', encoding='UTF-8') as writefile:
+            json.dump(export_summary, writefile, indent=4)
+
+        return export_summary
+
+    def export_layer_collection(
+        self,
+        lyr_col_name: str,
+        export_file_suffix: str,
+        export_file_prefix: str = '',
+        copy_imgs: bool = False,
+        current_pose: bool = False,
+        vrm_meta: dict = {},
+        **export_settings
+    ) -> pathlib.Path:
+        """
+        Exports a child Layer Collection to its own file (it is included for the export only).
+
+        :param lyr_col_name: Name of the Layer Collection to export.
+        :param export_file_suffix: File suffix of the export format (see IO_CONFIG_DATA).
+        :param export_file_prefix: Prefix of the exported file name.
+        :param copy_imgs: If True, save the Materials' image textures into the export directory.
+        :param current_pose: If True, export using the current pose; if False, the rest pose.
+        :param vrm_meta: VRM metadata to set on the Armature of the Layer Collection.
+        :param export_settings: Keyword arguments for the export operator.
+        :returns: The exported file path.
+        """
+        lyr_col_data = self.layer_collections[lyr_col_name]
+        export_file_format = IO_CONFIG_DATA['export']['file_formats'][export_file_suffix]
+        export_function = getattr(bpy.ops.export_scene, export_file_format)
 
-                # Set VRM Metadata
-                if vrm_meta:
+        #
+        export_file_descriptor = lyr_col_data['name_grps'][1]
+        export_file_path = self.get_export_file_path(lyr_col_name, export_file_suffix, export_file_prefix)
+        export_file_path.parent.mkdir(parents=True, exist_ok=True)
 
-                    #
-                    vrm_meta_texture = vrm_meta.get('texture', None)
-                    vrm_meta_texture_orig = py_util.util_get_attr_recur(
-                        lyr_col_data['armature_obj'].data,
-                        'vrm_addon_extension.vrm0.meta.texture'
-                    )
-                    if isinstance(vrm_meta_texture_orig, bpy.types.Image):
-                        vrm_meta_texture_dir_path = pathlib.Path(bpy.path.abspath(vrm_meta_texture_orig.filepath)).parent
-                        if vrm_meta_texture_dir_path.is_dir():
-                            export_file_prefix = lyr_col_data['name_grps'][2]
-                            for texture_file_path in vrm_meta_texture_dir_path.glob(f'{export_file_prefix}.*'):
-                                vrm_meta_texture = bpy.data.images.load(
-                                    filepath=bpy.path.relpath(texture_file_path.as_posix()),
-                                    check_existing=True
-                                )
-                                break
-                    if vrm_meta_texture is None:
-                        vrm_meta_texture = vrm_meta_texture_orig
+        # Include the child Layer Collection and set it to active.
+        lyr_col_data['lyr_col'].exclude = False
+        bpy.context.view_layer.active_layer_collection = lyr_col_data['lyr_col']
 
-                    #
-                    vrm_meta_title = vrm_meta.get('title', '')
-                    vrm_meta_title_orig = py_util.util_get_attr_recur(
-                        lyr_col_data['armature_obj'].data,
-                        'vrm_addon_extension.vrm0.meta.title'
-                    )
-                    if vrm_meta_title_orig is not None:
-                        vrm_meta_title = f'{vrm_meta_title_orig} ({export_file_descriptor})'
+        # 
+        export_settings_copy = copy.deepcopy(export_settings)
+        if lyr_col_data['armature_obj'] is not None:
+
+            # Reset the armature.
+            bpy_ani.ani_reset_armature_transforms(
+                armature_obj=lyr_col_data['armature_obj'],
+                reset_pose=not current_pose,
+                set_to_rest=not current_pose
+            )
 
-                    #
-                    self.set_vrm_metadata(
-                        armature=lyr_col_data['armature_obj'].data,
-                        metadata=vrm_meta,
-                        texture=vrm_meta_texture,
-                        title=vrm_meta_title
-                    )
-                
-            # Save image textures into export folder
-            if copy_imgs:
-
-                # 
-                mtls = []
-                for mesh_obj in lyr_col_data['mesh_objs']:
-                    for mtl in bpy_mtl.mtl_get_mtls_from_obj(obj=mesh_obj):
-                        if mtl not in mtls:
-                            mtls.append(mtl)
-                
-                # 
-                io_save_mtl_images(
-                    dir_path=export_file_path.parent,
-                    mtls=mtls,
-                    use_node_name=True,
+            for export_k in ('armature_object_name',):
+                if export_k in export_settings_copy:
+                    export_settings_copy[export_k] = lyr_col_data['armature_obj'].name
+
+            # Set VRM Metadata
+            if vrm_meta:
+
+                #
+                vrm_meta_texture = vrm_meta.get('texture', None)
+                vrm_meta_texture_orig = py_util.util_get_attr_recur(
+                    lyr_col_data['armature_obj'].data,
+                    'vrm_addon_extension.vrm0.meta.texture'
+                )
+                if isinstance(vrm_meta_texture_orig, bpy.types.Image):
+                    vrm_meta_texture_dir_path = pathlib.Path(bpy.path.abspath(vrm_meta_texture_orig.filepath)).parent
+                    if vrm_meta_texture_dir_path.is_dir():
+                        vrm_meta_texture_prefix = lyr_col_data['name_grps'][2]
+                        for texture_file_path in vrm_meta_texture_dir_path.glob(f'{vrm_meta_texture_prefix}.*'):
+                            vrm_meta_texture = bpy.data.images.load(
+                                filepath=bpy.path.relpath(texture_file_path.as_posix()),
+                                check_existing=True
+                            )
+                            break
+                if vrm_meta_texture is None:
+                    vrm_meta_texture = vrm_meta_texture_orig
+
+                #
+                vrm_meta_title = vrm_meta.get('title', '')
+                vrm_meta_title_orig = py_util.util_get_attr_recur(
+                    lyr_col_data['armature_obj'].data,
+                    'vrm_addon_extension.vrm0.meta.title'
+                )
+                if vrm_meta_title_orig is not None:
+                    vrm_meta_title = f'{vrm_meta_title_orig} ({export_file_descriptor})'
+
+                #
+                self.set_vrm_metadata(
+                    armature=lyr_col_data['armature_obj'].data,
+                    metadata=vrm_meta,
+                    texture=vrm_meta_texture,
+                    title=vrm_meta_title
                 )
 
-            # Clear Object selection before export.
-            bpy_scn.scn_select_items(items=[])
+        # Save image textures into export folder
+        if copy_imgs:
 
-            export_function(
-                filepath=export_file_path.as_posix(),
-                **export_settings_copy
+            # 
+            mtls = []
+            for mesh_obj in lyr_col_data['mesh_objs']:
+                for mtl in bpy_mtl.mtl_get_mtls_from_obj(obj=mesh_obj):
+                    if mtl not in mtls:
+                        mtls.append(mtl)
+
+            # 
+            io_save_mtl_images(
+                dir_path=export_file_path.parent,
+                mtls=mtls,
+                use_node_name=True,
             )
 
-            # Reset VRM metadata
-            if lyr_col_data['armature_obj'] is not None:
-                if vrm_meta:
-                    py_util.util_set_attr_recur(
-                        lyr_col_data['armature_obj'].data,
-                        'vrm_addon_extension.vrm0.meta.texture',
-                        vrm_meta_texture_orig
-                    )
-                    py_util.util_set_attr_recur(
-                        lyr_col_data['armature_obj'].data,
-                        'vrm_addon_extension.vrm0.meta.title',
-                        vrm_meta_title_orig
-                    )
+        # Clear Object selection before export.
+        bpy_scn.scn_select_items(items=[])
+
+        export_function(
+            filepath=export_file_path.as_posix(),
+            **export_settings_copy
+        )
+
+        # Reset VRM metadata
+        if lyr_col_data['armature_obj'] is not None:
+            if vrm_meta:
+                py_util.util_set_attr_recur(
+                    lyr_col_data['armature_obj'].data,
+                    'vrm_addon_extension.vrm0.meta.texture',
+                    vrm_meta_texture_orig
+                )
+                py_util.util_set_attr_recur(
+                    lyr_col_data['armature_obj'].data,
+                    'vrm_addon_extension.vrm0.meta.title',
+                    vrm_meta_title_orig
+                )
+
+        # Exclude the child Layer Collection again.
+        lyr_col_data['lyr_col'].exclude = True
+
+        return export_file_path
+
+    def get_export_file_path(
+        self,
+        lyr_col_name: str,
+        export_file_suffix: str,
+        export_file_prefix: str = '',
+    ) -> pathlib.Path:
+        """
+        :returns: The export file path of a child Layer Collection: "<prefix>_<descriptor><suffix>".
+        """
+        export_file_descriptor = self.layer_collections[lyr_col_name]['name_grps'][1]
+        export_file_stem = f'{export_file_prefix}_{export_file_descriptor}'.strip('_')
+
+        return self.export_dir_path.joinpath(export_file_stem).with_suffix(export_file_suffix)
 
-            # Exclude the current child Layer Collection.
-            lyr_col_data['lyr_col'].exclude = True
-    
     def get_vrm_shape_key_data(
             self,
             lyr_col_name: str
@@ -481,7 +679,7 @@ class IOExporter(object):
         opt_num_objs: typing.Tuple[bool, str] = (True, ''),
         opt_objs_incl_instances: bool= False,
         opt_objs_name_prefix: str = 'GEO_',
-        opt_vtx_grps: typing.Tuple[bool, float] = (True, 0.001, ('', '')),
+        opt_vtx_grps: typing.Tuple[bool, float, typing.Tuple[str, str]] = (True, 0.001, ('', '')),
         flatten_hierarchy: bool = True,
         keep_inst_hierarchy: bool = True
     ) -> None:
@@ -495,6 +693,7 @@ class IOExporter(object):
 
             col = self.layer_collections[lyr_col_name]['col']
             copied_objs = []
+            opt_images = []
             mesh_objs = py_util.util_copy(
                 compound_obj=self.layer_collections[lyr_col_name]['mesh_objs'],
             )
@@ -519,33 +718,19 @@ class IOExporter(object):
                     exclude=['vrm_addon_extension']
                 )
 
-                #Remove vertex groups, first by name, then by weight threshold.
-                # if opt_vtx_grps[0]:
-                    # TODO Buggy
-                    # bpy_mdl.mdl_delete_vertex_groups_by_weight(obj=mesh_obj, threshold=opt_vtx_grps[1])
-                    # bpy_mdl.mdl_delete_vertex_groups_by_name(
-                    #     obj=mesh_obj,
-                    #     prefix=opt_vtx_grps[2][0],
-                    #     suffix=opt_vtx_grps[2][1]
-                    # )
-
-                # Resize image(s).
+                # Remove vertex groups, first by name (if a prefix/suffix is given), then by weight threshold.
+                if opt_vtx_grps[0]:
+                    if any(opt_vtx_grps[2]):
+                        bpy_mdl.mdl_delete_vertex_groups_by_name(
+                            obj=mesh_obj,
+                            prefix=opt_vtx_grps[2][0],
+                            suffix=opt_vtx_grps[2][1]
+                        )
+                    bpy_mdl.mdl_delete_vertex_groups_by_weight(obj=mesh_obj, threshold=opt_vtx_grps[1])
+
+                # Collect image(s) to resize (all Mesh Objects' images are resized together below).
                 if opt_img_size[0] != 1.0:
-
-                    images = io_resize_images_for_object(
-                        obj=mesh_obj,
-                        scale_factor=opt_img_size[0],
-                        minimum_dimensions=opt_img_size[1]
-                    )
-
-                    for img in images:
-                        # TODO breaks for some textures for some reason. See EDSN Game Engine Character export
-                        # Factor in Image names that have file suffixes before renaming.
-                        img_file_path = pathlib.Path(img.name)
-                        img_file_name = f'{img_file_path.stem}_{img.size[0]}x{img.size[1]}{img_file_path.suffix}'
-
-                        # Rename the Node if the Node's name doesn't already end with the given suffix.
-                        img.name = img_file_name if img.name != img_file_name else img.name
+                    opt_images.extend(io_get_images_for_object(obj=mesh_obj))
 
                 # Copy each Mesh Object in the Layer Collection.
                 if opt_num_objs[0]:
@@ -564,6 +749,17 @@ class IOExporter(object):
                     col.objects.unlink(mesh_obj)
                     self.layer_collections[lyr_col_name]['mesh_objs'].remove(mesh_obj)
 
+            # Resize image(s) outside of Blender in worker processes, writing "<name>_<width>x<height>" files
+            # to the export directory, then rename the image(s) to match (see bpy_mtl.mtl_resize_images()).
+            if opt_images:
+                bpy_mtl.mtl_resize_images(
+                    opt_images,
+                    scale_factor=opt_img_size[0],
+                    minimum_dimensions=opt_img_size[1],
+                    dir_path=self.export_dir_path.joinpath('textures'),
+                    rename=True,
+                )
+
             #
             if copied_objs:
 
@@ -620,6 +816,17 @@ class IOExporter(object):
                     if len(child_objs) < 1:
                         col.objects.unlink(null_obj)
 
+    def restore(self) -> None:
+        """
+        Restores the Layer Collections snapshot by the constructor (if any) to their state before the export
+        (see bpy_io.IOSnapshot). References to their Objects are no longer valid afterwards.
+        The scene index is invalidated, as the export edits the scene (see bpy_scn.ScnSceneIndex).
+        """
+        if self.snapshot is not None:
+            self.snapshot.restore()
+            self.snapshot = None
+        bpy_scn.scn_get_scene_index().invalidate()
+
     def set_vrm_metadata(self, armature: bpy.types.Armature, metadata: dict, **kwargs):
         """TODO"""
         vrm_meta = py_util.util_get_attr_recur(armature, 'vrm_addon_extension.vrm0.meta')
@@ -632,6 +839,56 @@ class IOExporter(object):
             for k, v in _metadata.items():
                 py_util.util_set_attr_recur(vrm_meta, k, v)
 
+
+def io_export_layer_collection(
+    lyr_col_name: str,
+    export_dir_path: typing.Union[pathlib.Path, str],
+    export_file_suffix: str,
+    export_file_prefix: str = '',
+    copy_imgs: bool = False,
+    current_pose: bool = False,
+    vrm_meta: dict = {},
+    export_settings: dict = {},
+) -> pathlib.Path:
+    """
+    Exports one child Layer Collection of the current file
+    (run by the headless Blender processes of a parallel export, see IOExporter.export()).
+
+    :param lyr_col_name: Name of the Layer Collection to export.
+    :param export_dir_path: The export directory.
+    :param export_file_suffix: File suffix of the export format (see IO_CONFIG_DATA).
+    :param export_file_prefix: Prefix of the exported file name.
+    :param copy_imgs: If True, save the Materials' image textures into the export directory.
+    :param current_pose: If True, export using the current pose; if False, the rest pose.
+    :param vrm_meta: VRM metadata to set on the Armature of the Layer Collection
+        (the thumbnail texture is given by Image name).
+    :param export_settings: Keyword arguments for the export operator.
+    :returns: The exported file path.
+    """
+    lyr_col = next(
+        lyr_col for lyr_col in bpy_scn.scn_get_scene_index().get_view_layer_collections(bpy.context.view_layer)
+        if lyr_col.name == lyr_col_name
+    )
+    exporter = IOExporter(
+        root_export_dir_path=pathlib.Path(export_dir_path).parent,
+        lyr_cols=[lyr_col],
+        export_dir_path=export_dir_path,
+    )
+
+    vrm_meta = dict(vrm_meta)
+    if isinstance(vrm_meta.get('texture'), str):
+        vrm_meta['texture'] = bpy.data.images.get(vrm_meta['texture'])
+
+    return exporter.export_layer_collection(
+        lyr_col_name,
+        export_file_suffix=export_file_suffix,
+        export_file_prefix=export_file_prefix,
+        copy_imgs=copy_imgs,
+        current_pose=current_pose,
+        vrm_meta=vrm_meta,
+        **export_settings
+    )
+
 #
 EXPORT_ARGS_OPTIONS = {
 
@@ -1189,8 +1446,14 @@ def io_export(
     export_platform_subtype: str,
     project_code: str,
     project_name: str,
+    parallel: bool = False,
+    isolate: bool = True,
 ):
-    """Temp placeholder function"""
+    """
+    Temp placeholder function (see IOExporter.export() for the parallel mode).
+    If isolate is True, the exported Layer Collections are restored after the export (see bpy_io.IOSnapshot);
+    otherwise, the user is prompted to reopen the original file.
+    """
     os.system('cls')
 
     current_file_path = bpy_io.io_get_current_file_path()
@@ -1207,47 +1470,56 @@ def io_export(
 
     export_args = EXPORT_ARGS_OPTIONS[project_code][export_platform_name]
 
-    if not export_args['lyr_cols']:
-        for lyr_col in bpy_scn.scn_get_view_layer_collections(bpy.context.view_layer):
-            if not lyr_col.exclude:
-                export_args['lyr_cols'].append(lyr_col)
+    # Layer Collections are not stored in EXPORT_ARGS_OPTIONS (they are replaced when the export is restored).
+    lyr_cols = export_args['lyr_cols'] or [
+        lyr_col for lyr_col in bpy_scn.scn_get_scene_index().get_view_layer_collections(bpy.context.view_layer)
+        if not lyr_col.exclude
+    ]
 
     #
     b3d_exporter = IOExporter(
         root_export_dir_path=root_export_dir,
-        lyr_cols=export_args['lyr_cols'],
+        lyr_cols=lyr_cols,
+        snapshot=isolate,
     )
+    try:
+        #
+        b3d_exporter.apply_modifiers(
+            mdfr_types=export_args['mdfr_types'],
+            keep_shp_keys=export_args['shp_keys'],
+            remove_unapplied=True,
+        )
 
-    #
-    b3d_exporter.apply_modifiers(
-        mdfr_types=export_args['mdfr_types'],
-        keep_shp_keys=export_args['shp_keys'],
-        remove_unapplied=True,
-    )
+        #
+        b3d_exporter.adjust_materials(
+            mtl_swap_index_pairs=export_args['mtl_index_pairs'],
+            mtl_prop_overrides=export_args['mtl_props'],
+        )
 
-    #
-    b3d_exporter.adjust_materials(
-        mtl_swap_index_pairs=export_args['mtl_index_pairs'],
-        mtl_prop_overrides=export_args['mtl_props'],
-    )
+        #
+        b3d_exporter.optimize(
+            opt_img_size=export_args['opt_img_size'],
+            opt_mtl_slots=export_args['opt_mtl_slots'],
+            opt_num_objs=export_args['opt_num_objs'],
+            opt_vtx_grps=export_args['opt_vtx_grps']
+        )
 
-    #
-    b3d_exporter.optimize(
-        opt_img_size=export_args['opt_img_size'],
-        opt_mtl_slots=export_args['opt_mtl_slots'],
-        opt_num_objs=export_args['opt_num_objs'],
-        opt_vtx_grps=export_args['opt_vtx_grps']
-    )
+        #
+        b3d_exporter.export(
+            export_file_suffix=export_file_suffix,
+            export_file_prefix=export_file_prefix,
+            copy_imgs=export_args['copy_imgs'],
+            current_pose=export_args['current_pose'],
+            vrm_meta=export_args['vrm_meta'],
+            parallel=parallel,
+            **export_settings
+        )
 
-    #
-    b3d_exporter.export(
-        export_file_suffix=export_file_suffix,
-        export_file_prefix=export_file_prefix,
-        copy_imgs=export_args['copy_imgs'],
-        current_pose=export_args['current_pose'],
-        vrm_meta=export_args['vrm_meta'],
-        **export_settings
-    )
+    finally:
+        b3d_exporter.restore()
+
+    if isolate:
+        return
 
     # Prompt the user to reopen the original file used for the export, if desired.
     open_original_file = qt_ui.ui_message_box(
@@ -15,8 +15,8 @@ from PySide6 import QtCore, QtGui, QtWidgets
 import sqlalchemy
 
 from mas_blender.mas_bpy._bpy_core import bpy_io
-from mas_blender.mas_db import db_sql
-from mas_blender.mas_qt import qt_ui
+from mas_blender.mas_db import db_sql, db_sql_async
+from mas_blender.mas_qt import qt_os, qt_ui
 
 from mas_blender.mas_ops import OpsSessionData
 
@@ -56,6 +56,9 @@ class ProjDialogUI(qt_ui.UIDialogBase):
     def _set_up_ui(self) -> None:
         """"""
         # Create additional QObjects
+        self._async_loop = qt_os.OSAsyncLoop(parent=self)
+        self.finished.connect(self._async_loop.stop)
+
         self._ui.proj_create_btngrp = QtWidgets.QButtonGroup()
         self._ui.proj_create_btngrp.addButton(self._ui.proj_create_reset_pshbtn)
         self._ui.proj_create_btngrp.addButton(self._ui.proj_create_create_pshbtn)
@@ -110,7 +113,7 @@ class ProjDialogUI(qt_ui.UIDialogBase):
             project_name: str = '',
         ):
         """
-        Queries project data for the specified project,
+        Queries project data for the specified project (cached, see OpsSessionData.proj_get_project()),
         and sets the global variable: OpsSessionData.project.
 
         :param project_name: Name of the project to query.
@@ -123,23 +126,15 @@ class ProjDialogUI(qt_ui.UIDialogBase):
             pipeline={},
         )
 
-        if self.db_connect():
-
-            db_col_name = 'name'
-            db_projects = db_sql.db_query_basic(
-                OpsSessionData.db_engine,
-                db_sql.DBProject,
-                limit=1,
-                columns=(db_col_name,),
-                filters=((db_col_name, project_name),)
-            )
+        if self.db_connect(force_update=False):
+            db_proj = OpsSessionData.proj_get_project(project_name)
 
-            if db_projects:
+            if db_proj is not None:
                 db_project = db_sql.DBProject(
-                    code=db_projects[0].code,
-                    name=db_projects[0].name,
-                    path=pathlib.Path(db_projects[0].path).resolve().as_posix(),
-                    pipeline=db_projects[0].pipeline,
+                    code=db_proj.code,
+                    name=db_proj.name,
+                    path=pathlib.Path(db_proj.path).resolve().as_posix(),
+                    pipeline=db_proj.pipeline,
                 )
 
         OpsSessionData.project = db_project
@@ -154,13 +149,15 @@ class ProjDialogUI(qt_ui.UIDialogBase):
         Establishes a connection to the database.
 
         :param db_url: The DBMS-formatted database url.
+            If no url is given, the url of the current session Engine is used.
         :param force_reset: If True,
-            creates a new connection even if already connected (default: False).
+            gets the Engine for the url even if already connected (default: False).
+            Engines are cached per url, so the same Engine is reused across dialog launches.
         :param force_update: If True,
             reset the metadata/schema for the database before connecting (default: False).
         :returns: True if the attempt to connect was successful; otherwise, False.
         """
-        if OpsSessionData.db_engine is not None:
+        if OpsSessionData.db_engine is not None and not db_url:
             db_url = OpsSessionData.db_engine.url
 
         if force_reset or (OpsSessionData.db_engine is None):
@@ -434,8 +431,22 @@ class ProjDialogUI(qt_ui.UIDialogBase):
             self._ui.proj_db_del_rows_combox.addItem('', None)
 
             if db_cls is not None:
-                for db_row in db_sql.db_query_basic(OpsSessionData.db_engine, db_cls):
-                    self._ui.proj_db_del_rows_combox.addItem(db_row.name, db_row)
+                # Query the rows without blocking the UI, if an async driver is available.
+                async_engine = db_sql_async.db_get_engine(OpsSessionData.db_engine.url)
+                if async_engine is not None:
+                    self._async_loop.submit(
+                        db_sql_async.db_query_basic(async_engine, db_cls, columns=('name',)),
+                        callback=lambda db_rows: self.ui_set_proj_db_del_rows(db_cls, db_rows),
+                    )
+                else:
+                    self.ui_set_proj_db_del_rows(
+                        db_cls,
+                        db_sql.db_query_stream(
+                            OpsSessionData.db_engine,
+                            db_cls,
+                            columns=('name',),
+                        )
+                    )
 
         elif self.sender() == self._ui.proj_db_del_rows_combox:
             self._ui.proj_db_del_pshbtn.setEnabled(args[0] > 0)
@@ -445,6 +456,24 @@ class ProjDialogUI(qt_ui.UIDialogBase):
 
         self._ui.proj_db_del_grpbox.setEnabled(self.db_connect(force_update=False))
 
+    def ui_set_proj_db_del_rows(
+        self,
+        db_cls: sqlalchemy.Table,
+        db_rows: typing.Iterable[db_sql.DBObjectBase],
+    ) -> None:
+        """
+        Populates the rows to delete for the DB Model
+        (ignored if another DB Model was selected while the rows were queried).
+
+        :param db_cls: Table class of the rows.
+        :param db_rows: The queried rows.
+        """
+        if self._ui.proj_db_del_table_combox.currentData() is not db_cls:
+            return
+
+        for db_row in db_rows:
+            self._ui.proj_db_del_rows_combox.addItem(db_row.name, db_row)
+
     def ui_update_proj_db_connection(
         self,
         connected: bool,
@@ -501,8 +530,7 @@ class ProjDialogUI(qt_ui.UIDialogBase):
             current_proj_name = OpsSessionData.project.name
 
             if db_sql.db_test_connection(OpsSessionData.db_engine):
-                proj_entries = db_sql.db_query_basic(OpsSessionData.db_engine, db_sql.DBProject)
-                proj_names.extend((proj_entry.name for proj_entry in proj_entries))
+                proj_names.extend(OpsSessionData.proj_get_project_names())
 
             self._ui.proj_nav_combox.clear()
             self._ui.proj_nav_combox.addItems(proj_names)
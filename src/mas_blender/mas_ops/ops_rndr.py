@@ -5,14 +5,65 @@ MAS Blender - OPS - Render
 
 """
 
+import collections
+import contextlib
+import hashlib
+import json
+import math
+import os
 import pathlib
+import time
 import typing
 
 import bpy
+import numpy as np
 
-from mas_blender.mas_bpy._bpy_core import bpy_scn
+from mas_blender.mas_bpy._bpy_core import bpy_io, bpy_scn
+from mas_blender.mas_py import py_util
 from mas_blender.mas_qt import qt_os, qt_ui
 
+
+#: Suffix of the copy of the current file rendered by background Blender processes.
+RNDR_BLEND_COPY_SUFFIX = '_mas_render.blend'
+
+#: File name of the render manifest written next to distributed render output.
+RNDR_MANIFEST_FILE_NAME = 'render_manifest.json'
+
+#: File name of the frame index written to each render output directory (see RndrFrameIndex).
+RNDR_INDEX_FILE_NAME = 'render_index.json'
+
+#: Profilers registered in background Blender processes (see _rndr_get_profiler_python_expr()).
+RNDR_PROFILERS = []
+
+#: File name of the render profile log (see RndrProfiler) written next to render output.
+RNDR_PROFILE_FILE_NAME = 'render_profile.jsonl'
+
+#: Bytes every complete file of an image format ends with, used to detect partially written frames.
+RNDR_FILE_FORMAT_TRAILERS = {
+    'JPEG': b'\xff\xd9',
+    'PNG': b'IEND\xaeB`\x82',
+}
+
+#: Properties ignored by scene hashes (see rndr_get_scene_hash()), as they do not affect rendered frames.
+RNDR_HASH_IGNORED_PROPS = frozenset(('is_active', 'name', 'rna_type', 'select', 'show_expanded'))
+
+#: Properties of nodes ignored by scene hashes (they only affect how nodes are displayed in Blender).
+RNDR_HASH_IGNORED_NODE_PROPS = frozenset((
+    'color', 'dimensions', 'height', 'hide', 'label', 'location', 'parent', 'show_options', 'show_preview',
+    'show_texture', 'use_custom_color', 'width', 'width_hidden',
+))
+
+#: Object properties hashed by scene hashes (besides the parent, data and modifiers).
+RNDR_HASH_OBJECT_PROPS = (
+    'hide_render', 'location', 'rotation_mode', 'rotation_euler', 'rotation_quaternion', 'rotation_axis_angle',
+    'scale', 'delta_location', 'delta_rotation_euler', 'delta_rotation_quaternion', 'delta_scale',
+)
+
+#: Datablock types hashed by their properties in scene hashes (besides node trees and images).
+RNDR_HASH_PROPS_ID_TYPES = (
+    bpy.types.Camera, bpy.types.Light, bpy.types.Material, bpy.types.Texture, bpy.types.World,
+)
+
 # from mas_blender.mas_ops import OpsSessionData
 
 
@@ -140,6 +191,339 @@ from mas_blender.mas_qt import qt_os, qt_ui
 #         bpy.ops.scene.delete()
 
 
+class RndrProfiler(object):
+    """
+    Records render timing and memory use to a JSONL log (one JSON record per line)
+    through bpy.app.handlers:
+
+    - a "frame" record for each final render frame (render_pre/render_post,
+      with the last render_stats text),
+    - a "frame" record for each viewport (OpenGL) frame (frame_change_post,
+      while a "viewport" pass is profiled with profile_pass()),
+    - a "pass" record for each pass profiled with profile_pass(),
+    - a "cancel" record if a render is cancelled.
+
+    Each record has the job name, file, scene, camera, render engine, pass, frame,
+    wall time (seconds) and peak memory of the process so far (bytes).
+    Several processes can append to the same log; see rndr_profile_report() for a summary.
+
+    .. code-block:: python
+
+        with ops_rndr.RndrProfiler('C:/renders/render_profile.jsonl'):
+            bpy.ops.render.render(animation=True)
+
+    """
+
+    def __init__(
+        self,
+        log_path: typing.Union[pathlib.Path, str],
+        job_name: str = '',
+    ) -> None:
+        """
+        Constructor method.
+
+        :param log_path: Path to the JSONL log file (records are appended).
+        :param job_name: Name recorded with each record (i.e. a batch render job).
+        """
+        self.log_path = pathlib.Path(log_path)
+        self.job_name = job_name
+        self.pass_name = 'render'
+
+        self._frame = None
+        self._frame_count = 0
+        self._frame_time = None
+        self._render_stats = ''
+        self._handlers = {
+            'frame_change_post': self._on_frame_change_post,
+            'render_cancel': self._on_render_cancel,
+            'render_post': self._on_render_post,
+            'render_pre': self._on_render_pre,
+            'render_stats': self._on_render_stats,
+        }
+
+    def __enter__(self):
+        self.register()
+        return self
+
+    def __exit__(self, *args):
+        self.unregister()
+
+    def _on_frame_change_post(self, scn, *args):
+        """Records the previous viewport frame when the viewport pass moves to the next frame."""
+        if self.pass_name != 'viewport':
+            return
+        self._write_viewport_frame(scn)
+        self._frame = scn.frame_current
+        self._frame_time = time.perf_counter()
+
+    def _on_render_cancel(self, scn, *args):
+        """Records a cancelled render."""
+        self.write_record('cancel', scn)
+
+    def _on_render_post(self, scn, *args):
+        """Records a final render frame."""
+        if self._frame_time is None:
+            return
+        self.write_record(
+            'frame',
+            scn,
+            wall_time=time.perf_counter() - self._frame_time,
+            stats=self._render_stats,
+        )
+        self._frame_count += 1
+        self._frame_time = None
+
+    def _on_render_pre(self, scn, *args):
+        """Starts timing a final render frame."""
+        self._frame_time = time.perf_counter()
+        self._render_stats = ''
+
+    def _on_render_stats(self, stats, *args):
+        """Keeps the last render statistics of the current frame."""
+        self._render_stats = stats
+
+    def _write_viewport_frame(self, scn):
+        """Records the current viewport frame, if any."""
+        if self._frame is None or self._frame_time is None:
+            return
+        self.write_record(
+            'frame',
+            scn,
+            frame=self._frame,
+            wall_time=time.perf_counter() - self._frame_time,
+        )
+        self._frame_count += 1
+        self._frame = None
+        self._frame_time = None
+
+    @contextlib.contextmanager
+    def profile_pass(
+        self,
+        scn: bpy.types.Scene,
+        pass_name: str = 'render',
+    ) -> typing.Iterator['RndrProfiler']:
+        """
+        Records a "pass" record (total wall time and frame count) for the renders run in the context.
+        Frames of a "viewport" pass are recorded from frame changes.
+
+        :param scn: The scene being rendered.
+        :param pass_name: Name of the pass (i.e. "viewport" or "render").
+        """
+        self.pass_name = pass_name
+        self._frame = None
+        self._frame_count = 0
+        self._frame_time = None
+        pass_start_time = time.perf_counter()
+
+        try:
+            yield self
+
+        finally:
+            if pass_name == 'viewport':
+                self._write_viewport_frame(scn)
+            self.write_record(
+                'pass',
+                scn,
+                frame=None,
+                frame_count=self._frame_count,
+                wall_time=time.perf_counter() - pass_start_time,
+            )
+            self.pass_name = 'render'
+
+    def register(self) -> None:
+        """
+        Adds the profiler's handlers to bpy.app.handlers.
+        """
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        for handler_name, handler in self._handlers.items():
+            handlers = getattr(bpy.app.handlers, handler_name)
+            if handler not in handlers:
+                handlers.append(handler)
+
+    def unregister(self) -> None:
+        """
+        Removes the profiler's handlers from bpy.app.handlers.
+        """
+        for handler_name, handler in self._handlers.items():
+            handlers = getattr(bpy.app.handlers, handler_name)
+            if handler in handlers:
+                handlers.remove(handler)
+
+    def write_record(
+        self,
+        event: str,
+        scn: bpy.types.Scene,
+        **fields,
+    ) -> None:
+        """
+        Appends a record to the log.
+
+        :param event: The record type (i.e. "frame" or "pass").
+        :param scn: The scene being rendered.
+        :param fields: Additional (or overridden) record values.
+        """
+        record = {
+            'event': event,
+            'time': time.time(),
+            'job': self.job_name,
+            'file': bpy.data.filepath,
+            'scene': scn.name,
+            'camera': scn.camera.name if scn.camera else '',
+            'engine': scn.render.engine,
+            'pass': self.pass_name,
+            'frame': scn.frame_current,
+            'peak_memory': py_util.util_get_peak_memory(),
+        }
+        record.update(fields)
+
+        with open(self.log_path, 'a', encoding='utf-8') as writefile:
+            writefile.write(json.dumps(record) + '\n')
+
+
+class RndrFrameIndex(object):
+    """
+    Persistent index of the frames rendered to an output directory (RNDR_INDEX_FILE_NAME).
+    Each entry records the camera, frame, scene-state hash (see rndr_get_scene_hash()),
+    file format and file size of a frame file, so re-runs only render frames
+    that are missing, corrupt (empty, partially written or resized) or stale (scene changed).
+    Entries are added before a frame is rendered (with no size) and confirmed by update().
+    """
+
+    def __init__(
+        self,
+        dir_path: typing.Union[pathlib.Path, str],
+    ) -> None:
+        """
+        Constructor method.
+
+        :param dir_path: The render output directory.
+        """
+        self.dir_path = pathlib.Path(dir_path)
+        self.index_path = self.dir_path.joinpath(RNDR_INDEX_FILE_NAME)
+        self.entries = self._read()
+
+        self._changed_names = set()
+
+    def _read(self) -> dict:
+        """
+        :returns: The entries of the index file, keyed by frame file name.
+        """
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as readfile:
+                return json.load(readfile)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def get_file_size(
+        frame_path: typing.Union[pathlib.Path, str],
+        file_format: str = '',
+    ) -> typing.Union[int, None]:
+        """
+        Gets the size of a frame file, if it is complete.
+
+        :param frame_path: Path to the frame file.
+        :param file_format: Image format of the file (see RNDR_FILE_FORMAT_TRAILERS).
+        :returns: The file size, if the file exists, is not empty,
+            and ends with the trailer of its format; otherwise, None.
+        """
+        try:
+            file_size = os.path.getsize(frame_path)
+            file_trailer = RNDR_FILE_FORMAT_TRAILERS.get(file_format, b'')
+            if file_size and file_trailer:
+                with open(frame_path, 'rb') as readfile:
+                    readfile.seek(-len(file_trailer), os.SEEK_END)
+                    if readfile.read() != file_trailer:
+                        return None
+        except OSError:
+            return None
+
+        return file_size or None
+
+    def get_stale_frames(
+        self,
+        frame_paths: typing.Dict[int, str],
+        scene_hash: str,
+        file_format: str = '',
+    ) -> typing.List[int]:
+        """
+        Gets the frames that need to be rendered.
+
+        :param frame_paths: Frame file paths, keyed by frame.
+        :param scene_hash: The current scene-state hash.
+        :param file_format: Image format of the frame files.
+        :returns: The frames that are not in the index, were rendered from another scene state,
+            or whose file is missing or corrupt.
+        """
+        stale_frames = []
+        for frame, frame_path in frame_paths.items():
+            entry = self.entries.get(pathlib.Path(frame_path).name)
+            file_size = self.get_file_size(frame_path, file_format)
+            if entry is None \
+                or entry['scene_hash'] != scene_hash \
+                or file_size is None \
+                or entry['size'] not in (None, file_size):
+                stale_frames.append(frame)
+
+        return stale_frames
+
+    def save(self) -> None:
+        """
+        Writes the changed entries to the index file.
+        Entries written by other processes (e.g. render jobs of the same directory) are kept.
+        """
+        if not self._changed_names:
+            return
+
+        entries = self._read()
+        entries.update({name: self.entries[name] for name in self._changed_names})
+
+        self.dir_path.mkdir(parents=True, exist_ok=True)
+        index_temp_path = self.index_path.with_name(f'{self.index_path.name}.{os.getpid()}.tmp')
+        with open(index_temp_path, 'w', encoding='utf-8') as writefile:
+            json.dump(entries, writefile, indent=4, sort_keys=True)
+        os.replace(index_temp_path, self.index_path)
+
+        self.entries = entries
+        self._changed_names.clear()
+
+    def set_frames(
+        self,
+        frame_paths: typing.Dict[int, str],
+        camera_name: str,
+        scene_hash: str,
+        file_format: str = '',
+    ) -> None:
+        """
+        Adds (or resets) the entries of frames about to be rendered.
+
+        :param frame_paths: Frame file paths, keyed by frame.
+        :param camera_name: Name of the camera the frames are rendered from.
+        :param scene_hash: The current scene-state hash.
+        :param file_format: Image format of the frame files.
+        """
+        for frame, frame_path in frame_paths.items():
+            name = pathlib.Path(frame_path).name
+            self.entries[name] = {
+                'camera': camera_name,
+                'file_format': file_format,
+                'frame': frame,
+                'scene_hash': scene_hash,
+                'size': None,
+            }
+            self._changed_names.add(name)
+
+    def update(self) -> None:
+        """
+        Confirms the entries of rendered frames by recording their file size.
+        """
+        for name, entry in self.entries.items():
+            if entry['size'] is None:
+                entry['size'] = self.get_file_size(self.dir_path.joinpath(name), entry['file_format'])
+                if entry['size'] is not None:
+                    self._changed_names.add(name)
+
+
 def rndr_render_cameras(
     camera_objs: typing.Iterable[bpy.types.Object],
     fps: typing.Union[float, int, None] = None,
@@ -148,16 +532,56 @@ def rndr_render_cameras(
     frame_end: typing.Union[int, None] = None,
     frame_step: typing.Union[int, None] = None,
     opengl: bool = True,
-    render: bool = True
-) -> None:
+    render: bool = True,
+    distributed: bool = False,
+    chunk_size: typing.Union[int, None] = None,
+    worker_count: typing.Union[int, None] = None,
+    threads_per_worker: int = qt_os.OS_BLENDER_THREADS_PER_WORKER,
+    wait: bool = False,
+    skip_existing: bool = True,
+    profile: bool = True,
+) -> typing.Union[qt_os.OSBlenderPool, None]:
     """
-    TODO
-    cam_objs = [obj for obj in bpy.context.selected_objects if obj.type == 'CAMERA']
-    rndr_render_cameras(camera_objs=cam_objs)
+    Renders the animation of each camera to its own output files.
+    The frame range of each camera is taken from its keyframes, unless an override is given.
+    By default, frames already rendered from the current scene state are skipped
+    (see RndrFrameIndex).
+
+    In distributed mode, the render pass is not run in this session:
+    a copy of the current file is saved next to the output, each camera's frame range is split
+    into chunks of frames, and the chunks are rendered by a pool of headless Blender processes
+    (see qt_os.OSBlenderPool). The chunks and their output frames are listed in a manifest file
+    (RNDR_MANIFEST_FILE_NAME), which is checked for missing frames once all chunks are finished
+    (see rndr_verify_manifest()). The viewport (opengl) pass needs the UI and is still run here.
+
+    .. code-block:: python
+
+        cam_objs = [obj for obj in bpy.context.selected_objects if obj.type == 'CAMERA']
+        rndr_render_cameras(camera_objs=cam_objs, opengl=False, distributed=True)
+
+    :param camera_objs: The camera objects to render from.
+    :param fps: Frame rate override.
+    :param fps_base: Frame rate base override.
+    :param frame_start: Start frame override.
+    :param frame_end: End frame override.
+    :param frame_step: Frame step override.
+    :param opengl: If True, render the viewport of each camera.
+    :param render: If True, render each camera with the scene's render engine.
+    :param distributed: If True, render in background Blender processes.
+    :param chunk_size: Number of frames per background render job
+        (default: the frame range is split so every worker has a job).
+    :param worker_count: Number of background Blender processes run at the same time
+        (default: the number of CPU cores divided by threads_per_worker).
+    :param threads_per_worker: Number of render threads given to each background Blender process.
+    :param wait: If True, wait for the background render jobs to finish before returning.
+    :param skip_existing: If True, only render frames that are missing, corrupt or stale.
+    :param profile: If True, record render timing and memory use to RNDR_PROFILE_FILE_NAME
+        in the output directory (see RndrProfiler).
+    :returns: The render pool, in distributed mode.
     """
+    camera_objs = list(camera_objs)
 
     scn = bpy.context.scene
-    scn.render.use_file_extension = False
 
     #
     orig_fps = scn.render.fps
@@ -166,6 +590,10 @@ def rndr_render_cameras(
     orig_frame_end = scn.frame_end
     orig_frame_step = scn.frame_step
     orig_output_cam = scn.camera
+    orig_use_overwrite = scn.render.use_overwrite
+    orig_use_file_extension = scn.render.use_file_extension
+
+    scn.render.use_file_extension = False
 
     scn.frame_start = frame_start if isinstance(frame_start, (float, int)) else orig_frame_start
     scn.frame_end = frame_end if isinstance(frame_end, (float, int)) else orig_frame_end
@@ -178,80 +606,736 @@ def rndr_render_cameras(
     output_file_stem = orig_output_path.stem
     output_file_suffix = orig_output_path.suffix
 
-    #
-    screen_spaces = []
-    if opengl:
-        for area in bpy.context.screen.areas:
-            if area.type == 'VIEW_3D':
-                for space in area.spaces:
-                    if space.type == 'VIEW_3D':
-                        screen_spaces.append(space)
-    for space in screen_spaces:
-        space.shading.type = 'MATERIAL'
-
-    #Iterate and render from each camera
-    for cam_obj in camera_objs:
-
-        #Set active camera
-        scn.camera = cam_obj
-
-        #Switch to camera view for the active camera
-        for space in screen_spaces:
-            space.region_3d.view_perspective = 'CAMERA'
-
-        #Set the output filename from camera name
-        cam_output_filename = f'{output_file_stem}-{cam_obj.name}{output_file_suffix}'
-        cam_output_dir_path = output_dir_path.joinpath(pathlib.Path(bpy.data.filepath).stem)
-        cam_output_dir_path.mkdir(parents=True, exist_ok=True)
-
-        #Set start frame, end frame based on camera keyframes, if override is not given
-        cam_anim_data = cam_obj.animation_data
-        if cam_anim_data is not None:
-            fcrvs = cam_anim_data.action.fcurves if cam_anim_data.action else []
-            if not isinstance(frame_start, (float, int)):
-                scn.frame_start = int(min([fcrv.range()[0] for fcrv in fcrvs]))
-            if not isinstance(frame_end, (float, int)):
-                scn.frame_end = int(max([fcrv.range()[1] for fcrv in fcrvs]))
+    profile_log_path = output_dir_path.joinpath(
+        pathlib.Path(bpy.data.filepath).stem, RNDR_PROFILE_FILE_NAME
+    )
+    profiler = RndrProfiler(profile_log_path) if profile else None
+    profile_pass = profiler.profile_pass if profiler else lambda *args: contextlib.nullcontext()
+    if profiler:
+        profiler.register()
 
-        if opengl:
-            cam_output_path = cam_output_dir_path.joinpath('viewport', cam_output_filename)
-            scn.render.filepath = cam_output_path.as_posix()
-            bpy.ops.render.opengl(
-                animation=True,
-                render_keyed_only=False,
-                sequencer=False,
-                write_still=False,
-                view_context=True
+    try:
+        scene_hash = rndr_get_scene_hash(scn) if skip_existing else ''
+
+        # Background render jobs read a copy of the current file (including unsaved changes).
+        blender_pool = None
+        manifest_data = {}
+        if distributed and render:
+            blend_file_stem = pathlib.Path(bpy.data.filepath).stem or 'untitled'
+            manifest_dir_path = output_dir_path.joinpath(blend_file_stem)
+            manifest_dir_path.mkdir(parents=True, exist_ok=True)
+            blend_copy_path = manifest_dir_path.joinpath(f'{blend_file_stem}{RNDR_BLEND_COPY_SUFFIX}')
+            bpy_io.io_save_as(blend_copy_path, copy=True)
+
+            blender_pool = qt_os.OSBlenderPool(
+                blender_app_path=bpy.app.binary_path or None,
+                worker_count=worker_count,
+                threads_per_worker=threads_per_worker,
+                log_dir_path=manifest_dir_path.joinpath('logs'),
             )
+            chunk_count = math.ceil(blender_pool.worker_count / max(1, len(camera_objs)))
+            manifest_data = {
+                'blend_file': blend_copy_path.as_posix(),
+                'manifest_file': manifest_dir_path.joinpath(RNDR_MANIFEST_FILE_NAME).as_posix(),
+                'jobs': [],
+            }
+
+        #
+        screen_spaces = []
+        if opengl:
+            for area in bpy.context.screen.areas:
+                if area.type == 'VIEW_3D':
+                    for space in area.spaces:
+                        if space.type == 'VIEW_3D':
+                            screen_spaces.append(space)
+        for space in screen_spaces:
+            space.shading.type = 'MATERIAL'
+
+        #Iterate and render from each camera
+        for cam_obj in camera_objs:
+
+            #Set active camera
+            scn.camera = cam_obj
+
+            #Switch to camera view for the active camera
+            for space in screen_spaces:
+                space.region_3d.view_perspective = 'CAMERA'
+
+            #Set the output filename from camera name
+            cam_output_filename = f'{output_file_stem}-{cam_obj.name}{output_file_suffix}'
+            cam_output_dir_path = output_dir_path.joinpath(pathlib.Path(bpy.data.filepath).stem)
+            cam_output_dir_path.mkdir(parents=True, exist_ok=True)
+
+            #Set start frame, end frame based on camera keyframes, if override is not given
+            cam_anim_data = cam_obj.animation_data
+            if cam_anim_data is not None:
+                fcrvs = cam_anim_data.action.fcurves if cam_anim_data.action else []
+                if not isinstance(frame_start, (float, int)):
+                    scn.frame_start = int(min([fcrv.range()[0] for fcrv in fcrvs]))
+                if not isinstance(frame_end, (float, int)):
+                    scn.frame_end = int(max([fcrv.range()[1] for fcrv in fcrvs]))
+            cam_frame_start = scn.frame_start
+            cam_frame_end = scn.frame_end
+
+            if opengl:
+                cam_output_path = cam_output_dir_path.joinpath('viewport', cam_output_filename)
+                scn.render.filepath = cam_output_path.as_posix()
+                cam_frames = rndr_set_up_incremental(scn, cam_obj, scene_hash=scene_hash) \
+                    if skip_existing else [cam_frame_start, cam_frame_end]
+                if cam_frames:
+                    scn.frame_start, scn.frame_end = cam_frames[0], cam_frames[-1]
+                    with profile_pass(scn, 'viewport'):
+                        bpy.ops.render.opengl(
+                            animation=True,
+                            render_keyed_only=False,
+                            sequencer=False,
+                            write_still=False,
+                            view_context=True
+                        )
+                    if skip_existing:
+                        _rndr_update_frame_index(cam_output_path.parent)
+
+            if render:
+                subdir_name = bpy.context.scene.render.engine.split('_')[-1].lower()
+                cam_output_path = cam_output_dir_path.joinpath(subdir_name, cam_output_filename)
+                scn.render.filepath = cam_output_path.as_posix()
+                scn.frame_start, scn.frame_end = cam_frame_start, cam_frame_end
+                cam_frames = rndr_set_up_incremental(scn, cam_obj, scene_hash=scene_hash) \
+                    if skip_existing else list(range(scn.frame_start, scn.frame_end + 1, scn.frame_step))
+                if not cam_frames:
+                    continue
+
+                if blender_pool is not None:
+                    manifest_data['jobs'].extend(
+                        _rndr_submit_camera_chunks(
+                            blender_pool, blend_copy_path, scn, cam_obj, cam_frames, chunk_size, chunk_count,
+                            profile_log_path=profile_log_path if profile else None,
+                            skip_existing=skip_existing,
+                        )
+                    )
+                    continue
+
+                scn.frame_start, scn.frame_end = cam_frames[0], cam_frames[-1]
+                with profile_pass(scn, 'render'):
+                    bpy.ops.render.render(
+                        animation=True,
+                        write_still=False,
+                        use_viewport=True,
+                        # layer='',
+                        scene=scn.name
+                    )
+                if skip_existing:
+                    _rndr_update_frame_index(cam_output_path.parent)
+
+    finally:
+        # Reset (also when a render pass fails), and stop profiling.
+        scn.frame_start = orig_frame_start
+        scn.frame_end = orig_frame_end
+        scn.frame_step = orig_frame_step
+        scn.camera = orig_output_cam
+        scn.render.filepath = orig_output_path.as_posix()
+        scn.render.fps = orig_fps
+        scn.render.fps_base = orig_fps_base
+        scn.render.use_file_extension = orig_use_file_extension
+        scn.render.use_overwrite = orig_use_overwrite
+        if profiler:
+            profiler.unregister()
 
-        if render:
-            subdir_name = bpy.context.scene.render.engine.split('_')[-1].lower()
-            cam_output_path = cam_output_dir_path.joinpath(subdir_name, cam_output_filename)
-            scn.render.filepath = cam_output_path.as_posix()
-            bpy.ops.render.render(
-                animation=True,
-                write_still=False,
-                use_viewport=True,
-                # layer='',
-                scene=scn.name
+    if blender_pool is None:
+        return None
+
+    manifest_path = pathlib.Path(manifest_data['manifest_file'])
+    with open(manifest_path, 'w', encoding='utf-8') as writefile:
+        json.dump(manifest_data, writefile, indent=4)
+
+    def _verify_when_finished(job, blender_pool):
+        if job.state != 'RUNNING' and blender_pool.get_progress() == 1.0:
+            missing_frame_paths = rndr_verify_manifest(manifest_path)
+            print(
+                f'Camera render finished, {len(missing_frame_paths)} missing frame(s): {manifest_path}'
             )
 
-    # Reset
-    scn.frame_start = orig_frame_start
-    scn.frame_end = orig_frame_end
-    scn.camera = orig_output_cam
-    scn.render.filepath = orig_output_path.as_posix()
+    blender_pool.progress_callback = _verify_when_finished
+    blender_pool.start()
+    if wait:
+        blender_pool.wait()
+
+    return blender_pool
+
+
+def _rndr_submit_camera_chunks(
+    blender_pool: qt_os.OSBlenderPool,
+    blend_file: pathlib.Path,
+    scn: bpy.types.Scene,
+    cam_obj: bpy.types.Object,
+    frames: typing.Sequence[int],
+    chunk_size: typing.Union[int, None],
+    chunk_count: int,
+    profile_log_path: typing.Union[pathlib.Path, None] = None,
+    skip_existing: bool = True,
+) -> typing.List[dict]:
+    """
+    Splits the frames to render into chunks and submits a render job for each chunk,
+    rendering from the given camera to the scene's current output path.
+    If skip_existing is True, frames within a chunk's range that are not in the given frames
+    are expected to exist and are not rendered again (the jobs do not overwrite existing files);
+    otherwise, the jobs overwrite existing files.
+
+    :param blender_pool: The pool the render jobs are submitted to.
+    :param blend_file: The saved copy of the current file to render.
+    :param scn: The scene to render, with the camera's frame range and output path set.
+    :param cam_obj: The camera object to render from.
+    :param frames: The frames to render (in the scene's frame step).
+    :param chunk_size: Number of frames per job (default: split into chunk_count jobs).
+    :param chunk_count: Number of jobs, if no chunk_size is given.
+    :param profile_log_path: If given, the jobs record their render timing to this log.
+    :param skip_existing: If True, the jobs do not overwrite existing files.
+    :returns: The manifest data of each job.
+    """
+    if not frames:
+        return []
+    if chunk_size:
+        chunk_count = math.ceil(len(frames) / chunk_size)
+
+    # Override the camera, output path and frame rate of the saved copy before rendering.
+    python_expr = 'import bpy; scn = bpy.context.scene; ' \
+                  f'scn.camera = bpy.data.objects[{cam_obj.name!r}]; ' \
+                  f'scn.render.filepath = {scn.render.filepath!r}; ' \
+                  'scn.render.use_file_extension = False; ' \
+                  f'scn.render.use_overwrite = {not skip_existing!r}; ' \
+                  f'scn.render.fps = {scn.render.fps!r}; ' \
+                  f'scn.render.fps_base = {scn.render.fps_base!r}'
 
+    manifest_jobs = []
+    for chunk_start, chunk_end in qt_os.os_get_frame_chunks(0, len(frames) - 1, chunk_count):
+        chunk_frames = frames[chunk_start:chunk_end + 1]
+        # Name the job after the camera too, so cameras with the same frame range get their own log.
+        job = qt_os.OSBlenderJob(
+            blend_file=blend_file,
+            frame_start=chunk_frames[0],
+            frame_end=chunk_frames[-1],
+            frame_step=scn.frame_step,
+            name=f'{pathlib.Path(blend_file).stem}_{cam_obj.name}_{chunk_frames[0]}-{chunk_frames[-1]}',
+        )
+        job_python_expr = python_expr
+        if profile_log_path is not None:
+            job_python_expr += f'; {_rndr_get_profiler_python_expr(profile_log_path, job.name)}'
+        job.args = ['--python-expr', job_python_expr]
+        blender_pool.submit(job)
+        manifest_jobs.append({
+            'camera': cam_obj.name,
+            'frame_start': job.frame_start,
+            'frame_end': job.frame_end,
+            'frame_step': job.frame_step,
+            'log_file': job.log_path.as_posix() if job.log_path else '',
+            'frames': [scn.render.frame_path(frame=frame) for frame in chunk_frames],
+        })
 
-def rndr_batch_render() -> None:
+    return manifest_jobs
+
+
+def rndr_verify_manifest(
+    manifest_path: typing.Union[pathlib.Path, str],
+) -> typing.List[str]:
     """
-    Renders the selected Blender file(s) in a detached local process (not meant for production).
+    Checks that all output frames listed in a render manifest (see rndr_render_cameras()) exist.
+    The missing frames are written back to the manifest,
+    and the frame indexes of the output directories are updated (see RndrFrameIndex).
+
+    :param manifest_path: Path to the render manifest file.
+    :returns: The paths of the missing output frames.
     """
-    batch_render_dir_path = qt_ui.ui_get_directory(
-        caption='Select directory with files to batch render',
+    with open(manifest_path, 'r', encoding='utf-8') as readfile:
+        manifest_data = json.load(readfile)
+
+    missing_frame_paths = []
+    for manifest_job in manifest_data['jobs']:
+        manifest_job['missing_frames'] = [
+            frame_path for frame_path in manifest_job['frames']
+            if not pathlib.Path(frame_path).is_file()
+        ]
+        missing_frame_paths.extend(manifest_job['missing_frames'])
+
+    for frame_dir_path in {pathlib.Path(frame_path).parent
+                           for manifest_job in manifest_data['jobs']
+                           for frame_path in manifest_job['frames']}:
+        _rndr_update_frame_index(frame_dir_path)
+
+    with open(manifest_path, 'w', encoding='utf-8') as writefile:
+        json.dump(manifest_data, writefile, indent=4)
+
+    return missing_frame_paths
+
+
+def rndr_get_scene_hash(
+    scn: bpy.types.Scene,
+) -> str:
+    """
+    Gets a hash of the scene state that affects rendered frames: render settings,
+    collection and view layer render visibility, and the render visibility, transforms, parent,
+    constraints, modifier settings, base mesh vertices, shape keys, light or camera data and materials
+    of each object, the node trees (nodes, values and links, including node groups and Geometry Nodes groups)
+    of materials, lights, the world and modifiers, and the file stamps (size and modification time)
+    of their images. Animated properties are hashed by their F-Curves (of Actions, NLA strips and drivers)
+    instead of their current value, so the hash does not depend on the current frame.
+
+    :param scn: The scene.
+    :returns: The hexadecimal scene-state hash.
+    """
+    scn_hash = hashlib.sha1()
+    anim_paths = {}
+    hashed_ids = set()
+    id_prop_names = frozenset(prop.identifier for prop in bpy.types.ID.bl_rna.properties)
+    imgs = {}
+
+    def _get_val(val):
+        """Gets a value with a stable repr (datablocks by name, sequences as tuples, sets sorted)."""
+        if isinstance(val, bpy.types.ID):
+            return val.name
+        if isinstance(val, bpy.types.bpy_struct):
+            return val.bl_rna.identifier
+        if isinstance(val, (set, frozenset)):
+            return tuple(sorted(val))
+        if hasattr(val, '__len__') and not isinstance(val, str):
+            return tuple(_get_val(item) for item in val)
+        return val
+
+    def _hash_val(val):
+        """Hashes the repr of a value (see _get_val())."""
+        scn_hash.update(repr(_get_val(val)).encode())
+
+    def _is_animated(data, prop_name):
+        """Checks whether a property is animated (or driven), so its current value depends on the frame."""
+        paths = anim_paths.get(data.id_data.as_pointer())
+        if not paths:
+            return False
+        try:
+            return data.path_from_id(prop_name) in paths
+        except ValueError:
+            return False
+
+    def _hash_fcurves(fcrvs, paths):
+        """Hashes the data paths and keyframes of F-Curves, and records their data paths."""
+        for fcrv in fcrvs:
+            fcrv_cos = np.empty(len(fcrv.keyframe_points) * 2, dtype=np.float32)
+            fcrv.keyframe_points.foreach_get('co', fcrv_cos)
+            scn_hash.update(f'{fcrv.data_path}[{fcrv.array_index}]'.encode())
+            scn_hash.update(fcrv_cos.tobytes())
+            paths.add(fcrv.data_path)
+
+    def _hash_anim(id_data):
+        """Hashes the Action, NLA strip and driver F-Curves of a datablock."""
+        paths = anim_paths.setdefault(id_data.as_pointer(), set())
+        anim_data = getattr(id_data, 'animation_data', None)
+        if anim_data is None:
+            return
+
+        if anim_data.action is not None:
+            _hash_fcurves(anim_data.action.fcurves, paths)
+        for nla_track in anim_data.nla_tracks:
+            for nla_strip in nla_track.strips:
+                _hash_val((
+                    nla_track.name, nla_track.mute, nla_strip.name, nla_strip.mute, nla_strip.blend_type,
+                    nla_strip.frame_start, nla_strip.frame_end, nla_strip.action_frame_start,
+                    nla_strip.action_frame_end, nla_strip.scale, nla_strip.repeat, nla_strip.influence,
+                ))
+                if nla_strip.action is not None:
+                    _hash_fcurves(nla_strip.action.fcurves, paths)
+
+        for fcrv in anim_data.drivers:
+            _hash_val((fcrv.driver.type, fcrv.driver.expression, [
+                (drv_var.name, drv_var.type, [
+                    (drv_target.id, drv_target.data_path, drv_target.transform_type, drv_target.bone_target)
+                    for drv_target in drv_var.targets
+                ])
+                for drv_var in fcrv.driver.variables
+            ]))
+        _hash_fcurves(anim_data.drivers, paths)
+
+    def _hash_props(data):
+        """
+        Hashes the property values of a datablock or struct (other datablocks by name, besides node trees
+        and images, which are hashed too), skipping animated properties (see _hash_anim()).
+        """
+        if isinstance(data, bpy.types.ID):
+            ignored_props = id_prop_names
+        elif isinstance(data, bpy.types.Node):
+            ignored_props = RNDR_HASH_IGNORED_NODE_PROPS
+        else:
+            ignored_props = ()
+
+        props = []
+        for prop in data.bl_rna.properties:
+            if prop.identifier in ignored_props or prop.identifier in RNDR_HASH_IGNORED_PROPS \
+                or prop.type == 'COLLECTION' or _is_animated(data, prop.identifier):
+                continue
+            prop_val = getattr(data, prop.identifier, None)
+            if isinstance(prop_val, bpy.types.ID):
+                _hash_id(prop_val)
+            props.append((prop.identifier, prop_val))
+        _hash_val((data.bl_rna.identifier, props))
+
+    def _hash_node_tree(node_tree):
+        """Hashes the nodes, input values and links of a node tree (and its node groups)."""
+        for node in node_tree.nodes:
+            _hash_props(node)
+            _hash_val([
+                (node_input.identifier, getattr(node_input, 'default_value', None))
+                for node_input in node.inputs
+                if not _is_animated(node_input, 'default_value')
+            ])
+
+        _hash_val([
+            (lnk.from_node.name, lnk.from_socket.identifier, lnk.to_node.name, lnk.to_socket.identifier, lnk.is_muted)
+            for lnk in node_tree.links
+        ])
+
+    def _hash_id(id_data):
+        """Hashes a datablock (once): its animation, and its properties or node tree."""
+        if id_data.as_pointer() in hashed_ids:
+            return
+        hashed_ids.add(id_data.as_pointer())
+
+        if isinstance(id_data, bpy.types.Image):
+            imgs[id_data.name] = id_data
+        elif isinstance(id_data, bpy.types.NodeTree):
+            _hash_anim(id_data)
+            _hash_node_tree(id_data)
+        elif isinstance(id_data, RNDR_HASH_PROPS_ID_TYPES):
+            _hash_anim(id_data)
+            _hash_props(id_data)
+
+    render = scn.render
+    _hash_val((
+        render.engine,
+        render.resolution_x,
+        render.resolution_y,
+        render.resolution_percentage,
+        render.fps,
+        render.fps_base,
+        render.film_transparent,
+        render.image_settings.file_format,
+        render.image_settings.color_mode,
+        render.image_settings.color_depth,
+        scn.frame_step,
+        getattr(getattr(scn, 'cycles', None), 'samples', None),
+        getattr(getattr(scn, 'eevee', None), 'taa_render_samples', None),
+    ))
+
+    for view_layer in scn.view_layers:
+        lyr_cols = [view_layer.layer_collection]
+        lyr_col_vals = [view_layer.name, view_layer.use]
+        while lyr_cols:
+            lyr_col = lyr_cols.pop()
+            lyr_col_vals.append((lyr_col.name, lyr_col.exclude, lyr_col.holdout, lyr_col.indirect_only))
+            lyr_cols.extend(lyr_col.children)
+        _hash_val(lyr_col_vals)
+    _hash_val(sorted((col.name, col.hide_render) for col in scn.collection.children_recursive))
+
+    if scn.world is not None:
+        _hash_id(scn.world)
+
+    for obj in sorted(scn.objects, key=lambda obj: obj.name):
+        _hash_anim(obj)
+        _hash_val((
+            obj.name,
+            obj.type,
+            obj.parent.name if obj.parent else None,
+            obj.data.name if obj.data else None,
+            obj.matrix_parent_inverse,
+            [
+                (prop_name, getattr(obj, prop_name)) for prop_name in RNDR_HASH_OBJECT_PROPS
+                if not _is_animated(obj, prop_name)
+            ],
+        ))
+        for mdfr in obj.modifiers:
+            _hash_props(mdfr)
+            # I.e. the inputs of Geometry Nodes modifiers.
+            _hash_val([(k, mdfr[k]) for k in mdfr.keys() if not _is_animated(mdfr, f'["{k}"]')])
+        for cnst in obj.constraints:
+            _hash_props(cnst)
+
+        if obj.type == 'MESH':
+            vtx_cos = np.empty(len(obj.data.vertices) * 3, dtype=np.float32)
+            obj.data.vertices.foreach_get('co', vtx_cos)
+            scn_hash.update(vtx_cos.tobytes())
+            _hash_anim(obj.data)
+
+            shape_keys = obj.data.shape_keys
+            if shape_keys is not None:
+                _hash_anim(shape_keys)
+                for shape_key in shape_keys.key_blocks:
+                    _hash_val((shape_key.name, shape_key.relative_key.name))
+                    _hash_props(shape_key)
+                    shape_key.data.foreach_get('co', vtx_cos)
+                    scn_hash.update(vtx_cos.tobytes())
+
+        elif obj.type == 'CAMERA':
+            _hash_id(obj.data)
+            _hash_props(obj.data.dof)
+
+        elif obj.type == 'LIGHT':
+            _hash_id(obj.data)
+
+        for mtl_slot in obj.material_slots:
+            if mtl_slot.material is not None:
+                _hash_id(mtl_slot.material)
+
+    for img_name in sorted(imgs):
+        img = imgs[img_name]
+        img_path = bpy.path.abspath(img.filepath, library=img.library) if img.source == 'FILE' else ''
+        img_stat = os.stat(img_path) if img_path and os.path.isfile(img_path) else None
+        _hash_val((
+            img_name,
+            img.filepath,
+            img.packed_file is not None,
+            (img_stat.st_size, img_stat.st_mtime_ns) if img_stat else None,
+        ))
+
+    return scn_hash.hexdigest()
+
+
+def rndr_set_up_incremental(
+    scn: bpy.types.Scene,
+    cam_obj: typing.Union[bpy.types.Object, None] = None,
+    frame_start: typing.Union[int, None] = None,
+    frame_end: typing.Union[int, None] = None,
+    scene_hash: str = '',
+) -> typing.List[int]:
+    """
+    Prepares the scene to only render frames that are missing, corrupt or stale
+    in its output directory (see RndrFrameIndex): the files of those frames are removed,
+    their index entries are reset to the current scene state,
+    and the scene is set not to overwrite existing files.
+    Can also be run in a background Blender process (i.e. with --python-expr) before rendering.
+
+    :param scn: The scene to render, with its output path set.
+    :param cam_obj: The camera to render from (default: the scene camera).
+    :param frame_start: First frame to render (default: the scene's start frame).
+    :param frame_end: Last frame to render (default: the scene's end frame).
+    :param scene_hash: The scene-state hash (default: rndr_get_scene_hash()).
+    :returns: The frames to render.
+    """
+    cam_obj = cam_obj or scn.camera
+    frame_start = scn.frame_start if frame_start is None else frame_start
+    frame_end = scn.frame_end if frame_end is None else frame_end
+    frame_paths = {
+        frame: scn.render.frame_path(frame=frame)
+        for frame in range(frame_start, frame_end + 1, scn.frame_step)
+    }
+    if not frame_paths:
+        return []
+
+    scene_hash = scene_hash or rndr_get_scene_hash(scn)
+    file_format = scn.render.image_settings.file_format
+    frame_index = RndrFrameIndex(pathlib.Path(frame_paths[frame_start]).parent)
+    stale_frames = frame_index.get_stale_frames(frame_paths, scene_hash, file_format)
+
+    for frame in stale_frames:
+        pathlib.Path(frame_paths[frame]).unlink(missing_ok=True)
+
+    frame_index.set_frames(
+        {frame: frame_paths[frame] for frame in stale_frames},
+        camera_name=cam_obj.name if cam_obj else '',
+        scene_hash=scene_hash,
+        file_format=file_format,
+    )
+    frame_index.save()
+    scn.render.use_overwrite = False
+
+    return stale_frames
+
+
+def _rndr_update_frame_index(
+    dir_path: typing.Union[pathlib.Path, str],
+) -> None:
+    """
+    Confirms the rendered frames in the frame index of an output directory.
+
+    :param dir_path: The render output directory.
+    """
+    frame_index = RndrFrameIndex(dir_path)
+    frame_index.update()
+    frame_index.save()
+
+
+def _rndr_get_profiler_python_expr(
+    log_path: pathlib.Path,
+    job_name: str,
+) -> str:
+    """
+    Gets the Python expression that registers a RndrProfiler in a background Blender process.
+
+    :param log_path: Path to the JSONL log file.
+    :param job_name: Name of the render job.
+    :returns: The expression for Blender's --python-expr argument.
+    """
+    return 'from mas_blender.mas_ops import ops_rndr; ' \
+           f'ops_rndr.RNDR_PROFILERS.append(ops_rndr.RndrProfiler({log_path.as_posix()!r}, {job_name!r})); ' \
+           'ops_rndr.RNDR_PROFILERS[-1].register()'
+
+
+def rndr_profile_report(
+    log_paths: typing.Iterable[typing.Union[pathlib.Path, str]] = (),
+    baseline_log_paths: typing.Iterable[typing.Union[pathlib.Path, str]] = (),
+) -> typing.List[dict]:
+    """
+    Summarizes render profile logs (see RndrProfiler) per file, camera and pass,
+    slowest first, and prints the summary.
+
+    :param log_paths: The JSONL log files to summarize.
+        If none are given, the user is prompted to select log files.
+    :param baseline_log_paths: Log files of an earlier run (i.e. the previous nightly batch)
+        to compare the mean frame time against.
+    :returns: The summary rows: file, camera, pass, frame count, total/mean/max frame time,
+        slowest frame, peak memory, pass time, and the change of mean frame time from the baseline.
+    """
+    log_paths = list(log_paths) or qt_ui.ui_get_file(
+        caption='Select render profile log(s)',
+        filter_str='JSON Lines (*.jsonl)',
+        select_multiple=True,
+    ) or []
+
+    def _get_rows(paths):
+        rows = collections.OrderedDict()
+        for log_path in paths:
+            with open(log_path, 'r', encoding='utf-8') as readfile:
+                for line in readfile:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    row_key = (record['file'], record['camera'], record['pass'])
+                    row = rows.setdefault(row_key, {
+                        'file': record['file'],
+                        'camera': record['camera'],
+                        'pass': record['pass'],
+                        'frames': 0,
+                        'total_time': 0.0,
+                        'max_time': 0.0,
+                        'max_frame': None,
+                        'peak_memory': 0,
+                        'pass_time': 0.0,
+                    })
+                    row['peak_memory'] = max(row['peak_memory'], record.get('peak_memory') or 0)
+                    if record['event'] == 'pass':
+                        row['pass_time'] += record['wall_time']
+                    elif record['event'] == 'frame':
+                        row['frames'] += 1
+                        row['total_time'] += record['wall_time']
+                        if record['wall_time'] >= row['max_time']:
+                            row['max_time'] = record['wall_time']
+                            row['max_frame'] = record['frame']
+        for row in rows.values():
+            row['mean_time'] = row['total_time'] / row['frames'] if row['frames'] else 0.0
+        return rows
+
+    rows = _get_rows(log_paths)
+    baseline_rows = _get_rows(baseline_log_paths)
+    for row_key, row in rows.items():
+        baseline_row = baseline_rows.get(row_key)
+        row['mean_time_change'] = row['mean_time'] / baseline_row['mean_time'] - 1.0 \
+            if baseline_row and baseline_row['mean_time'] else None
+
+    report_rows = sorted(rows.values(), key=lambda row: row['total_time'], reverse=True)
+
+    for row in report_rows:
+        row_change = f' ({row["mean_time_change"]:+.0%} vs baseline)' \
+            if row['mean_time_change'] is not None else ''
+        print(
+            f'{pathlib.Path(row["file"]).name} | {row["camera"]} | {row["pass"]}: '
+            f'{row["frames"]} frame(s), {row["total_time"]:.1f}s total, '
+            f'{row["mean_time"]:.2f}s mean{row_change}, '
+            f'{row["max_time"]:.2f}s max (frame {row["max_frame"]}), '
+            f'{row["peak_memory"] / 1024 ** 2:.0f} MB peak'
+        )
+
+    return report_rows
+
+
+def rndr_batch_render(
+    blend_files: typing.Iterable[typing.Union[pathlib.Path, str]] = (),
+    worker_count: int = None,
+    threads_per_worker: int = qt_os.OS_BLENDER_THREADS_PER_WORKER,
+    log_dir_path: typing.Union[pathlib.Path, str] = None,
+    wait: bool = False,
+    skip_existing: bool = True,
+    profile: bool = True,
+) -> typing.Union[qt_os.OSBlenderPool, None]:
+    """
+    Renders Blender file(s) in a pool of headless local Blender processes (see qt_os.OSBlenderPool).
+    Each file is one job; if there are fewer files than workers,
+    the frame range of each file is split into chunks so every worker has a job.
+    By default, each job runs rndr_set_up_incremental() before rendering,
+    so frames already rendered from the current state of the file are skipped.
+
+    :param blend_files: Blender scene files (.blend) to render.
+        If none are given, the user is prompted for a directory with files to render.
+    :param worker_count: Number of Blender processes run at the same time
+        (default: the number of CPU cores divided by threads_per_worker).
+    :param threads_per_worker: Number of render threads given to each Blender process.
+    :param log_dir_path: Directory for the job log files (default: a "logs" folder next to the files).
+    :param wait: If True, wait for all jobs to finish before returning.
+    :param skip_existing: If True, only render frames that are missing, corrupt or stale.
+    :param profile: If True, record the render timing and memory use of all jobs
+        to RNDR_PROFILE_FILE_NAME in the log directory (see RndrProfiler).
+    :returns: The render pool, if any files are rendered.
+    """
+    blend_file_paths = [pathlib.Path(blend_file) for blend_file in blend_files]
+    if not blend_file_paths:
+        batch_render_dir_path = qt_ui.ui_get_directory(
+            caption='Select directory with files to batch render',
+        )
+        if batch_render_dir_path is None or not batch_render_dir_path.is_dir():
+            return None
+        blend_file_paths = sorted(batch_render_dir_path.glob('*.blend'))
+
+    if not blend_file_paths:
+        return None
+
+    def _log_progress(job, blender_pool):
+        if job.state != 'RUNNING' or job.frames_done:
+            logger_msg = f'Batch render {blender_pool.get_progress():.0%} | {job.name}: {job.state}' \
+                         + (f' ({job.frames_done} frame(s))' if job.frames_done else '')
+            print(logger_msg)
+
+    blender_pool = qt_os.OSBlenderPool(
+        blender_app_path=bpy.app.binary_path or None,
+        worker_count=worker_count,
+        threads_per_worker=threads_per_worker,
+        log_dir_path=log_dir_path or blend_file_paths[0].parent.joinpath('logs'),
+        progress_callback=_log_progress,
     )
-    if batch_render_dir_path.is_dir():
-        batch_render_file_paths = [f.as_posix() for f in batch_render_dir_path.glob('*.blend')]
 
-        ui_blender_process = qt_os.OSBlenderProcess(blend_files=batch_render_file_paths)
-        ui_blender_process.startDetached()
+    # Split frame ranges only when there are fewer files than workers
+    # (reading a file's frame range costs a Blender start-up).
+    chunk_count = math.ceil(blender_pool.worker_count / len(blend_file_paths))
+    for blend_file_path in blend_file_paths:
+        frame_range = qt_os.os_get_blend_frame_range(blend_file_path, blender_pool.blender_app_path) \
+            if chunk_count > 1 else None
+
+        frame_start, frame_end, frame_step = frame_range if frame_range is not None else (None, None, None)
+        frame_chunks = qt_os.os_get_frame_chunks(frame_start, frame_end, chunk_count, frame_step=frame_step) \
+            if frame_range is not None else [(None, None)]
+        for chunk_start, chunk_end in frame_chunks:
+            job = qt_os.OSBlenderJob(blend_file_path, chunk_start, chunk_end, frame_step=frame_step)
+            job_python_exprs = []
+            if skip_existing:
+                job_python_exprs.append(
+                    'import bpy; from mas_blender.mas_ops import ops_rndr; '
+                    'ops_rndr.rndr_set_up_incremental('
+                    f'bpy.context.scene, frame_start={chunk_start}, frame_end={chunk_end})'
+                )
+            if profile:
+                job_python_exprs.append(_rndr_get_profiler_python_expr(
+                    blender_pool.log_dir_path.joinpath(RNDR_PROFILE_FILE_NAME), job.name
+                ))
+            if job_python_exprs:
+                job.args = ['--python-expr', '; '.join(job_python_exprs)]
+            blender_pool.submit(job)
+
+    blender_pool.start()
+    if wait:
+        blender_pool.wait()
+
+    return blender_pool
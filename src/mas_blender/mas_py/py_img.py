@@ -0,0 +1,697 @@
+#!$BLENDER_PATH/python/bin python
+
+"""
+MAS Blender - PY - Image
+
+Image file processing without bpy, so it can run in worker processes outside of Blender.
+Image files are read and written with OpenImageIO where available (most formats Blender supports),
+otherwise with Pillow.
+Resized files are kept in a content-addressed cache (see ImgCache),
+so unchanged textures are not resized again by later exports.
+
+.. code-block:: python
+
+    from mas_blender.mas_py import py_img
+
+    resized_data = py_img.img_resize_files(
+        ('C:/textures/body_diffuse.png', 'C:/textures/body_normal.png'),
+        scale_factor=0.5,
+        dir_path='C:/export/textures',
+        cache=py_img.img_get_cache(),
+    )
+
+"""
+
+import concurrent.futures
+import contextlib
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import pathlib
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import typing
+
+try:
+    import OpenImageIO as oiio
+except ImportError:
+    oiio = None
+
+try:
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
+
+
+#: Name format of resized images.
+IMG_RESIZED_NAME_FORMAT = '{stem}_{width}x{height}{suffix}'
+
+#: File name format of resized image files ("source" is a short hash of the source file path,
+#: so resized copies of same-named source files written to one directory do not collide).
+IMG_RESIZED_FILE_NAME_FORMAT = '{stem}_{width}x{height}_{source}{suffix}'
+
+#: Pattern of the dimensions suffix added to resized image (file) names.
+IMG_RESIZED_NAME_PATTERN = re.compile(r'_\d+x\d+$')
+
+#: Quality used when writing lossy (i.e. JPEG) image files.
+IMG_WRITE_QUALITY = 95
+
+#: Environment variable checked for the image cache directory (see ImgCache).
+IMG_CACHE_DIR_ENV = 'MAS_BLENDER_IMG_CACHE_DIR'
+
+#: Default maximum total size of the image cache, in bytes.
+IMG_CACHE_MAX_SIZE = 4 * 1024 ** 3
+
+#: Process-wide image cache created by img_get_cache().
+IMG_CACHE = None
+
+
+class ImgCache(object):
+    """
+    On-disk, content-addressed cache of processed (i.e. resized) image files.
+    Entries are keyed by the hash of the source file's contents, the target dimensions and format,
+    so they are reused across exports, Collections and files that share textures,
+    wherever the source file is. Source file hashes are memoized by path, size and modification time.
+    The total size of the cache is bounded by evicting the least recently used entries,
+    and hits, misses and evictions are counted (see get_stats()).
+    Several processes can share a cache directory.
+    """
+
+    def __init__(
+        self,
+        dir_path: typing.Union[pathlib.Path, str, None] = None,
+        max_size: int = IMG_CACHE_MAX_SIZE,
+    ) -> None:
+        """
+        Constructor method.
+
+        :param dir_path: The cache directory
+            (default: IMG_CACHE_DIR_ENV if set, otherwise "mas_blender/img_cache" in the temp directory).
+        :param max_size: Maximum total size of the cached files, in bytes.
+        """
+        self.dir_path = pathlib.Path(
+            dir_path
+            or os.environ.get(IMG_CACHE_DIR_ENV)
+            or pathlib.Path(tempfile.gettempdir(), 'mas_blender', 'img_cache')
+        )
+        self.max_size = max_size
+
+        self.evictions = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.RLock()
+        self._file_hashes = self._read_file_hashes()
+        self._changed_file_hashes = {}
+
+    @property
+    def file_hashes_path(self) -> pathlib.Path:
+        """
+        :returns: Path to the file of memoized source file hashes.
+        """
+        return self.dir_path.joinpath('file_hashes.json')
+
+    def _get_entry_path(
+        self,
+        key: str,
+    ) -> pathlib.Path:
+        """
+        :returns: Path to the cached file of an entry.
+        """
+        return self.dir_path.joinpath('objects', key[:2], key)
+
+    def _get_entry_paths(self) -> typing.List[os.DirEntry]:
+        """
+        :returns: The cached files.
+        """
+        entries = []
+        objects_dir_path = self.dir_path.joinpath('objects')
+        if not objects_dir_path.is_dir():
+            return entries
+
+        for sub_dir in os.scandir(objects_dir_path):
+            if sub_dir.is_dir():
+                entries.extend(entry for entry in os.scandir(sub_dir.path) if entry.is_file())
+
+        return entries
+
+    def _read_file_hashes(self) -> dict:
+        """
+        :returns: The memoized source file hashes: [size, modification time, hash], keyed by path.
+        """
+        try:
+            with open(self.file_hashes_path, 'r', encoding='utf-8') as readfile:
+                return json.load(readfile)
+        except (OSError, ValueError):
+            return {}
+
+    def evict(self) -> int:
+        """
+        Removes the least recently used cached files until the cache is within max_size.
+
+        :returns: Number of removed files.
+        """
+        with self._lock:
+            entries = []
+            for entry in self._get_entry_paths():
+                try:
+                    entry_stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((entry_stat.st_mtime, entry_stat.st_size, entry.path))
+
+            cache_size = sum(entry_size for _, entry_size, _ in entries)
+            evictions = 0
+            for _, entry_size, entry_path in sorted(entries):
+                if cache_size <= self.max_size:
+                    break
+                try:
+                    os.remove(entry_path)
+                except OSError:
+                    continue
+                cache_size -= entry_size
+                evictions += 1
+
+            self.evictions += evictions
+
+        return evictions
+
+    def get(
+        self,
+        key: str,
+    ) -> typing.Union[pathlib.Path, None]:
+        """
+        Gets a cached file (and marks it as recently used).
+
+        :param key: The entry key (see get_key()).
+        :returns: Path to the cached file, if it is in the cache.
+        """
+        entry_path = self._get_entry_path(key)
+        try:
+            os.utime(entry_path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+
+        return entry_path
+
+    def get_file_hash(
+        self,
+        file_path: typing.Union[pathlib.Path, str],
+    ) -> str:
+        """
+        Gets the hash of a file's contents, memoized by path, size and modification time.
+
+        :param file_path: Path to the file.
+        :returns: The hexadecimal SHA-256 hash.
+        :raises OSError: If the file cannot be read.
+        """
+        file_path = pathlib.Path(file_path).resolve()
+        file_stat = file_path.stat()
+        file_key = file_path.as_posix()
+
+        with self._lock:
+            file_hash_data = self._file_hashes.get(file_key)
+            if file_hash_data and file_hash_data[:2] == [file_stat.st_size, file_stat.st_mtime_ns]:
+                return file_hash_data[2]
+
+        file_hash = hashlib.sha256()
+        with open(file_path, 'rb') as readfile:
+            for file_chunk in iter(lambda: readfile.read(1024 ** 2), b''):
+                file_hash.update(file_chunk)
+
+        with self._lock:
+            file_hash_data = [file_stat.st_size, file_stat.st_mtime_ns, file_hash.hexdigest()]
+            self._file_hashes[file_key] = file_hash_data
+            self._changed_file_hashes[file_key] = file_hash_data
+
+        return file_hash_data[2]
+
+    def get_key(
+        self,
+        file_path: typing.Union[pathlib.Path, str],
+        dimensions: typing.Sequence[int],
+        suffix: str = '',
+    ) -> str:
+        """
+        Gets the entry key for a processed image file.
+
+        :param file_path: Path to the source image file.
+        :param dimensions: Width and height of the processed image.
+        :param suffix: File suffix (format) of the processed image (default: the source file's suffix).
+        :returns: The entry key (a hash, followed by the file suffix).
+        """
+        suffix = (suffix or pathlib.Path(file_path).suffix).lower()
+        key_data = f'{self.get_file_hash(file_path)}:{dimensions[0]}x{dimensions[1]}:{suffix}' \
+                   f':{IMG_WRITE_QUALITY}'
+
+        return f'{hashlib.sha256(key_data.encode()).hexdigest()}{suffix}'
+
+    def get_stats(self) -> dict:
+        """
+        :returns: The number of hits, misses and evictions (of this object),
+            and the number and total size (in bytes) of the cached files (of all processes).
+        """
+        entries = self._get_entry_paths()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(entries),
+            'size': sum(entry.stat().st_size for entry in entries),
+        }
+
+    def put(
+        self,
+        key: str,
+        file_path: typing.Union[pathlib.Path, str],
+    ) -> pathlib.Path:
+        """
+        Adds a file to the cache (as a hard link or copy).
+
+        :param key: The entry key (see get_key()).
+        :param file_path: Path to the processed file.
+        :returns: Path to the cached file.
+        """
+        entry_path = self._get_entry_path(key)
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        img_link_file(file_path, entry_path)
+
+        return entry_path
+
+    def save(self) -> None:
+        """
+        Writes the memoized source file hashes. Hashes written by other processes are kept.
+        """
+        with self._lock:
+            if not self._changed_file_hashes:
+                return
+
+            file_hashes = self._read_file_hashes()
+            file_hashes.update(self._changed_file_hashes)
+
+            self.dir_path.mkdir(parents=True, exist_ok=True)
+            temp_file_path = self.file_hashes_path.with_name(
+                f'{self.file_hashes_path.name}.{os.getpid()}.tmp'
+            )
+            with open(temp_file_path, 'w', encoding='utf-8') as writefile:
+                json.dump(file_hashes, writefile)
+            os.replace(temp_file_path, self.file_hashes_path)
+
+            self._file_hashes = file_hashes
+            self._changed_file_hashes.clear()
+
+
+@contextlib.contextmanager
+def _img_hide_main_module() -> typing.Iterator[None]:
+    """
+    Hides the file (and spec) of the __main__ module while worker processes are spawned,
+    so they do not run the main script again (i.e. a Blender Text block or a script that imports bpy,
+    which cannot be imported outside of Blender).
+    """
+    main_module = sys.modules.get('__main__')
+    main_attrs = {
+        attr_name: getattr(main_module, attr_name)
+        for attr_name in ('__file__', '__spec__')
+        if hasattr(main_module, attr_name)
+    }
+    if main_module is not None:
+        main_module.__dict__.pop('__file__', None)
+        main_module.__spec__ = None
+    try:
+        yield
+    finally:
+        if main_module is not None:
+            main_module.__dict__.update(main_attrs)
+
+
+def img_get_cache() -> ImgCache:
+    """
+    Gets the process-wide image cache (created on first use with the default settings).
+
+    :returns: The image cache.
+    """
+    global IMG_CACHE
+    if IMG_CACHE is None:
+        IMG_CACHE = ImgCache()
+
+    return IMG_CACHE
+
+
+def img_get_backend() -> str:
+    """
+    Gets the library used to read and write image files.
+
+    :returns: "oiio" (OpenImageIO), "pil" (Pillow), or an empty string if neither is available.
+    """
+    if oiio is not None:
+        return 'oiio'
+    if PILImage is not None:
+        return 'pil'
+    return ''
+
+
+def img_get_resize_dimensions(
+    size: typing.Sequence[int],
+    scale_factor: float = 1.0,
+    minimum_dimensions: typing.Sequence[int] = (0, 0),
+    maximum_dimensions: typing.Sequence[int] = (0, 0),
+) -> typing.Tuple[int, int]:
+    """
+    Gets the dimensions of an image after scaling.
+
+    :param size: Width and height of the image.
+    :param scale_factor: Factor to scale the width and height by.
+    :param minimum_dimensions: Minimum width and height after scaling.
+    :param maximum_dimensions: Maximum width and height after scaling (0 for no maximum).
+        Larger images are scaled down proportionally to fit.
+    :returns: The width and height after scaling.
+    """
+    width = max(int(size[0] * scale_factor), minimum_dimensions[0])
+    height = max(int(size[1] * scale_factor), minimum_dimensions[1])
+
+    fit_ratio = max(
+        width / maximum_dimensions[0] if maximum_dimensions[0] else 0.0,
+        height / maximum_dimensions[1] if maximum_dimensions[1] else 0.0,
+    )
+    if fit_ratio > 1.0:
+        width, height = max(1, int(width / fit_ratio)), max(1, int(height / fit_ratio))
+
+    return width, height
+
+
+def img_get_resized_name(
+    name: str,
+    dimensions: typing.Sequence[int],
+) -> str:
+    """
+    Gets the name of a resized image (file): "<name>_<width>x<height>",
+    replacing the dimensions suffix of a previously resized name.
+
+    :param name: The (file) name of the image, with or without suffix.
+    :param dimensions: Width and height of the resized image.
+    :returns: The resized image (file) name.
+    """
+    name_path = pathlib.PurePath(name)
+    return IMG_RESIZED_NAME_FORMAT.format(
+        stem=IMG_RESIZED_NAME_PATTERN.sub('', name_path.stem),
+        width=dimensions[0],
+        height=dimensions[1],
+        suffix=name_path.suffix,
+    )
+
+
+def img_get_resized_file_path(
+    file_path: typing.Union[pathlib.Path, str],
+    dimensions: typing.Sequence[int],
+    dir_path: typing.Union[pathlib.Path, str, None] = None,
+) -> pathlib.Path:
+    """
+    Gets the path of a resized copy of an image file: "<name>_<width>x<height>_<source>",
+    where source is a short hash of the (absolute) source file path.
+
+    :param file_path: Path to the source image file.
+    :param dimensions: Width and height of the resized image.
+    :param dir_path: Directory for the resized file (default: the source file's directory).
+    :returns: The resized file path.
+    """
+    file_path = pathlib.Path(file_path).absolute()
+    return pathlib.Path(dir_path or file_path.parent).joinpath(IMG_RESIZED_FILE_NAME_FORMAT.format(
+        stem=file_path.stem,
+        width=dimensions[0],
+        height=dimensions[1],
+        source=hashlib.sha1(file_path.as_posix().encode()).hexdigest()[:8],
+        suffix=file_path.suffix,
+    ))
+
+
+def img_get_size(
+    file_path: typing.Union[pathlib.Path, str],
+) -> typing.Tuple[int, int]:
+    """
+    Gets the dimensions of an image file (reading only the file header).
+
+    :param file_path: Path to the image file.
+    :returns: Width and height of the image.
+    :raises OSError: If the file cannot be read.
+    """
+    file_path = pathlib.Path(file_path)
+
+    if oiio is not None:
+        img_input = oiio.ImageInput.open(file_path.as_posix())
+        if img_input is None:
+            raise OSError(f'Cannot read image file: {file_path} ({oiio.geterror()}).')
+        img_spec = img_input.spec()
+        img_input.close()
+        return img_spec.width, img_spec.height
+
+    if PILImage is not None:
+        with PILImage.open(file_path) as pil_img:
+            return pil_img.size
+
+    raise OSError('No image library available (install OpenImageIO or Pillow).')
+
+
+def img_link_file(
+    src_file_path: typing.Union[pathlib.Path, str],
+    dst_file_path: typing.Union[pathlib.Path, str],
+) -> None:
+    """
+    Hard links (or, across volumes, copies) a file to another path, replacing any existing file.
+    The file is linked to a temporary path first, so other processes never read a partial file.
+
+    :param src_file_path: Path to the file.
+    :param dst_file_path: Path to link (or copy) the file to.
+    """
+    dst_file_path = pathlib.Path(dst_file_path)
+    temp_file_path = dst_file_path.with_name(f'{dst_file_path.name}.{os.getpid()}.tmp')
+    try:
+        os.link(src_file_path, temp_file_path)
+    except OSError:
+        shutil.copy2(src_file_path, temp_file_path)
+    os.replace(temp_file_path, dst_file_path)
+
+
+def img_resize_file(
+    file_path: typing.Union[pathlib.Path, str],
+    scale_factor: float = 1.0,
+    minimum_dimensions: typing.Sequence[int] = (0, 0),
+    maximum_dimensions: typing.Sequence[int] = (0, 0),
+    dir_path: typing.Union[pathlib.Path, str, None] = None,
+    overwrite: bool = False,
+) -> typing.Tuple[typing.Union[str, None], typing.Tuple[int, int]]:
+    """
+    Writes a resized copy of an image file, named "<name>_<width>x<height>_<source>"
+    (see img_get_resized_file_path()). Existing resized copies of the same source file
+    that are newer than it are reused, unless overwrite is True.
+
+    :param file_path: Path to the source image file.
+    :param scale_factor: Factor to scale the width and height by.
+    :param minimum_dimensions: Minimum width and height after scaling.
+    :param maximum_dimensions: Maximum width and height after scaling (0 for no maximum).
+    :param dir_path: Directory for the resized file (default: the source file's directory).
+    :param overwrite: If True, always write the resized file (default: False).
+    :returns: The path to the resized file (None if the dimensions are unchanged),
+        and the width and height of the (resized) image.
+    :raises OSError: If the file cannot be read or written.
+    """
+    file_path = pathlib.Path(file_path)
+    size = img_get_size(file_path)
+    dimensions = img_get_resize_dimensions(size, scale_factor, minimum_dimensions, maximum_dimensions)
+    if tuple(dimensions) == tuple(size):
+        return None, dimensions
+
+    resized_file_path = img_get_resized_file_path(file_path, dimensions, dir_path)
+    if not overwrite and resized_file_path.is_file() \
+        and resized_file_path.stat().st_mtime >= file_path.stat().st_mtime:
+        return resized_file_path.as_posix(), dimensions
+
+    resized_file_path.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file first, so other processes never read a partially written file.
+    temp_file_path = resized_file_path.with_name(
+        f'{resized_file_path.stem}.{os.getpid()}.tmp{resized_file_path.suffix}'
+    )
+
+    if oiio is not None:
+        src_buf = oiio.ImageBuf(file_path.as_posix())
+        roi = oiio.ROI(0, dimensions[0], 0, dimensions[1], 0, 1, 0, src_buf.nchannels)
+        dst_buf = oiio.ImageBufAlgo.resize(src_buf, roi=roi)
+        dst_buf.specmod().attribute('CompressionQuality', IMG_WRITE_QUALITY)
+        if not dst_buf.write(temp_file_path.as_posix()):
+            raise OSError(f'Cannot write image file: {resized_file_path} ({dst_buf.geterror()}).')
+
+    elif PILImage is not None:
+        with PILImage.open(file_path) as pil_img:
+            resized_pil_img = pil_img.resize(dimensions, PILImage.LANCZOS)
+            resized_pil_img.save(
+                temp_file_path,
+                format=pil_img.format,
+                quality=IMG_WRITE_QUALITY,
+            )
+
+    else:
+        raise OSError('No image library available (install OpenImageIO or Pillow).')
+
+    os.replace(temp_file_path, resized_file_path)
+
+    return resized_file_path.as_posix(), dimensions
+
+
+def img_resize_files(
+    file_paths: typing.Iterable[typing.Union[pathlib.Path, str]],
+    scale_factor: float = 1.0,
+    minimum_dimensions: typing.Sequence[int] = (0, 0),
+    maximum_dimensions: typing.Sequence[int] = (0, 0),
+    dir_path: typing.Union[pathlib.Path, str, None] = None,
+    max_workers: typing.Union[int, None] = None,
+    cache: typing.Union[ImgCache, None] = None,
+) -> typing.Dict[str, typing.Union[typing.Tuple[typing.Union[str, None], typing.Tuple[int, int]], None]]:
+    """
+    Resizes image files in a pool of worker processes (see img_resize_file()).
+    Worker processes are spawned (not forked), so they do not copy the memory of the calling process
+    (i.e. a Blender session). If the pool cannot run, the files are resized in this process.
+    If a cache is given, resized files found in the cache are linked to their path instead,
+    and the files this call resizes are added to the cache
+    (existing resized files in the directory are written again, as they are not known to match the key).
+
+    :param file_paths: Paths to the source image files.
+    :param scale_factor: Factor to scale the width and height by.
+    :param minimum_dimensions: Minimum width and height after scaling.
+    :param maximum_dimensions: Maximum width and height after scaling (0 for no maximum).
+    :param dir_path: Directory for the resized files (default: each source file's directory).
+    :param max_workers: Number of worker processes (default: the number of CPU cores).
+    :param cache: The image cache to use (see img_get_cache()).
+    :returns: The result of img_resize_file() for each source file path,
+        or None if the file could not be resized.
+    """
+    file_paths = list(dict.fromkeys(pathlib.Path(file_path).as_posix() for file_path in file_paths))
+    resized_data = {}
+    if not file_paths:
+        return resized_data
+
+    resize_args = (scale_factor, minimum_dimensions, maximum_dimensions, dir_path, cache is not None)
+
+    # Link cached files, and only resize the files that are not in the cache
+    # (files with the same contents are only resized once).
+    cache_keys = {}
+    cache_key_file_paths = {}
+    if cache is not None:
+        uncached_file_paths = []
+        for file_path in file_paths:
+            try:
+                size = img_get_size(file_path)
+                dimensions = img_get_resize_dimensions(size, *resize_args[:3])
+                if tuple(dimensions) == tuple(size):
+                    resized_data[file_path] = (None, dimensions)
+                    continue
+
+                cache_key = cache.get_key(file_path, dimensions)
+                cache_keys[file_path] = (cache_key, dimensions)
+                if cache_key in cache_key_file_paths:
+                    continue
+
+                cache_file_path = cache.get(cache_key)
+                if cache_file_path is not None:
+                    resized_data[file_path] = _img_link_resized_file(
+                        cache_file_path, file_path, dimensions, dir_path
+                    )
+                    continue
+
+            except OSError as ose:
+                logging.warning(f'Image resize failed for {file_path}: {ose!r}.')
+                resized_data[file_path] = None
+                continue
+
+            cache_key_file_paths[cache_key] = file_path
+            uncached_file_paths.append(file_path)
+
+        file_paths = uncached_file_paths
+
+    resized_data.update(_img_resize_files(file_paths, resize_args, max_workers))
+
+    if cache is not None:
+        for cache_key, file_path in cache_key_file_paths.items():
+            if resized_data[file_path] is not None and resized_data[file_path][0] is not None:
+                cache.put(cache_key, resized_data[file_path][0])
+
+        for file_path, (cache_key, dimensions) in cache_keys.items():
+            if file_path not in resized_data:
+                cache_file_path = cache.get(cache_key)
+                resized_data[file_path] = _img_link_resized_file(
+                    cache_file_path, file_path, dimensions, dir_path
+                ) if cache_file_path is not None else None
+
+        cache.evict()
+        cache.save()
+
+    return resized_data
+
+
+def _img_link_resized_file(
+    cache_file_path: pathlib.Path,
+    file_path: str,
+    dimensions: typing.Sequence[int],
+    dir_path: typing.Union[pathlib.Path, str, None] = None,
+) -> typing.Tuple[str, typing.Sequence[int]]:
+    """
+    Links a cached file to the resized file path of a source file (see img_resize_files()).
+    """
+    resized_file_path = img_get_resized_file_path(file_path, dimensions, dir_path)
+    resized_file_path.parent.mkdir(parents=True, exist_ok=True)
+    img_link_file(cache_file_path, resized_file_path)
+
+    return resized_file_path.as_posix(), dimensions
+
+
+def _img_resize_files(
+    file_paths: typing.Sequence[str],
+    resize_args: typing.Sequence,
+    max_workers: typing.Union[int, None] = None,
+) -> dict:
+    """
+    Runs img_resize_file() for each file in a pool of worker processes (see img_resize_files()).
+    """
+    resized_data = {}
+    if not file_paths:
+        return resized_data
+
+    def _get_result(file_path, future_or_func):
+        try:
+            return future_or_func()
+        except concurrent.futures.process.BrokenProcessPool:
+            return _get_result(file_path, lambda: img_resize_file(file_path, *resize_args))
+        except Exception as exc:  # pylint: disable=broad-except
+            logging.warning(f'Image resize failed for {file_path}: {exc!r}.')
+            return None
+
+    # A single file is not worth the start-up time of a worker process.
+    if len(file_paths) == 1 or max_workers == 1:
+        for file_path in file_paths:
+            resized_data[file_path] = _get_result(
+                file_path, lambda file_path=file_path: img_resize_file(file_path, *resize_args)
+            )
+        return resized_data
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=min(max_workers or os.cpu_count() or 1, len(file_paths)),
+        mp_context=multiprocessing.get_context('spawn'),
+    ) as executor:
+        # Worker processes are started as jobs are submitted.
+        with _img_hide_main_module():
+            futures = {
+                file_path: executor.submit(img_resize_file, file_path, *resize_args)
+                for file_path in file_paths
+            }
+        for file_path, future in futures.items():
+            resized_data[file_path] = _get_result(file_path, future.result)
+
+    return resized_data
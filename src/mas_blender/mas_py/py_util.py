@@ -5,9 +5,135 @@ MAS Blender - PY - UTIL
 
 """
 
+import collections
 import copy
 import functools
 import logging
+import sys
+import threading
+import time
+import typing
+
+
+class UtilLRUCache(object):
+    """
+    Size-bounded, in-memory cache with Least Recently Used eviction
+    and an optional time-to-live for each entry.
+    """
+    def __init__(
+        self,
+        max_size: int = 128,
+        ttl: float = 0.0,
+    ) -> None:
+        """
+        Constructor method.
+
+        :param max_size: Maximum number of entries kept in the cache (unbounded if 0 or less).
+        :param ttl: Seconds an entry remains valid after being set (no expiry if 0 or less).
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._entries = collections.OrderedDict()
+        self._lock = threading.RLock()
+
+    def __contains__(self, key: typing.Hashable) -> bool:
+        """"""
+        return self.get(key, self) is not self
+
+    def __len__(self) -> int:
+        """"""
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """
+        Removes all entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def get(
+        self,
+        key: typing.Hashable,
+        default: object = None,
+    ) -> object:
+        """
+        Gets the cached value for the key, and marks the entry as the most recently used.
+
+        :param key: Key of the entry.
+        :param default: Value returned if the key is not cached or has expired.
+        :returns: The cached value; otherwise, the default value.
+        """
+        with self._lock:
+            if key not in self._entries:
+                return default
+
+            val, expire_time = self._entries[key]
+            if expire_time and expire_time < time.monotonic():
+                del self._entries[key]
+                return default
+
+            self._entries.move_to_end(key)
+
+            return val
+
+    def get_or_set(
+        self,
+        key: typing.Hashable,
+        val_func: typing.Callable[[], object],
+    ) -> object:
+        """
+        Read-through access: gets the cached value for the key,
+        or sets the key to the result of val_func if the key is not cached (or has expired).
+
+        :param key: Key of the entry.
+        :param val_func: Callable (without arguments) returning the value to cache.
+        :returns: The cached value.
+        """
+        with self._lock:
+            val = self.get(key, self)
+            if val is self:
+                val = val_func()
+                self.set(key, val)
+
+            return val
+
+    def invalidate(
+        self,
+        key_filter: typing.Callable[[typing.Hashable], bool] = None,
+    ) -> None:
+        """
+        Removes entries from the cache.
+
+        :param key_filter: Callable returning True for the key(s) to remove.
+            If no filter is given, all entries are removed.
+        """
+        with self._lock:
+            if key_filter is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key_filter(key)]:
+                    del self._entries[key]
+
+    def set(
+        self,
+        key: typing.Hashable,
+        val: object,
+    ) -> None:
+        """
+        Sets the cached value for the key, evicting the least recently used entries if necessary.
+
+        :param key: Key of the entry.
+        :param val: Value to cache.
+        """
+        with self._lock:
+            expire_time = time.monotonic() + self.ttl if self.ttl > 0 else 0.0
+            self._entries[key] = (val, expire_time)
+            self._entries.move_to_end(key)
+
+            if self.max_size > 0:
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
 
 
 def util_copy(
@@ -32,6 +158,51 @@ def util_get_attr_recur(obj, attr, *args):
         return None
 
 
+def util_get_peak_memory() -> int:
+    """
+    Gets the peak resident set size (peak working set on Windows) of the current process.
+
+    :returns: The peak memory use, in bytes (0 if it cannot be read).
+    """
+    if sys.platform == 'win32':
+        import ctypes
+        import ctypes.wintypes
+
+        class _ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ('cb', ctypes.wintypes.DWORD),
+                ('PageFaultCount', ctypes.wintypes.DWORD),
+                ('PeakWorkingSetSize', ctypes.c_size_t),
+                ('WorkingSetSize', ctypes.c_size_t),
+                ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                ('PagefileUsage', ctypes.c_size_t),
+                ('PeakPagefileUsage', ctypes.c_size_t),
+            ]
+
+        counters = _ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        get_process_memory_info = ctypes.windll.psapi.GetProcessMemoryInfo
+        get_process_memory_info.argtypes = (
+            ctypes.wintypes.HANDLE, ctypes.POINTER(_ProcessMemoryCounters), ctypes.wintypes.DWORD
+        )
+        process_handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if not get_process_memory_info(process_handle, ctypes.byref(counters), counters.cb):
+            return 0
+        return counters.PeakWorkingSetSize
+
+    try:
+        import resource
+    except ImportError:
+        return 0
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux.
+    return peak_rss if sys.platform == 'darwin' else peak_rss * 1024
+
+
 def util_set_attr_recur(obj, attr, val):
     """"""
 
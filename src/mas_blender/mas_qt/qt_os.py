@@ -5,35 +5,532 @@ MAS Blender - QT - OS
 
 """
 
+import asyncio
+import concurrent.futures
+import logging
+import math
+import os
 import pathlib
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
 import typing
 
 from PySide6 import QtCore
 # from __feature__ import snake_case, true_property
 
 
+__LOGGER__ = logging.getLogger(__name__)
+__LOGGER__.addHandler(logging.StreamHandler(sys.stdout))
+__LOGGER__.setLevel(logging.INFO)
+
+#: Environment variable checked for the Blender application path (see os_get_blender_app_path()).
+OS_BLENDER_APP_PATH_ENV = 'MAS_BLENDER_APP_PATH'
+
+#: Number of times a crashed OSBlenderJob is queued again before it is marked as failed.
+OS_BLENDER_JOB_RETRIES = 2
+
+#: Default number of render threads (-t) given to each headless Blender worker of an OSBlenderPool.
+OS_BLENDER_THREADS_PER_WORKER = 4
+
+#: Prefix of the line printed by os_get_blend_frame_range() to read a file's frame range.
+OS_BLENDER_FRAME_RANGE_TAG = 'MAS_FRAME_RANGE'
+
+
+class OSAsyncLoop(QtCore.QObject):
+    """
+    Runs an asyncio event loop in a background thread,
+    so the Qt UI can await coroutines (i.e. db_sql_async queries) without blocking its event loop.
+    Results are passed to callbacks in the thread that owns this object (the Qt main thread).
+    """
+    # Emitted from the loop thread (queued to the owning thread): callback, errback, future.
+    _future_done = QtCore.Signal(object, object, object)
+
+    def __init__(
+        self,
+        parent: QtCore.QObject = None,
+    ) -> None:
+        """
+        Constructor method.
+
+        :param parent: Parent object (Application, UI Widget, etc.).
+        """
+        super().__init__(parent=parent)
+
+        self._future_done.connect(self._on_future_done, QtCore.Qt.QueuedConnection)
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop,
+            name=self.__class__.__name__,
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _on_future_done(
+        self,
+        callback: typing.Callable[[object], None],
+        errback: typing.Callable[[BaseException], None],
+        future: concurrent.futures.Future,
+    ) -> None:
+        """
+        Passes the result (or exception) of a finished coroutine to its callback (or errback).
+        """
+        if future.cancelled():
+            return
+
+        future_err = future.exception()
+        if future_err is not None:
+            if errback is not None:
+                errback(future_err)
+            else:
+                logger_msg = f'Async task error: {future_err!r}.'
+                __LOGGER__.warning(logger_msg)
+
+        elif callback is not None:
+            callback(future.result())
+
+    def _run_loop(self) -> None:
+        """
+        Runs the event loop until stop() is called (loop thread target).
+        """
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def is_running(self) -> bool:
+        """
+        :returns: True if the event loop thread is running; otherwise, False.
+        """
+        return self._thread.is_alive() and not self._loop.is_closed()
+
+    def stop(
+        self,
+        *args,
+        timeout: float = 5.0,
+    ) -> None:
+        """
+        Stops the event loop and waits for the loop thread to finish.
+        Pending tasks are cancelled.
+
+        :param timeout: Seconds to wait for the loop thread to finish.
+        """
+        if not self.is_running():
+            return
+
+        def _cancel_tasks():
+            for task in asyncio.all_tasks(self._loop):
+                task.cancel()
+            self._loop.stop()
+
+        self._loop.call_soon_threadsafe(_cancel_tasks)
+        self._thread.join(timeout)
+
+        if not self._thread.is_alive():
+            self._loop.close()
+
+    def submit(
+        self,
+        coro: typing.Coroutine,
+        callback: typing.Callable[[object], None] = None,
+        errback: typing.Callable[[BaseException], None] = None,
+    ) -> concurrent.futures.Future:
+        """
+        Schedules a coroutine on the event loop (returns immediately).
+
+        :param coro: The coroutine to run.
+        :param callback: Called with the result of the coroutine in the owning (Qt) thread.
+        :param errback: Called with the exception raised by the coroutine in the owning (Qt) thread
+            (errors are logged if no errback is given).
+        :returns: The Future for the result of the coroutine.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        future.add_done_callback(
+            lambda done_future: self._future_done.emit(callback, errback, done_future)
+        )
+
+        return future
+
+
+class OSBlenderJob(object):
+    """
+    A job for a headless Blender worker of an OSBlenderPool:
+    one Blender scene file (.blend) to render, optionally limited to a range of frames,
+    or to run a script on (e.g. an export) without rendering.
+    """
+    #: Job states, in order.
+    STATES = ('QUEUED', 'RUNNING', 'DONE', 'FAILED', 'CANCELLED')
+
+    def __init__(
+        self,
+        blend_file: typing.Union[pathlib.Path, str],
+        frame_start: int = None,
+        frame_end: int = None,
+        frame_step: int = None,
+        args: typing.Iterable[str] = (),
+        max_retries: int = OS_BLENDER_JOB_RETRIES,
+        name: str = None,
+        render: bool = True,
+    ) -> None:
+        """
+        Constructor method.
+
+        :param blend_file: Blender scene file (.blend) to render.
+        :param frame_start: First frame to render (default: the scene's start frame).
+        :param frame_end: Last frame to render (default: the scene's end frame).
+        :param frame_step: Number of frames to advance between rendered frames
+            (default: the scene's frame step).
+        :param args: Additional Blender command line arguments, inserted after the file.
+        :param max_retries: Number of times the job is queued again if Blender crashes.
+        :param name: Name of the job, also used for its log file (default: file stem and frame range).
+        :param render: If False, Blender only runs the additional arguments (e.g. --python-expr)
+            and does not render the animation.
+        """
+        self.blend_file = pathlib.Path(blend_file)
+        self.frame_start = frame_start
+        self.frame_end = frame_end
+        self.frame_step = frame_step
+        self.args = list(args)
+        self.max_retries = max_retries
+        self.render = render
+
+        self._name = name
+
+        self.attempts = 0
+        self.frames_done = 0
+        self.log_path = None
+        self.return_code = None
+        self.state = 'QUEUED'
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.name!r}, state={self.state!r})'
+
+    @property
+    def frame_count(self) -> typing.Union[int, None]:
+        """
+        :returns: Number of frames in the job's frame range, if both ends are given.
+        """
+        if self.frame_start is None or self.frame_end is None:
+            return None
+        return (self.frame_end - self.frame_start) // (self.frame_step or 1) + 1
+
+    @property
+    def name(self) -> str:
+        """
+        :returns: Name of the job (file stem and frame range), also used for its log file.
+        """
+        if self._name:
+            return self._name
+        if self.frame_start is None and self.frame_end is None:
+            return self.blend_file.stem
+        return f'{self.blend_file.stem}_{self.frame_start}-{self.frame_end}'
+
+    def get_args(
+        self,
+        threads: int = 0,
+    ) -> typing.List[str]:
+        """
+        Gets the Blender command line arguments for the job.
+
+        :param threads: Number of render threads for Blender (0 uses all cores).
+        :returns: The command line arguments (without the Blender application path).
+        """
+        args = ['-b', self.blend_file.as_posix(), '-t', str(threads)]
+        args.extend(self.args)
+        if not self.render:
+            return args
+
+        # Frame range arguments must come before -a.
+        if self.frame_start is not None:
+            args.extend(('-s', str(self.frame_start)))
+        if self.frame_end is not None:
+            args.extend(('-e', str(self.frame_end)))
+        if self.frame_step is not None:
+            args.extend(('-j', str(self.frame_step)))
+        args.append('-a')
+
+        return args
+
+
+class OSBlenderPool(object):
+    """
+    Local render scheduler: runs queued OSBlenderJobs in a pool of headless Blender workers
+    (one subprocess per worker, fed from a job queue by a worker thread).
+    Each job's output is written to its own log file; crashed jobs are queued again
+    (up to their max_retries), and progress is reported through a callback.
+
+    .. code-block:: python
+
+        blender_pool = qt_os.OSBlenderPool(log_dir_path='C:/renders/logs')
+        for blend_file in ('C:/renders/shot_010.blend', 'C:/renders/shot_020.blend'):
+            blender_pool.submit(qt_os.OSBlenderJob(blend_file))
+        blender_pool.start()
+        blender_pool.wait()
+
+    """
+
+    def __init__(
+        self,
+        blender_app_path: typing.Union[pathlib.Path, str] = None,
+        worker_count: int = None,
+        threads_per_worker: int = OS_BLENDER_THREADS_PER_WORKER,
+        log_dir_path: typing.Union[pathlib.Path, str] = None,
+        progress_callback: typing.Callable[['OSBlenderJob', 'OSBlenderPool'], None] = None,
+    ) -> None:
+        """
+        Constructor method.
+
+        :param blender_app_path: Path to the installed Blender application
+            (default: os_get_blender_app_path()).
+        :param worker_count: Number of Blender processes run at the same time
+            (default: the number of CPU cores divided by threads_per_worker).
+        :param threads_per_worker: Number of render threads given to each Blender process.
+        :param log_dir_path: Directory for the job log files (default: no log files).
+        :param progress_callback: Called with the job and the pool whenever a job changes state
+            or saves a frame. It is called from the worker threads.
+        """
+        self.blender_app_path = pathlib.Path(blender_app_path or os_get_blender_app_path())
+        self.threads_per_worker = max(1, threads_per_worker)
+        self.worker_count = worker_count or max(1, (os.cpu_count() or 1) // self.threads_per_worker)
+        self.log_dir_path = pathlib.Path(log_dir_path) if log_dir_path else None
+        self.progress_callback = progress_callback
+
+        self.jobs = []
+
+        self._cancel_event = threading.Event()
+        self._job_queue = queue.Queue()
+        self._lock = threading.RLock()
+        self._processes = set()
+        self._workers = []
+
+    def _run_job(
+        self,
+        job: OSBlenderJob,
+    ) -> None:
+        """
+        Runs one attempt of a job in a Blender subprocess and updates the job's state.
+        """
+        job.attempts += 1
+        job.frames_done = 0
+        self._set_job_state(job, 'RUNNING')
+
+        cmd = [self.blender_app_path.as_posix()] + job.get_args(self.threads_per_worker)
+        log_file = open(job.log_path, 'a', encoding='utf-8') if job.log_path else None
+        try:
+            if log_file:
+                log_file.write(f'# Attempt {job.attempts}: {subprocess.list2cmdline(cmd)}\n')
+
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors='replace',
+            )
+            with self._lock:
+                self._processes.add(process)
+
+            for line in process.stdout:
+                if log_file:
+                    log_file.write(line)
+                if line.startswith('Saved:'):
+                    job.frames_done += 1
+                    self._report(job)
+
+            job.return_code = process.wait()
+            with self._lock:
+                self._processes.discard(process)
+
+        except OSError as ose:
+            logger_msg = f'Blender process error: {ose}.'
+            __LOGGER__.warning(logger_msg)
+            job.return_code = -1
+            if log_file:
+                log_file.write(f'{logger_msg}\n')
+
+        finally:
+            if log_file:
+                log_file.close()
+
+        if self._cancel_event.is_set():
+            self._set_job_state(job, 'CANCELLED')
+
+        elif job.return_code == 0:
+            self._set_job_state(job, 'DONE')
+
+        elif job.attempts <= job.max_retries:
+            logger_msg = f'Blender crashed running {job.name} (exit code {job.return_code}), ' \
+                         f'retrying ({job.attempts}/{job.max_retries}).'
+            __LOGGER__.warning(logger_msg)
+            self._set_job_state(job, 'QUEUED')
+            self._job_queue.put(job)
+
+        else:
+            logger_msg = f'Blender failed running {job.name} (exit code {job.return_code}), ' \
+                         f'see log: {job.log_path}.'
+            __LOGGER__.warning(logger_msg)
+            self._set_job_state(job, 'FAILED')
+
+    def _run_worker(self) -> None:
+        """
+        Runs queued jobs until the queue is empty or the pool is cancelled (worker thread target).
+        """
+        while not self._cancel_event.is_set():
+            try:
+                job = self._job_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            try:
+                self._run_job(job)
+            finally:
+                self._job_queue.task_done()
+
+        # Jobs still queued after a cancel are never run.
+        while self._cancel_event.is_set():
+            try:
+                job = self._job_queue.get_nowait()
+            except queue.Empty:
+                break
+            self._set_job_state(job, 'CANCELLED')
+            self._job_queue.task_done()
+
+    def _report(
+        self,
+        job: OSBlenderJob,
+    ) -> None:
+        """
+        Passes a job's progress to the progress callback.
+        """
+        if self.progress_callback is not None:
+            try:
+                self.progress_callback(job, self)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger_msg = f'Render progress callback error: {exc!r}.'
+                __LOGGER__.warning(logger_msg)
+
+    def _set_job_state(
+        self,
+        job: OSBlenderJob,
+        state: str,
+    ) -> None:
+        """
+        Sets a job's state and reports it.
+        """
+        job.state = state
+        self._report(job)
+
+    def cancel(self) -> None:
+        """
+        Cancels the queued jobs and terminates the running Blender processes.
+        """
+        self._cancel_event.set()
+        with self._lock:
+            for process in self._processes:
+                process.terminate()
+
+    def get_progress(self) -> float:
+        """
+        :returns: Fraction (0.0 - 1.0) of the submitted jobs that are finished (done or failed).
+        """
+        with self._lock:
+            if not self.jobs:
+                return 0.0
+            jobs_finished = [job for job in self.jobs if job.state in ('DONE', 'FAILED', 'CANCELLED')]
+            return len(jobs_finished) / len(self.jobs)
+
+    def is_running(self) -> bool:
+        """
+        :returns: True if any worker thread is running; otherwise, False.
+        """
+        return any(worker.is_alive() for worker in self._workers)
+
+    def start(self) -> None:
+        """
+        Starts worker threads (up to worker_count) for the queued jobs (returns immediately).
+        """
+        with self._lock:
+            self._cancel_event.clear()
+            self._workers = [worker for worker in self._workers if worker.is_alive()]
+            for _ in range(min(self.worker_count - len(self._workers), self._job_queue.qsize())):
+                worker = threading.Thread(
+                    target=self._run_worker,
+                    name=f'{self.__class__.__name__}-{len(self._workers)}',
+                    daemon=True,
+                )
+                self._workers.append(worker)
+                worker.start()
+
+    def submit(
+        self,
+        job: OSBlenderJob,
+    ) -> OSBlenderJob:
+        """
+        Adds a job to the queue. If the pool is running, an idle worker is started for it.
+
+        :param job: The job to render.
+        :returns: The queued job.
+        """
+        if self.log_dir_path is not None:
+            self.log_dir_path.mkdir(parents=True, exist_ok=True)
+            job.log_path = self.log_dir_path.joinpath(f'{job.name}.log')
+
+        with self._lock:
+            job.state = 'QUEUED'
+            self.jobs.append(job)
+            self._job_queue.put(job)
+
+            if self._workers:
+                self.start()
+
+        return job
+
+    def wait(
+        self,
+        timeout: float = None,
+    ) -> bool:
+        """
+        Waits for the queued jobs to finish.
+
+        :param timeout: Seconds to wait (default: no time limit).
+        :returns: True if all jobs are finished; otherwise (on timeout), False.
+        """
+        end_time = time.monotonic() + timeout if timeout is not None else None
+        while self.is_running():
+            for worker in list(self._workers):
+                worker.join(None if end_time is None else max(0.0, end_time - time.monotonic()))
+            if end_time is not None and time.monotonic() >= end_time:
+                break
+
+        return not self.is_running()
+
+
 class OSBlenderProcess(QtCore.QProcess):
     """
-    System process for batch rendering with Blender locally.
+    System process for batch rendering with Blender locally (each file in sequence).
+    For parallel rendering, see OSBlenderPool.
     """
 
     def __init__(
         self,
-        blender_app_path = typing.Union[pathlib.Path, str],
+        blender_app_path: typing.Union[pathlib.Path, str] = None,
         blend_files: typing.Iterable[str] = (),
         parent: QtCore.QObject = None,
     ) -> None:
         """
         Constructor method
 
-        :param blender_app_path: Path to the installed Blender application.
+        :param blender_app_path: Path to the installed Blender application
+            (default: os_get_blender_app_path()).
         :param blend_files: Blender scene files (.blend) to render.
         :param parent: Parent application for the widget.
         """
         super().__init__(parent=parent)
 
         # Set app
-        self.setProgram(blender_app_path.as_posix())
+        self.setProgram(pathlib.Path(blender_app_path or os_get_blender_app_path()).as_posix())
 
         # Set arguments
         args = ['-b']
@@ -41,3 +538,86 @@ class OSBlenderProcess(QtCore.QProcess):
             args.append(blend_file)
             args.append('-a')
         self.setArguments(args)
+
+
+def os_get_blend_frame_range(
+    blend_file: typing.Union[pathlib.Path, str],
+    blender_app_path: typing.Union[pathlib.Path, str] = None,
+    timeout: float = 120.0,
+) -> typing.Union[typing.Tuple[int, int, int], None]:
+    """
+    Gets the frame range (and frame step) of a Blender scene file's active scene
+    by reading it in a headless Blender process.
+
+    :param blend_file: Blender scene file (.blend).
+    :param blender_app_path: Path to the installed Blender application
+        (default: os_get_blender_app_path()).
+    :param timeout: Seconds to wait for the Blender process.
+    :returns: The start frame, end frame and frame step, if the file could be read.
+    """
+    python_expr = 'import bpy; scn = bpy.context.scene; ' \
+                  f'print("{OS_BLENDER_FRAME_RANGE_TAG}", scn.frame_start, scn.frame_end, scn.frame_step)'
+    cmd = [
+        pathlib.Path(blender_app_path or os_get_blender_app_path()).as_posix(),
+        '-b', pathlib.Path(blend_file).as_posix(),
+        '--python-expr', python_expr,
+    ]
+    try:
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            errors='replace',
+            timeout=timeout,
+            check=False,
+        )
+    except (OSError, subprocess.TimeoutExpired) as ose:
+        logger_msg = f'Blender process error: {ose}.'
+        __LOGGER__.warning(logger_msg)
+        return None
+
+    for line in result.stdout.splitlines():
+        if line.startswith(OS_BLENDER_FRAME_RANGE_TAG):
+            _, frame_start, frame_end, frame_step = line.split()
+            return int(frame_start), int(frame_end), int(frame_step)
+
+    return None
+
+
+def os_get_blender_app_path() -> pathlib.Path:
+    """
+    Gets the path to the installed Blender application:
+    the OS_BLENDER_APP_PATH_ENV environment variable if set,
+    otherwise the first "blender" executable found on the PATH.
+
+    :returns: The Blender application path.
+    """
+    blender_app_path = os.environ.get(OS_BLENDER_APP_PATH_ENV) or shutil.which('blender') or 'blender'
+
+    return pathlib.Path(blender_app_path)
+
+
+def os_get_frame_chunks(
+    frame_start: int,
+    frame_end: int,
+    chunk_count: int,
+    frame_step: int = 1,
+) -> typing.List[typing.Tuple[int, int]]:
+    """
+    Splits a frame range into (up to) the given number of contiguous chunks of similar size.
+    Chunks start and end on frames of the range's frame step,
+    so each chunk renders the same frames as the whole range would (i.e. with -j frame_step).
+
+    :param frame_start: First frame of the range.
+    :param frame_end: Last frame of the range.
+    :param chunk_count: Number of chunks.
+    :param frame_step: Number of frames between rendered frames.
+    :returns: The start and end frames of each chunk.
+    """
+    frames = range(frame_start, frame_end + 1, max(1, frame_step))
+    chunk_size = max(1, math.ceil(len(frames) / max(1, chunk_count)))
+
+    return [
+        (frames[i], frames[min(i + chunk_size, len(frames)) - 1])
+        for i in range(0, len(frames), chunk_size)
+    ]
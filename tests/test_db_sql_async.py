@@ -0,0 +1,183 @@
+"""
+Tests for mas_blender.mas_db.db_sql_async, against a temp-file SQLite database.
+"""
+
+import asyncio
+
+import pytest
+
+from mas_blender.mas_db import db_sql, db_sql_async
+
+
+@pytest.fixture
+def async_engine(tmp_path):
+    """An AsyncEngine for a new SQLite database file, with the Tables created."""
+    db_url = db_sql.db_get_url('mas_blender_test', tmp_path.as_posix())
+    async_engine = db_sql_async.db_get_engine(db_url)
+    asyncio.run(db_sql_async.db_create_table(async_engine))
+
+    yield async_engine
+
+    asyncio.run(async_engine.dispose())
+    db_sql_async.db_dispose_engines(db_url)
+
+
+def _add_projects(async_engine, *names):
+    """Upserts projects with the given names (and derived codes and paths)."""
+    return asyncio.run(db_sql_async.db_upsert(
+        async_engine,
+        [db_sql.DBProject(code=name, name=name, path=f'/projects/{name}', pipeline={}) for name in names],
+        column_name_filter='name',
+    ))
+
+
+def test_db_get_engine(tmp_path):
+    db_url = db_sql.db_get_url('mas_blender_test', tmp_path.as_posix())
+    async_engine = db_sql_async.db_get_engine(db_url)
+
+    assert async_engine.url.drivername == 'sqlite+aiosqlite'
+    assert db_sql_async.db_get_engine(db_url) is async_engine
+    # The Engine is registered under its async url, whichever url form is given.
+    assert db_sql_async.db_get_engine(db_sql_async.db_get_url(db_url)) is async_engine
+
+    db_sql_async.db_dispose_engines(db_url)
+    assert db_sql_async.db_get_engine(db_url) is not async_engine
+    db_sql_async.db_dispose_engines(db_url)
+
+
+def test_db_get_engine_keeps_settings(tmp_path):
+    db_url = db_sql.db_get_url('mas_blender_test', tmp_path.as_posix())
+    async_engine = db_sql_async.db_get_engine(db_url)
+
+    assert db_sql_async.db_get_engine(db_url, echo=True) is async_engine
+    assert not async_engine.echo
+    db_sql_async.db_dispose_engines(db_url)
+
+
+def test_db_create_table(async_engine):
+    async def _get_table_names():
+        async with async_engine.connect() as db_conn:
+            return await db_conn.run_sync(
+                lambda sync_conn: db_sql.sqlalchemy.inspect(sync_conn).get_table_names()
+            )
+
+    assert {'projects', 'users', 'user_projects'} <= set(asyncio.run(_get_table_names()))
+    # Creating the Tables again (with migration) keeps them.
+    asyncio.run(db_sql_async.db_create_table(async_engine))
+    assert {'projects', 'users', 'user_projects'} <= set(asyncio.run(_get_table_names()))
+
+
+def test_db_upsert(async_engine):
+    assert _add_projects(async_engine, 'alpha', 'beta') == (True, True)
+
+    # Existing Rows (matched by name) are updated, new Rows are added.
+    db_results = asyncio.run(db_sql_async.db_upsert(
+        async_engine,
+        [
+            db_sql.DBProject(code='alp', name='alpha', path='/moved/alpha', pipeline={'v': 2}),
+            db_sql.DBProject(code='gam', name='gamma', path='/projects/gamma', pipeline={}),
+        ],
+        column_name_filter='name',
+    ))
+    assert db_results == (True, True)
+
+    db_projects = asyncio.run(db_sql_async.db_query_basic(async_engine, db_sql.DBProject))
+    assert sorted(db_project.name for db_project in db_projects) == ['alpha', 'beta', 'gamma']
+    db_project = next(db_project for db_project in db_projects if db_project.name == 'alpha')
+    assert db_project.path == '/moved/alpha'
+    assert db_project.pipeline == {'v': 2}
+
+
+
+def test_db_upsert_duplicate(async_engine):
+    _add_projects(async_engine, 'alpha')
+
+    # Only the entry with a duplicate code fails; the entries around it are still written.
+    db_results = asyncio.run(db_sql_async.db_upsert(
+        async_engine,
+        [
+            db_sql.DBProject(code='beta', name='beta', path='/projects/beta', pipeline={}),
+            db_sql.DBProject(code='alpha', name='gamma', path='/projects/gamma', pipeline={}),
+            db_sql.DBProject(code='delta', name='delta', path='/projects/delta', pipeline={}),
+        ],
+        column_name_filter='name',
+    ))
+    assert db_results == (True, False, True)
+
+    db_projects = asyncio.run(db_sql_async.db_query_basic(async_engine, db_sql.DBProject))
+    assert sorted(db_project.name for db_project in db_projects) == ['alpha', 'beta', 'delta']
+
+def test_db_query_basic(async_engine):
+    _add_projects(async_engine, 'alpha', 'beta', 'gamma')
+
+    db_projects = asyncio.run(db_sql_async.db_query_basic(
+        async_engine, db_sql.DBProject, filters=(('name', 'beta'),)
+    ))
+    assert [db_project.path for db_project in db_projects] == ['/projects/beta']
+
+    db_projects = asyncio.run(db_sql_async.db_query_basic(async_engine, db_sql.DBProject, limit=2))
+    assert len(db_projects) == 2
+
+
+def test_db_query_basic_columns(async_engine):
+    _add_projects(async_engine, 'alpha')
+
+    db_projects = asyncio.run(db_sql_async.db_query_basic(
+        async_engine, db_sql.DBProject, columns=('name',)
+    ))
+    # Only the given Column (and the Primary Key) are loaded.
+    db_project_state = db_sql.sqlalchemy.inspect(db_projects[0])
+    assert db_projects[0].name == 'alpha'
+    assert db_projects[0].id is not None
+    assert 'path' in db_project_state.unloaded
+    assert 'name' not in db_project_state.unloaded
+
+
+def test_db_delete_rows(async_engine):
+    _add_projects(async_engine, 'alpha', 'beta')
+    asyncio.run(db_sql_async.db_upsert(async_engine, [db_sql.DBUser(name='user')], column_name_filter='name'))
+
+    async def _add_user_projects():
+        async with async_engine.begin() as db_conn:
+            await db_conn.execute(
+                db_sql.sqlalchemy.insert(db_sql.DBUserProjects),
+                [{'project_id': 1, 'user_id': 1}, {'project_id': 2, 'user_id': 1}],
+            )
+
+    async def _get_user_project_ids():
+        async with async_engine.connect() as db_conn:
+            db_rows = await db_conn.execute(db_sql.sqlalchemy.select(db_sql.DBUserProjects.c.project_id))
+            return [db_row[0] for db_row in db_rows]
+
+    asyncio.run(_add_user_projects())
+    asyncio.run(db_sql_async.db_delete_rows(async_engine, db_sql.DBProject, filters=(('name', 'alpha'),)))
+
+    db_projects = asyncio.run(db_sql_async.db_query_basic(async_engine, db_sql.DBProject))
+    assert [db_project.name for db_project in db_projects] == ['beta']
+    # Association Rows referencing the deleted Row are deleted too.
+    assert asyncio.run(_get_user_project_ids()) == [2]
+
+
+def test_db_engine_reuse_across_event_loops(async_engine):
+    # Each asyncio.run() call runs on a new event loop, with the same registered AsyncEngine.
+    for i in range(3):
+        assert _add_projects(async_engine, f'project_{i}') == (True,)
+        assert db_sql_async.db_get_engine(async_engine.url) is async_engine
+
+    db_projects = asyncio.run(db_sql_async.db_query_basic(async_engine, db_sql.DBProject))
+    assert len(db_projects) == 3
+
+
+def test_db_write_callbacks(async_engine):
+    written_table_names = []
+    callback = lambda db_engine, db_table_names: written_table_names.extend(db_table_names)
+
+    db_sql.db_add_write_callback(callback)
+    try:
+        _add_projects(async_engine, 'alpha')
+        asyncio.run(db_sql_async.db_delete_rows(async_engine, db_sql.DBProject, filters=(('name', 'alpha'),)))
+    finally:
+        db_sql.db_remove_write_callback(callback)
+
+    assert 'projects' in written_table_names
+    assert 'user_projects' in written_table_names
@@ -0,0 +1,74 @@
+"""
+Tests for mas_blender.mas_py.py_img, resizing temp image files with Pillow.
+"""
+
+import pathlib
+
+import pytest
+
+from mas_blender.mas_py import py_img
+
+
+PILImage = pytest.importorskip('PIL.Image')
+
+
+@pytest.fixture
+def src_file_paths(tmp_path):
+    """Same-named red and blue source image files, in different directories."""
+    src_file_paths = []
+    for dir_name, color in (('a', (255, 0, 0)), ('b', (0, 0, 255))):
+        src_file_path = tmp_path.joinpath(dir_name, 'diffuse.png')
+        src_file_path.parent.mkdir()
+        PILImage.new('RGB', (64, 64), color).save(src_file_path)
+        src_file_paths.append(src_file_path.as_posix())
+
+    return src_file_paths
+
+
+def _get_color(file_path):
+    """Gets the color of the first pixel of an image file."""
+    with PILImage.open(file_path) as pil_img:
+        return pil_img.convert('RGB').getpixel((0, 0))
+
+
+def test_img_resize_file_same_name(tmp_path, src_file_paths):
+    dir_path = tmp_path.joinpath('out')
+    red_file_path, red_dimensions = py_img.img_resize_file(src_file_paths[0], 0.5, dir_path=dir_path)
+    blue_file_path, blue_dimensions = py_img.img_resize_file(src_file_paths[1], 0.5, dir_path=dir_path)
+
+    assert red_dimensions == blue_dimensions == (32, 32)
+    assert red_file_path != blue_file_path
+    assert _get_color(red_file_path) == (255, 0, 0)
+    assert _get_color(blue_file_path) == (0, 0, 255)
+
+    # Existing resized files are only reused for their own source file.
+    assert py_img.img_resize_file(src_file_paths[1], 0.5, dir_path=dir_path)[0] == blue_file_path
+
+
+def test_img_resize_files_same_name_cache(tmp_path, src_file_paths):
+    dir_path = tmp_path.joinpath('out')
+    cache = py_img.ImgCache(tmp_path.joinpath('cache'))
+
+    # A stale copy of the red image, newer than both sources, under the blue image's resized name.
+    blue_file_path = py_img.img_get_resized_file_path(src_file_paths[1], (32, 32), dir_path)
+    blue_file_path.parent.mkdir(parents=True)
+    PILImage.new('RGB', (32, 32), (255, 0, 0)).save(blue_file_path)
+
+    resized_data = py_img.img_resize_files(src_file_paths, 0.5, dir_path=dir_path, max_workers=1, cache=cache)
+    assert _get_color(resized_data[src_file_paths[0]][0]) == (255, 0, 0)
+    assert _get_color(resized_data[src_file_paths[1]][0]) == (0, 0, 255)
+
+    # Each cache entry holds the pixels of its own source.
+    for src_file_path, color in zip(src_file_paths, ((255, 0, 0), (0, 0, 255))):
+        cache_file_path = cache.get(cache.get_key(src_file_path, (32, 32)))
+        assert _get_color(cache_file_path) == color
+
+    # Resizing to another directory links the cached files.
+    other_dir_path = tmp_path.joinpath('other')
+    resized_data = py_img.img_resize_files(
+        src_file_paths, 0.5, dir_path=other_dir_path, max_workers=1, cache=cache
+    )
+    assert cache.hits >= 2
+    assert [pathlib.Path(resized_data[src_file_path][0]).parent for src_file_path in src_file_paths] \
+        == [other_dir_path, other_dir_path]
+    assert _get_color(resized_data[src_file_paths[1]][0]) == (0, 0, 255)